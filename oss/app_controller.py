@@ -1,3 +1,5 @@
+import os
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 import ttkbootstrap as tb
@@ -5,8 +7,19 @@ from ttkbootstrap.constants import *
 from typing import List, Dict, Tuple, Any
 
 import scheduling_logic as sl
+import workload_io as wio
+import store as st
+import procfs
+import timeline as tli
+import power as pw
+import trace_export as tx
+import metrics_export as mx
 from gui_pages import DashboardPage, TaskManagerPage, SchedulerPage, ComparePage, DeadlockPage, PowerPage
 
+# controller settings saved with the session
+SESSION_SETTINGS = ('available_resources', 'mlfq_config', 'cfs_config', 'group_config',
+                    'switch_cost', 'prediction_config')
+
 
 class SmartSchedulerApp(tb.Window):
     def __init__(self):
@@ -17,6 +30,28 @@ class SmartSchedulerApp(tb.Window):
         self.tasks: List[Dict[str, Any]] = []
         self.next_pid = 1
         self.current_timeline: List[Tuple[int, int, int]] = []
+        self.current_series = None      # ready-queue / busy-CPU series of kernel runs
+        self.current_run = None         # (tasks, algo, config) of the last kernel run
+        self._index = None
+        self.available_resources: Dict[str, int] = {}
+        self.current_blocked: List[Tuple[int, int, int]] = []
+        self.last_deadlocks: List[Tuple[int, List[int]]] = []
+        self.current_io: List[Tuple[int, str, int, int]] = []
+        self.mlfq_config: Dict[str, Any] = {'levels': 3, 'boost': None}
+        self.cfs_config: Dict[str, Any] = {'target_latency': 20, 'min_granularity': 4}
+        self.group_config: Dict[str, Any] = {'weights': {}, 'inner': 'FCFS'}
+        self.switch_cost: int = 0
+        self.prediction_config: Dict[str, Any] = {'enabled': False, 'alpha': 0.5, 'initial': 5}
+        self.sampler = None
+        self._fingerprint = None        # of self.tasks, reset whenever the task set changes
+
+        # persistent workloads / runs; reopen the last session
+        self.store = self._open_store()
+        self.recorder = st.RunRecorder(self.store.path) if self.store is not None else None
+        self.metrics_file = os.environ.get('SMART_SCHEDULER_METRICS_FILE')
+        self.metrics = self._open_metrics()
+        self._restore_session()
+        self.protocol('WM_DELETE_WINDOW', self.on_close)
 
         # grid setup
         self.rowconfigure(0, weight=0)
@@ -79,32 +114,123 @@ class SmartSchedulerApp(tb.Window):
             except Exception:
                 pass
 
-    # add new task
-    def add_task(self, name, arrival, burst, priority, holding, waiting):
+    # open the workload/results database (the app works without it)
+    def _open_store(self):
         try:
-            arrival_i = int(arrival)
+            return st.WorkloadStore()
         except Exception:
-            arrival_i = 0
+            return None
+
+    # OpenMetrics export; SMART_SCHEDULER_METRICS_PORT serves it on localhost
+    def _open_metrics(self):
+        metrics = mx.SchedulerMetrics()
+        metrics.observe_checks()
+        port = os.environ.get('SMART_SCHEDULER_METRICS_PORT')
+        if port:
+            try:
+                metrics.serve(int(port))
+            except (OSError, ValueError):
+                pass
+        return metrics
+
+    # settings and task set of the previous session
+    def _restore_session(self):
+        if self.store is None:
+            return
         try:
-            burst_i = max(1, int(burst))
+            session = self.store.get_setting('session') or {}
+            for k in SESSION_SETTINGS:
+                if k in session:
+                    setattr(self, k, session[k])
+            if session.get('workload_id') is not None:
+                self._set_tasks(self.store.load_tasks(session['workload_id']))
         except Exception:
-            burst_i = 1
+            pass
+
+    def save_session(self):
+        if self.store is None:
+            return
         try:
-            priority_i = int(priority)
+            wid = self.store.save_workload('session', self.tasks, fp=self.workload_fingerprint()) if self.tasks else None
+            self.store.set_setting('session', {'workload_id': wid,
+                                               **{k: getattr(self, k) for k in SESSION_SETTINGS}})
         except Exception:
-            priority_i = 0
-
-        t = {
-            'pid': self.next_pid,
-            'name': (name or f"P{self.next_pid}"),
-            'arrival': arrival_i,
-            'burst': burst_i,
-            'priority': priority_i,
-            'holding': (holding or '').strip(),
-            'waiting': (waiting or '').strip()
-        }
+            pass
+
+    def on_close(self):
+        if self.sampler is not None:
+            self.sampler.stop()
+        self.metrics.shutdown()
+        if self.recorder is not None:
+            self.recorder.close(timeout=30)
+        self.save_session()
+        if self.store is not None:
+            self.store.close()
+        self.destroy()
+
+    # store the current task set under a name
+    def save_workload(self, name: str):
+        return self.store.save_workload(name, self.tasks, source='task manager', fp=self.workload_fingerprint())
+
+    # replace the task set with a stored workload
+    def open_workload(self, workload_id: int):
+        self._set_tasks(self.store.load_tasks(workload_id))
+        if 'TaskManagerPage' in self.pages:
+            self.pages['TaskManagerPage'].update_table(self.tasks)
+
+    def _set_tasks(self, tasks):
+        self.tasks = sorted(tasks, key=lambda t: t['pid'])
+        self.next_pid = max((t['pid'] for t in self.tasks), default=0) + 1
+        self._fingerprint = None
+
+    # content hash of the task set, computed once per change
+    def workload_fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = st.fingerprint(self.tasks)
+        return self._fingerprint
+
+    # latest metrics and engine time per algorithm / quantum / workload (file rewritten when set)
+    def _export_metrics(self, algo, quantum, metrics, seconds):
+        # only policies that slice by the quantum get it as a label
+        if not self._uses_quantum(algo):
+            quantum = None
+        try:
+            self.metrics.record_run(algo, metrics, seconds, quantum, self.workload_fingerprint()[:12])
+            if self.metrics_file:
+                self.metrics.write(self.metrics_file)
+        except Exception:
+            pass
+
+    def _uses_quantum(self, algo):
+        if algo == 'MLFQ':
+            return not self.mlfq_config.get('quanta')
+        if algo == 'Group Fair Share':
+            return self.group_config.get('inner') == 'Round Robin'
+        return algo == 'Round Robin'
+
+    # keep recent runs for later queries (workload, algorithm); saved off the Tk thread
+    def _record_run(self, algo, quantum, tl, metrics):
+        if self.recorder is None or not self.tasks:
+            return
+        config = {'quantum': quantum, 'mlfq': dict(self.mlfq_config), 'cfs': dict(self.cfs_config),
+                  'group': dict(self.group_config)}
+        self.recorder.record('session', list(self.tasks), self.workload_fingerprint(), algo, tl,
+                             metrics, config, self.switch_cost)
+
+    # runs the recorder failed to save since the last call
+    def run_history_errors(self):
+        return self.recorder.errors() if self.recorder is not None else []
+
+    # add new task
+    def add_task(self, name, arrival, burst, priority, holding, waiting,
+                 allocation=None, request=None, resource_ops=None, bursts=None, devices=None,
+                 deadline=None, period=None, group=None):
+        t = wio.make_task(self.next_pid, name, arrival, burst, priority, holding, waiting,
+                          allocation, request, resource_ops, bursts, devices,
+                          deadline, period, group)
         self.tasks.append(t)
         self.next_pid += 1
+        self._fingerprint = None
 
         # update table
         if 'TaskManagerPage' in self.pages:
@@ -113,10 +239,63 @@ class SmartSchedulerApp(tb.Window):
             except Exception:
                 pass
 
+    # append already-built task dicts (bulk import), renumbering pids
+    def add_tasks(self, tasks):
+        for t in tasks:
+            t['pid'] = self.next_pid
+            self.next_pid += 1
+        self.tasks.extend(tasks)
+        self._fingerprint = None
+        if 'TaskManagerPage' in self.pages:
+            try:
+                self.pages['TaskManagerPage'].update_table(self.tasks)
+            except Exception:
+                pass
+
+    # sample running processes from /proc in the background (Linux)
+    def start_sampling(self, interval: float = 0.1):
+        self.sampler = procfs.ProcSampler(interval)
+        self.sampler.start()
+
+    # stop sampling; the observed CPU bursts become tasks
+    def stop_sampling(self):
+        if self.sampler is None:
+            return []
+        tasks = self.sampler.stop()
+        self.sampler = None
+        self.add_tasks(tasks)
+        return tasks
+
+    # interval index over the current timeline (rebuilt when the timeline changes)
+    def timeline_index(self):
+        if self._index is None or self._index[0] is not self.current_timeline:
+            self._index = (self.current_timeline, tli.TimelineIndex(self.current_timeline))
+        return self._index[1]
+
+    # current run as Chrome trace events (segments, arrivals, preemptions, completions, deadlocks)
+    def export_trace(self, path: str) -> int:
+        return tx.write_chrome_trace(path, self.current_timeline, self.tasks, self.current_series,
+                                     self.current_blocked, self.last_deadlocks)
+
+    # last kernel run replayed on a power model (race-to-idle / slow-and-steady / min energy)
+    def energy_plan(self, model, mode: str):
+        if self.current_run is None:
+            return None
+        tasks, algo, config = self.current_run
+        return pw.EnergyPlanner(tasks, algo, model, config, self.switch_cost).plan(mode)
+
+    # edit a task's fields in place
+    def update_task(self, pid: int, **fields):
+        for t in self.tasks:
+            if t['pid'] == pid:
+                t.update(fields)
+        self._fingerprint = None
+
     # clear all tasks
     def clear_tasks(self):
         self.tasks = []
         self.next_pid = 1
+        self._fingerprint = None
         if 'TaskManagerPage' in self.pages:
             try:
                 self.pages['TaskManagerPage'].update_table([])
@@ -127,12 +306,25 @@ class SmartSchedulerApp(tb.Window):
     def clear_selected_task(self, pid: int):
         self.tasks = [t for t in self.tasks if t['pid'] != pid]
         self.next_pid = len(self.tasks) + 1
+        self._fingerprint = None
         if 'TaskManagerPage' in self.pages:
             self.pages['TaskManagerPage'].update_table(self.tasks)
 
     # run selected algorithm
-    def run_scheduler(self, algo: str, quantum: int = 2):
+    def run_scheduler(self, algo: str, quantum: int = 2, resources: bool = False):
+        t0 = time.perf_counter()
+        tl, metrics = self._schedule(algo, quantum, resources)
+        self._export_metrics(algo, quantum, metrics, time.perf_counter() - t0)
+        self._record_run(algo, quantum, tl, metrics)
+        return tl, metrics
+
+    def _schedule(self, algo, quantum, resources):
         tasks_snapshot = [dict(t) for t in self.tasks]
+        self.current_blocked = []
+        self.last_deadlocks = []
+        self.current_io = []
+        self.current_series = None
+        self.current_run = None
 
         if not tasks_snapshot:
             return [], {
@@ -143,35 +335,141 @@ class SmartSchedulerApp(tb.Window):
                 'total_exec': 0
             }
 
-        # algorithm selection
-        if algo == 'FCFS':
-            tl = sl.sched_fcfs(tasks_snapshot)
-        elif algo == 'SJF (Non-preemptive)':
-            tl = sl.sched_sjf(tasks_snapshot, preemptive=False)
-        elif algo == 'SJF (Preemptive)':
-            tl = sl.sched_sjf(tasks_snapshot, preemptive=True)
-        elif algo == 'Priority (Non-preemptive)':
-            tl = sl.sched_priority(tasks_snapshot, preemptive=False)
-        elif algo == 'Priority (Preemptive)':
-            tl = sl.sched_priority(tasks_snapshot, preemptive=True)
-        elif algo == 'LJF':
-            tl = sl.sched_ljf(tasks_snapshot)
-        elif algo == 'Round Robin':
-            tl = sl.sched_rr(tasks_snapshot, quantum)
-        else:
-            tl = sl.sched_fcfs(tasks_snapshot)
+        if resources:
+            tl, metrics = self._run_with_resources(tasks_snapshot, algo, quantum)
+            self._sync_results(tasks_snapshot, tl)
+            return tl, metrics
+
+        if algo in sl.REALTIME_POLICIES:
+            tl, metrics = self._run_realtime(tasks_snapshot, algo)
+            self._sync_results(tasks_snapshot, tl)
+            return tl, metrics
+
+        if any(t.get('bursts') for t in tasks_snapshot):
+            tl, metrics = self._run_with_io(tasks_snapshot, algo, quantum)
+            self._sync_results(tasks_snapshot, tl)
+            return tl, metrics
+
+        # registered kernel policy
+        cost = self.switch_cost
+        config = {
+            'quantum': quantum,
+            'estimates': self._burst_estimates(tasks_snapshot) if algo.startswith('SJF') else None,
+            'mlfq': self.mlfq_config,
+            'cfs': self.cfs_config,
+            'group': self.group_config
+        }
+        self.current_series = sl.StateSeries()
+        self.current_run = ([dict(t) for t in tasks_snapshot], algo, config)
+        tl = sl.run_policy(tasks_snapshot, algo, config, switch_cost=cost, series=self.current_series)
 
         # compute metrics
         metrics = sl.compute_metrics(tasks_snapshot, tl)
+        if config['estimates']:
+            # same policy with the true bursts, for predicted-vs-actual comparison
+            actual_tl = sl.run_policy(tasks_snapshot, algo, dict(config, estimates=None), switch_cost=cost)
+            metrics['actual'] = sl.compute_metrics([dict(t) for t in tasks_snapshot], actual_tl)
+            # 0 means every estimate is tau0 and SJF degenerates to FCFS
+            metrics['predicted_from_history'] = sl.prediction_history(tasks_snapshot)
+        if any(t.get('group') for t in tasks_snapshot):
+            metrics['groups'] = sl.group_metrics(tasks_snapshot, tl)
+
+        self._sync_results(tasks_snapshot, tl)
+        return tl, metrics
+
+    # resource-aware run (acquire/release + online deadlock detection)
+    def _run_with_resources(self, tasks_snapshot, algo, quantum):
+        res = sl.sched_with_resources(tasks_snapshot, algo, quantum, switch_cost=self.switch_cost)
+        tl = res['timeline']
+        unfinished = set(res['unfinished'])
+        self.current_blocked = res['blocked']
+        self.last_deadlocks = res['deadlocks']
+
+        # averages only over tasks that actually finished
+        finished = [t for t in tasks_snapshot if t['pid'] not in unfinished]
+        metrics = sl.compute_metrics(finished, tl)
+        metrics['deadlocks'] = len(res['deadlocks'])
+        metrics['blocked_time'] = sum(e - s for _, s, e in res['blocked'])
+
+        for t in tasks_snapshot:
+            if t['pid'] in unfinished:
+                t.update(start=None, completion=None, waiting_time=None, turnaround=None)
+        return tl, metrics
+
+    # exponential-average estimates when burst prediction is on
+    def _burst_estimates(self, tasks_snapshot):
+        cfg = self.prediction_config
+        if not cfg['enabled']:
+            return None
+        return sl.predict_bursts(tasks_snapshot, cfg['alpha'], cfg['initial'])
+
+    # CPU/IO burst sequences with device queues
+    def _run_with_io(self, tasks_snapshot, algo, quantum):
+        cfg = self.prediction_config
+        predict = (cfg['alpha'], cfg['initial']) if cfg['enabled'] and algo.startswith('SJF') else None
+        res = sl.sched_cpu_io(tasks_snapshot, algo, quantum, switch_cost=self.switch_cost, predict=predict)
+        stats = res['stats']
+        self.current_io = res['io_timeline']
+
+        for t in tasks_snapshot:
+            pid = t['pid']
+            done = pid in res['completion']
+            t['start'] = res['start'].get(pid)
+            t['completion'] = res['completion'].get(pid)
+            t['waiting_time'] = res['ready_wait'][pid] if done else None
+            t['turnaround'] = res['completion'][pid] - t['arrival'] if done else None
 
-        # update actual task dicts
+        metrics = {
+            'avg_wait': stats['avg_wait'],
+            'avg_tat': stats['avg_tat'],
+            'cpu_util': stats['cpu_util'],
+            'throughput': stats['throughput'],
+            'total_exec': stats['cpu_busy'],
+            'effective_util': stats['effective_util'],
+            'switches': stats['switches'],
+            'overhead': stats['overhead'],
+            'device_util': stats['device_util'],
+            **{k: v for k, v in stats.items() if k == 'avg_response' or k.startswith('p')}
+        }
+        if predict:
+            actual = sl.sched_cpu_io(tasks_snapshot, algo, quantum, keep_timeline=False,
+                                     switch_cost=self.switch_cost)
+            metrics['actual'] = actual['stats']
+        return res['timeline'], metrics
+
+    # EDF / RM with periodic jobs; per-task values average over the task's jobs
+    def _run_realtime(self, tasks_snapshot, algo):
+        policy = sl.REALTIME_POLICIES[algo]
+        res = sl.sched_realtime(tasks_snapshot, policy, switch_cost=self.switch_cost)
+        tl = res['timeline']
+        metrics = sl.compute_deadline_metrics(res['jobs'], tl, res['horizon'])
+        metrics['schedulability'] = res['schedulability']
+
+        first = {}
+        for pid, s, _ in tl:
+            first.setdefault(pid, s)
+        per_task = {}
+        for pid, rel, _, comp, burst in res['jobs']:
+            if comp is not None:
+                per_task.setdefault(pid, []).append((rel, comp, burst))
+
+        for t in tasks_snapshot:
+            done = per_task.get(t['pid'])
+            t['start'] = first.get(t['pid'])
+            t['completion'] = done[-1][1] if done else None
+            t['turnaround'] = sum(c - r for r, c, _ in done) / len(done) if done else None
+            t['waiting_time'] = sum(c - r - b for r, c, b in done) / len(done) if done else None
+        return tl, metrics
+
+    # update actual task dicts
+    def _sync_results(self, tasks_snapshot, tl):
+        by_pid = {t['pid']: t for t in self.tasks}
         for snap in tasks_snapshot:
-            for t in self.tasks:
-                if t['pid'] == snap['pid']:
-                    t.update({
-                        k: v for k, v in snap.items()
-                        if k in ('start', 'completion', 'waiting_time', 'turnaround')
-                    })
+            t = by_pid.get(snap['pid'])
+            if t is not None:
+                t.update({
+                    k: v for k, v in snap.items()
+                    if k in ('start', 'completion', 'waiting_time', 'turnaround')
+                })
 
         self.current_timeline = tl
-        return tl, metrics
@@ -0,0 +1,166 @@
+import math
+import operator
+import re
+from typing import List, Dict, Tuple, Any, Optional
+
+import scheduling_logic as sl
+
+# SLO comparison operators, longest first so '<=' isn't read as '<'
+SLO_OPS = {'<=': operator.le, '>=': operator.ge, '<': operator.lt, '>': operator.gt}
+
+_SLO_TERM = re.compile(r'^\s*(\w+)\s*(<=|>=|<|>)\s*([-+\d.eE]+)\s*$')
+
+# speed factors are searched on this grid (hundredths)
+SPEED_STEP = 0.01
+
+
+# --------------------- SLO ---------------------
+
+def parse_slo(text: str) -> List[Tuple[str,str,float]]:
+    """Parse 'p99_wait<=50, avg_tat<200' into (metric, op, bound) terms"""
+    terms = []
+    for part in (text or '').replace(';', ',').split(','):
+        if not part.strip():
+            continue
+        m = _SLO_TERM.match(part)
+        if not m:
+            raise ValueError(f'bad SLO term {part.strip()!r} (expected e.g. p99_wait<=50)')
+        terms.append((m.group(1), m.group(2), float(m.group(3))))
+    return terms
+
+
+def meets_slo(metrics: Dict[str,Any], slo: List[Tuple[str,str,float]]) -> bool:
+    """True when every SLO term holds for a compute_metrics() result"""
+    for name, op, bound in slo:
+        if name not in metrics:
+            raise ValueError(f'unknown SLO metric {name!r}')
+        if not SLO_OPS[op](metrics[name], bound):
+            return False
+    return True
+
+
+def scale_tasks(tasks: List[Dict[str,Any]], speed: float) -> List[Dict[str,Any]]:
+    """Copies of the tasks on a CPU `speed` times faster (bursts rounded up)"""
+    if speed == 1:
+        return [dict(t) for t in tasks]
+    return [dict(t, burst=max(1, math.ceil(t['burst'] / speed - 1e-9))) for t in tasks]
+
+
+# --------------------- Capacity Search ---------------------
+
+class CapacityPlanner:
+    """Smallest core count / speed factor meeting an SLO for one workload and policy
+
+    Every (cores, speed) simulation is cached, and the search assumes more or
+    faster CPUs never break the SLO, so a point dominated by one already known
+    to pass (or to fail) is answered without simulating. Scheduling anomalies
+    can make that assumption wrong by a core or so for some policies.
+    """
+
+    def __init__(self, tasks: List[Dict[str,Any]], policy: str = 'FCFS',
+                 slo: List[Tuple[str,str,float]] = (), config: Dict[str,Any] = None,
+                 switch_cost: int = 0):
+        self.tasks = tasks
+        self.policy = policy
+        self.slo = list(slo)
+        self.config = config or {}
+        self.switch_cost = switch_cost
+        self.results: Dict[Tuple[int,int],Dict[str,Any]] = {}
+        self.passed: List[Tuple[int,int]] = []
+        self.failed: List[Tuple[int,int]] = []
+        self.simulations = 0
+        self._scaled = {}
+
+    def metrics(self, cores: int, speed: float = 1.0) -> Dict[str,Any]:
+        """compute_metrics() for the workload on `cores` CPUs of relative `speed` (cached)"""
+        key = (cores, round(speed / SPEED_STEP))
+        if key not in self.results:
+            if key[1] not in self._scaled:
+                self._scaled[key[1]] = scale_tasks(self.tasks, key[1] * SPEED_STEP)
+            tasks = self._scaled[key[1]]
+            tl = sl.run_policy(tasks, self.policy, self.config, self.switch_cost, cores)
+            self.results[key] = sl.compute_metrics(tasks, tl, cores)
+            self.simulations += 1
+        return self.results[key]
+
+    def meets(self, cores: int, speed: float = 1.0) -> bool:
+        key = (cores, round(speed / SPEED_STEP))
+        if any(c <= key[0] and s <= key[1] for c, s in self.passed):
+            return True
+        if any(c >= key[0] and s >= key[1] for c, s in self.failed):
+            return False
+        ok = meets_slo(self.metrics(cores, speed), self.slo)
+        (self.passed if ok else self.failed).append(key)
+        return ok
+
+    def min_cores(self, speed: float = 1.0, max_cores: int = 1024) -> Optional[int]:
+        """Galloping (1, 2, 4, ...) then binary search; None if max_cores isn't enough"""
+        lo, hi = 0, 1
+        while not self.meets(hi, speed):
+            if hi >= max_cores:
+                return None
+            lo, hi = hi, min(2 * hi, max_cores)
+        # lo fails (or is 0), hi passes
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if self.meets(mid, speed):
+                hi = mid
+            else:
+                lo = mid
+        return hi
+
+    def min_speed(self, cores: int, max_speed: float = 16.0) -> Optional[float]:
+        """Smallest speed factor (to SPEED_STEP) meeting the SLO on `cores` CPUs"""
+        unit = round(1 / SPEED_STEP)
+        top = round(max_speed / SPEED_STEP)
+        if self.meets(cores, 1.0):
+            # gallop down from 1x
+            hi, lo = unit, unit // 2
+            while lo >= 1 and self.meets(cores, lo * SPEED_STEP):
+                hi, lo = lo, lo // 2
+        else:
+            # gallop up from 1x
+            lo, hi = unit, min(2 * unit, top)
+            while not self.meets(cores, hi * SPEED_STEP):
+                if hi >= top:
+                    return None
+                lo, hi = hi, min(2 * hi, top)
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if self.meets(cores, mid * SPEED_STEP):
+                hi = mid
+            else:
+                lo = mid
+        return hi * SPEED_STEP
+
+    def frontier(self, max_cores: int = 1024, max_speed: float = 16.0) -> List[Tuple[int,float]]:
+        """(cores, min speed) for powers of two up to the 1x core count and the count below it"""
+        need = self.min_cores(1.0, max_cores)
+        limit = need if need is not None else max_cores
+        counts = {1 << i for i in range(limit.bit_length()) if 1 << i <= limit}
+        counts.update(c for c in (limit - 1, limit) if c >= 1)
+        out = []
+        for c in sorted(counts):
+            s = self.min_speed(c, max_speed)
+            if s is not None:
+                out.append((c, s))
+        return out
+
+
+def plan_capacity(tasks: List[Dict[str,Any]], policy: str, slo: List[Tuple[str,str,float]],
+                  config: Dict[str,Any] = None, switch_cost: int = 0, max_cores: int = 1024,
+                  max_speed: float = 16.0, speed: float = 1.0,
+                  frontier: bool = False) -> Dict[str,Any]:
+    """Minimum cores at `speed` (plus the speed frontier when asked) with the metrics there"""
+    planner = CapacityPlanner(tasks, policy, slo, config, switch_cost)
+    cores = planner.min_cores(speed, max_cores)
+    out = {
+        'policy': policy,
+        'slo': slo,
+        'speed': speed,
+        'cores': cores,
+        'metrics': planner.metrics(cores, speed) if cores else None,
+        'frontier': planner.frontier(max_cores, max_speed) if frontier else [],
+    }
+    out['simulations'] = planner.simulations
+    return out
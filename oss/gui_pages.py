@@ -1,15 +1,21 @@
 import math
-import csv
 import io
 import os
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox, filedialog, simpledialog
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
+import numpy as np
 from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from typing import List, Dict, Tuple, Any
 import scheduling_logic as sl  # algo logic
+import montecarlo as mc
+import workload_io as wio
+import procfs
+import power as pw
 
 # format numeric values
 def format_val(t, key):
@@ -101,7 +107,7 @@ class DashboardPage(ttk.Frame):
 
         stats = [
             ('📋 Total Tasks', '0', 'info'),
-            ('⚙ Algorithms', '7', 'success'),
+            ('⚙ Algorithms', str(len(sl.algorithm_names())), 'success'),
             ('🔒 Deadlock Check', 'Available', 'warning'),
             ('⚡ Power Analysis', 'Active', 'danger')
         ]
@@ -158,7 +164,8 @@ class TaskManagerPage(ttk.Frame):
         form = ttk.Frame(frm)
         form.pack(side='left', padx=(0,20))
 
-        labels = ['Name', 'Arrival', 'Burst', 'Priority', 'Holding (R)', 'Waiting (R)']
+        labels = ['Name', 'Arrival', 'Burst', 'Priority', 'Holding (R)', 'Waiting (R)',
+                  'Deadline', 'Period', 'Group']
         self.entries = {}
 
         for i, lbl in enumerate(labels):
@@ -185,6 +192,19 @@ class TaskManagerPage(ttk.Frame):
         import_btn = tb.Button(btn_frame, text='Import CSV', bootstyle='info-outline', command=self.import_csv)
         import_btn.pack(side='left', padx=6)
 
+        save_btn = tb.Button(btn_frame, text='Save Workload', bootstyle='info-outline', command=self.save_workload)
+        save_btn.pack(side='left', padx=6)
+        Tooltip(save_btn, "Store the task set in the workload database")
+
+        open_btn = tb.Button(btn_frame, text='Open Workload', bootstyle='info-outline', command=self.open_workload)
+        open_btn.pack(side='left', padx=6)
+        Tooltip(open_btn, "Load a stored task set")
+
+        self.sample_btn = tb.Button(btn_frame, text='Sample /proc', bootstyle='info-outline',
+                                    command=self.toggle_sampling)
+        self.sample_btn.pack(side='left', padx=6)
+        Tooltip(self.sample_btn, "Record CPU bursts of running processes as tasks")
+
         # preview table
         preview = ttk.Frame(frm)
         preview.pack(side='left', fill='both', expand=True)
@@ -207,31 +227,91 @@ class TaskManagerPage(ttk.Frame):
 
     # import csv
     def import_csv(self):
-        path = filedialog.askopenfilename(title='Select CSV',
-                                          filetypes=[('CSV files','*.csv'), ('All','*.*')])
+        path = filedialog.askopenfilename(title='Select workload',
+                                          filetypes=[('CSV files','*.csv'),
+                                                     ('Binary workloads', '*' + wio.BINARY_EXT),
+                                                     ('SWF traces', '*.swf *.swf.gz'),
+                                                     ('All','*.*')])
         if not path:
             return
         try:
-            with open(path, newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                count = 0
-                for row in reader:
-                    if not row:
-                        continue
-                    name = row[0] if len(row) > 0 and row[0] else None
-                    arrival = int(row[1]) if len(row) > 1 and row[1] != '' else 0
-                    burst = int(row[2]) if len(row) > 2 and row[2] != '' else 1
-                    priority = int(row[3]) if len(row) > 3 and row[3] != '' else 0
-                    holding = row[4] if len(row) > 4 else ''
-                    waiting = row[5] if len(row) > 5 else ''
-
-                    self.controller.add_task(name or f'P{self.controller.next_pid}',
-                                             arrival, burst, priority, holding, waiting)
-                    count += 1
-                messagebox.showinfo('Import', f'Imported {count} rows.')
-                self.update_table(self.controller.tasks)
+            # binary workloads map their columns, SWF streams, CSVs parse in parallel chunks
+            tasks = wio.load_tasks(path, first_pid=self.controller.next_pid)
+            self.controller.add_tasks(tasks)
+            messagebox.showinfo('Import', f'Imported {len(tasks)} rows.')
         except Exception as e:
-            messagebox.showerror('Import Error', f'Failed to import CSV: {e}')
+            messagebox.showerror('Import Error', f'Failed to import {path}: {e}')
+
+    # save task set to the database
+    def save_workload(self):
+        if getattr(self.controller, 'store', None) is None:
+            messagebox.showerror('Workloads', 'Workload database is not available.')
+            return
+        name = simpledialog.askstring('Save Workload', 'Workload name:', parent=self)
+        if not name:
+            return
+        wid = self.controller.save_workload(name.strip())
+        messagebox.showinfo('Workloads', f'Saved {len(self.controller.tasks)} tasks (workload {wid}).')
+
+    # pick a stored workload
+    def open_workload(self):
+        store = getattr(self.controller, 'store', None)
+        if store is None:
+            messagebox.showerror('Workloads', 'Workload database is not available.')
+            return
+
+        dlg = tk.Toplevel(self)
+        dlg.title('Open Workload')
+        dlg.transient(self)
+        dlg.grab_set()
+
+        cols = ('id', 'name', 'tasks', 'runs')
+        tree = ttk.Treeview(dlg, columns=cols, show='headings', height=10)
+        for c in cols:
+            tree.heading(c, text=c.upper(), anchor='center')
+            tree.column(c, width=90 if c != 'name' else 200, anchor='center')
+        tree.pack(fill='both', expand=True, padx=8, pady=8)
+
+        for w in store.workloads():
+            tree.insert('', 'end', values=(w['id'], w['name'], w['n_tasks'], w['runs']))
+
+        def do_open():
+            sel = tree.selection()
+            if not sel:
+                return
+            self.controller.open_workload(int(tree.item(sel[0], 'values')[0]))
+            dlg.destroy()
+
+        tree.bind('<Double-1>', lambda e: do_open())
+        tb.Button(dlg, text='Open', bootstyle='success', command=do_open).pack(pady=(0, 8))
+
+    # start / stop the live /proc sampler
+    def toggle_sampling(self):
+        if self.controller.sampler is not None:
+            tasks = self.controller.stop_sampling()
+            self.sample_btn.config(text='Sample /proc')
+            self.update_table(self.controller.tasks)
+            messagebox.showinfo('Sample /proc', f'Added {len(tasks)} observed CPU bursts.')
+            return
+        if not procfs.proc_available():
+            messagebox.showerror('Sample /proc', 'Live sampling needs Linux /proc.')
+            return
+        interval = simpledialog.askfloat('Sample /proc', 'Sampling interval (seconds):',
+                                         initialvalue=0.1, minvalue=0.01, parent=self)
+        if not interval:
+            return
+        self.controller.start_sampling(interval)
+        self.sample_btn.config(text='Stop Sampling')
+        self._sampling_status()
+
+    # progress while sampling
+    def _sampling_status(self):
+        s = self.controller.sampler
+        if s is None:
+            return
+        self.stat_lbl.config(text=f'sampling: {len(s.entries)} processes, {len(s.bursts)} bursts, '
+                                  f'{s.overhead():.2f}% CPU')
+        self.after(500, self._sampling_status)
 
     # add task
     def add_task(self):
@@ -242,6 +322,9 @@ class TaskManagerPage(ttk.Frame):
             priority = int(self.entries['Priority'].get() or 0)
             holding = self.entries['Holding (R)'].get().strip()
             waiting = self.entries['Waiting (R)'].get().strip()
+            deadline = int(self.entries['Deadline'].get()) if self.entries['Deadline'].get() else None
+            period = int(self.entries['Period'].get()) if self.entries['Period'].get() else None
+            group = self.entries['Group'].get().strip()
 
             if burst < 1:
                 messagebox.showerror('Invalid', 'Burst must be >= 1')
@@ -251,7 +334,8 @@ class TaskManagerPage(ttk.Frame):
             messagebox.showerror('Invalid', 'Arrival/Burst/Priority must be integers')
             return
 
-        self.controller.add_task(name, arrival, burst, priority, holding, waiting)
+        self.controller.add_task(name, arrival, burst, priority, holding, waiting,
+                                 deadline=deadline, period=period, group=group)
         self.update_table(self.controller.tasks)
 
         for e in self.entries.values():
@@ -322,14 +406,14 @@ class TaskManagerPage(ttk.Frame):
         dlg.transient(self)
         dlg.grab_set()
 
-        fields = ['name','arrival','burst','priority','holding','waiting']
+        fields = ['name','arrival','burst','priority','holding','waiting','deadline','period','group']
         entries = {}
 
         for i, f in enumerate(fields):
             ttk.Label(dlg, text=f.capitalize()+':').grid(row=i, column=0, padx=8, pady=6)
             e = ttk.Entry(dlg, width=24)
             e.grid(row=i, column=1, padx=8, pady=6)
-            e.insert(0, str(task.get(f, '')))
+            e.insert(0, str(task.get(f) if task.get(f) is not None else ''))
             entries[f] = e
 
         def save():
@@ -338,6 +422,8 @@ class TaskManagerPage(ttk.Frame):
                 arrival = int(entries['arrival'].get() or 0)
                 burst = int(entries['burst'].get() or 1)
                 priority = int(entries['priority'].get() or 0)
+                deadline = int(entries['deadline'].get()) if entries['deadline'].get() else None
+                period = int(entries['period'].get()) if entries['period'].get() else None
             except Exception:
                 messagebox.showerror('Invalid', 'Arrival/Burst/Priority must be integers')
                 return
@@ -350,7 +436,10 @@ class TaskManagerPage(ttk.Frame):
                     burst=burst,
                     priority=priority,
                     holding=entries['holding'].get(),
-                    waiting=entries['waiting'].get()
+                    waiting=entries['waiting'].get(),
+                    deadline=deadline,
+                    period=period,
+                    group=entries['group'].get().strip()
                 )
             else:
                 task.update({
@@ -359,7 +448,10 @@ class TaskManagerPage(ttk.Frame):
                     'burst': burst,
                     'priority': priority,
                     'holding': entries['holding'].get(),
-                    'waiting': entries['waiting'].get()
+                    'waiting': entries['waiting'].get(),
+                    'deadline': deadline,
+                    'period': period,
+                    'group': entries['group'].get().strip()
                 })
 
             self.update_table(self.controller.tasks)
@@ -385,11 +477,7 @@ class SchedulerPage(ttk.Frame):
         ttk.Label(top, text='Algorithm:').pack(side='left')
         self.algo_combo = ttk.Combobox(
             top,
-            values=[
-                'FCFS','SJF (Non-preemptive)','SJF (Preemptive)',
-                'Priority (Non-preemptive)','Priority (Preemptive)',
-                'LJF','Round Robin'
-            ],
+            values=sl.algorithm_names(),
             width=28, state='readonly'
         )
         self.algo_combo.set('FCFS')
@@ -400,12 +488,89 @@ class SchedulerPage(ttk.Frame):
         self.quant_entry.insert(0, '2')
         self.quant_entry.pack(side='left')
 
+        ttk.Label(top, text='Switch cost:').pack(side='left', padx=(10,0))
+        self.switch_entry = ttk.Entry(top, width=4)
+        self.switch_entry.insert(0, str(controller.switch_cost))
+        self.switch_entry.pack(side='left')
+        Tooltip(self.switch_entry, "Context-switch overhead charged whenever the CPU changes tasks")
+
+        self.resources_var = tk.BooleanVar(value=False)
+        res_chk = ttk.Checkbutton(top, text='Resource-aware', variable=self.resources_var)
+        res_chk.pack(side='left', padx=(10,0))
+        Tooltip(res_chk, "Tasks acquire/release resources while running; blocked time and deadlocks are tracked")
+
         run_btn = tb.Button(top, text='Run', bootstyle='primary', command=self.run_sched)
         run_btn.pack(side='left', padx=8)
 
         refresh_btn = tb.Button(top, text='Refresh', bootstyle='secondary-outline', command=self.refresh_table)
         refresh_btn.pack(side='left')
 
+        util_btn = tb.Button(top, text='Utilization', bootstyle='secondary-outline', command=self.show_utilization)
+        util_btn.pack(side='left', padx=8)
+        Tooltip(util_btn, "CPU utilization and ready-queue length per time window")
+
+        trace_btn = tb.Button(top, text='Export Trace', bootstyle='secondary-outline', command=self.export_trace)
+        trace_btn.pack(side='left')
+        Tooltip(trace_btn, "Chrome trace JSON for chrome://tracing or ui.perfetto.dev")
+
+        # per-policy settings
+        opts = ttk.Frame(self)
+        opts.pack(fill='x')
+
+        # MLFQ (level quanta are quantum, 2*quantum, 4*quantum, ...)
+        ttk.Label(opts, text='MLFQ levels:').pack(side='left')
+        self.levels_entry = ttk.Entry(opts, width=4)
+        self.levels_entry.insert(0, str(controller.mlfq_config['levels']))
+        self.levels_entry.pack(side='left')
+        Tooltip(self.levels_entry, "MLFQ queue levels")
+
+        ttk.Label(opts, text='Boost:').pack(side='left', padx=(10,0))
+        self.boost_entry = ttk.Entry(opts, width=5)
+        self.boost_entry.pack(side='left')
+        Tooltip(self.boost_entry, "MLFQ priority boost period (blank = auto, 0 = off)")
+
+        # CFS
+        ttk.Label(opts, text='CFS latency:').pack(side='left', padx=(20,0))
+        self.latency_entry = ttk.Entry(opts, width=5)
+        self.latency_entry.insert(0, str(controller.cfs_config['target_latency']))
+        self.latency_entry.pack(side='left')
+        Tooltip(self.latency_entry, "Target latency: period in which every runnable task runs once")
+
+        ttk.Label(opts, text='Min gran:').pack(side='left', padx=(10,0))
+        self.gran_entry = ttk.Entry(opts, width=5)
+        self.gran_entry.insert(0, str(controller.cfs_config['min_granularity']))
+        self.gran_entry.pack(side='left')
+        Tooltip(self.gran_entry, "Minimum slice before a task can be preempted")
+
+        # group fair share
+        ttk.Label(opts, text='Group weights:').pack(side='left', padx=(20,0))
+        self.weights_entry = ttk.Entry(opts, width=18)
+        self.weights_entry.pack(side='left')
+        Tooltip(self.weights_entry, "e.g. tenantA:3;tenantB:1 (unlisted groups weigh 1)")
+
+        ttk.Label(opts, text='Inner:').pack(side='left', padx=(10,0))
+        self.inner_combo = ttk.Combobox(opts, values=list(sl.GROUP_INNER_POLICIES),
+                                        width=22, state='readonly')
+        self.inner_combo.set(controller.group_config['inner'])
+        self.inner_combo.pack(side='left')
+
+        # SJF / SRTF burst prediction
+        self.predict_var = tk.BooleanVar(value=controller.prediction_config['enabled'])
+        pred_chk = ttk.Checkbutton(opts, text='Predict bursts', variable=self.predict_var)
+        pred_chk.pack(side='left', padx=(20,0))
+        Tooltip(pred_chk, "SJF/SRTF order by exponential averages of past bursts (tasks with the same name share a history)")
+
+        ttk.Label(opts, text='α:').pack(side='left', padx=(6,0))
+        self.alpha_entry = ttk.Entry(opts, width=4)
+        self.alpha_entry.insert(0, str(controller.prediction_config['alpha']))
+        self.alpha_entry.pack(side='left')
+
+        ttk.Label(opts, text='τ0:').pack(side='left', padx=(6,0))
+        self.tau_entry = ttk.Entry(opts, width=4)
+        self.tau_entry.insert(0, str(controller.prediction_config['initial']))
+        self.tau_entry.pack(side='left')
+        Tooltip(self.tau_entry, "Initial burst guess before any history")
+
         # result table
         cols = ('pid','name','arrival','burst','priority','ct','wt','tat')
         self.table = ttk.Treeview(self, columns=cols, show='headings', height=7)
@@ -423,6 +588,12 @@ class SchedulerPage(ttk.Frame):
         self.ax = self.fig.add_subplot(111)
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
         self.canvas.get_tk_widget().pack(fill='both', expand=True, padx=12, pady=6)
+        self.canvas.mpl_connect('motion_notify_event', self._on_gantt_hover)
+        self.index = None
+        self._rows = {}
+        self._names = {}
+        self._hover = None
+        self._hover_key = None
 
         # metric labels
         bottom = ttk.Frame(self)
@@ -434,12 +605,30 @@ class SchedulerPage(ttk.Frame):
         self.avg_t_lbl = ttk.Label(bottom, text='Avg TAT: --')
         self.avg_t_lbl.pack(side='left', padx=12)
 
+        self.resp_lbl = ttk.Label(bottom, text='Avg RT: --')
+        self.resp_lbl.pack(side='left', padx=12)
+
+        self.tail_lbl = ttk.Label(bottom, text='p95/p99 WT: --')
+        self.tail_lbl.pack(side='left', padx=12)
+
         self.cpu_lbl = ttk.Label(bottom, text='CPU%: --')
         self.cpu_lbl.pack(side='left', padx=12)
 
         self.through_lbl = ttk.Label(bottom, text='Throughput: --')
         self.through_lbl.pack(side='left', padx=12)
 
+        self.switch_lbl = ttk.Label(bottom, text='Switches: --')
+        self.switch_lbl.pack(side='left', padx=12)
+
+        self.deadlock_lbl = ttk.Label(bottom, text='')
+        self.deadlock_lbl.pack(side='left', padx=12)
+
+        self.dev_lbl = ttk.Label(bottom, text='')
+        self.dev_lbl.pack(side='left', padx=12)
+
+        self.group_lbl = ttk.Label(self, text='', anchor='w')
+        self.group_lbl.pack(fill='x', padx=12)
+
         # progress bar
         self.progress = ttk.Progressbar(bottom, mode='determinate', length=180)
         self.progress.pack(side='right', padx=12)
@@ -459,18 +648,36 @@ class SchedulerPage(ttk.Frame):
             ))
 
     # draw gantt
-    def draw_gantt(self, timeline):
+    def draw_gantt(self, timeline, blocked=None, io=None):
         self.ax.clear()
-        if not timeline:
+        blocked = blocked or []
+        io = io or []
+        if not timeline and not blocked:
             self.ax.set_title('No timeline')
             self.canvas.draw_idle()
             return
 
-        ids = sorted(list({seg[0] for seg in timeline}))
+        overhead = [seg for seg in timeline if seg[0] == sl.CTX_SWITCH_PID]
+        if overhead:
+            timeline = [seg for seg in timeline if seg[0] != sl.CTX_SWITCH_PID]
+
+        ids = sorted(list({seg[0] for seg in timeline} | {seg[0] for seg in blocked}))
         id_to_y = {pid: i for i, pid in enumerate(ids)}
 
+        # hover lookups go through the interval index
+        self.index = self.controller.timeline_index()
+        self._rows = {y: pid for pid, y in id_to_y.items()}
+        self._names = {t['pid']: t.get('name', '') for t in self.controller.tasks}
+        if overhead:
+            self._rows[-1] = sl.CTX_SWITCH_PID
+
         colors = ['#3b82f6','#22c55e','#f97316','#ef4444','#a78bfa','#06b6d4','#fde68a']
 
+        # context-switch overhead on its own row below the tasks
+        for _, s, e in overhead:
+            self.ax.barh(-1, e - s, left=s, height=0.6,
+                         color='#111827', edgecolor='#f87171', hatch='xx')
+
         for i, (pid, s, e) in enumerate(timeline):
             y = id_to_y[pid]
             self.ax.barh(y, e - s, left=s, height=0.6,
@@ -478,14 +685,137 @@ class SchedulerPage(ttk.Frame):
             self.ax.text((s + e) / 2, y, f'P{pid}',
                          va='center', ha='center', color='white', fontsize=9)
 
-        self.ax.set_yticks(list(id_to_y.values()))
-        self.ax.set_yticklabels([f'P{pid}' for pid in ids])
+        # blocked intervals (waiting on a resource)
+        for pid, s, e in blocked:
+            self.ax.barh(id_to_y[pid], max(e - s, 0.15), left=s, height=0.35,
+                         color='#e5e7eb', edgecolor='#6b7280', hatch='//')
+
+        # device (I/O) bursts
+        for pid, dev, s, e in io:
+            y = id_to_y[pid]
+            self.ax.barh(y, e - s, left=s, height=0.35,
+                         color='#bae6fd', edgecolor='#0284c7', hatch='..')
+            if len(io) <= 60:
+                self.ax.text((s + e) / 2, y - 0.3, dev, va='center', ha='center',
+                             color='#0369a1', fontsize=7)
+
+        self.ax.set_yticks(([-1] if overhead else []) + list(id_to_y.values()))
+        self.ax.set_yticklabels((['CS'] if overhead else []) + [f'P{pid}' for pid in ids])
         self.ax.set_xlabel('Time')
         self.ax.grid(True, linestyle='--', alpha=0.4)
         self.ax.set_title(f"Gantt Chart — {self.algo_combo.get()}")
 
+        self._hover = self.ax.annotate('', xy=(0, 0), xytext=(12, 12), textcoords='offset points',
+                                       fontsize=8, bbox=dict(boxstyle='round', fc='#f9fafb', alpha=0.9))
+        self._hover.set_visible(False)
+        self._hover_key = None
+
+        self.canvas.draw_idle()
+
+    # tooltip for the segment under the mouse
+    def _on_gantt_hover(self, event):
+        if self._hover is None:
+            return
+        seg = None
+        if event.inaxes is self.ax and self.index is not None and event.xdata is not None:
+            pid = self._rows.get(int(round(event.ydata)))
+            seg = next((sg for sg in self.index.segments_at(event.xdata) if sg[0] == pid), None)
+        if seg == self._hover_key:
+            return
+        self._hover_key = seg
+        if seg is None:
+            self._hover.set_visible(False)
+        else:
+            pid, s, e = seg
+            if pid == sl.CTX_SWITCH_PID:
+                text = f'context switch [{s}, {e})'
+            else:
+                ran = self.index.occupancy(self.index.start, e, pid)
+                text = f"P{pid} {self._names.get(pid, '')}\n[{s}, {e})  CPU so far: {ran}"
+            self._hover.xy = (event.xdata, event.ydata)
+            self._hover.set_text(text)
+            self._hover.set_visible(True)
         self.canvas.draw_idle()
 
+    # current run as a Chrome / Perfetto trace
+    def export_trace(self):
+        if not self.controller.current_timeline:
+            messagebox.showwarning('No schedule', 'Run scheduler first.')
+            return
+        path = filedialog.asksaveasfilename(defaultextension='.json',
+                                            filetypes=[('Chrome trace', '*.json'), ('Compressed', '*.json.gz')])
+        if not path:
+            return
+        try:
+            n = self.controller.export_trace(path)
+            messagebox.showinfo('Exported', f'{n} trace events written to {path}')
+        except Exception as e:
+            messagebox.showerror('Export Error', f'Could not write trace: {e}')
+
+    # windowed utilization / ready-queue plot of the last run
+    def show_utilization(self):
+        if not self.controller.current_timeline:
+            messagebox.showwarning('No schedule', 'Run scheduler first.')
+            return
+        index = self.controller.timeline_index()
+
+        dlg = tk.Toplevel(self)
+        dlg.title('Utilization over time')
+        top = ttk.Frame(dlg)
+        top.pack(fill='x', padx=8, pady=6)
+        ttk.Label(top, text='Window:').pack(side='left')
+        width_entry = ttk.Entry(top, width=8)
+        width_entry.insert(0, str(max(1, (index.end - index.start) // 100)))
+        width_entry.pack(side='left', padx=4)
+
+        fig = Figure(figsize=(9, 4), dpi=100)
+        canvas = FigureCanvasTkAgg(fig, master=dlg)
+        canvas.get_tk_widget().pack(fill='both', expand=True, padx=8, pady=6)
+
+        def draw():
+            try:
+                width = max(1.0, float(width_entry.get()))
+            except ValueError:
+                return
+            self._plot_utilization(fig, width)
+            canvas.draw_idle()
+
+        tb.Button(top, text='Draw', bootstyle='primary', command=draw).pack(side='left', padx=6)
+        draw()
+
+    def _plot_utilization(self, fig, width):
+        fig.clear()
+        ax = fig.add_subplot(111)
+        series = self.controller.current_series
+        # kernel runs carry the ready-queue series; other engines only the timeline
+        if series is not None and len(series):
+            w = series.windows(width)
+        else:
+            w = self.controller.timeline_index().windows(width)
+        starts = np.append(w['start'], w['start'][-1] + width) if len(w['start']) else w['start']
+        util = np.append(w['util'], w['util'][-1:])
+
+        ax.step(starts, util, where='post', color='#2563eb', label='CPU %')
+        ax.fill_between(starts, 0, 100, where=util >= 99.9, step='post',
+                        color='#fca5a5', alpha=0.35, label='saturated')
+        ax.set_ylim(0, 105)
+        ax.set_xlabel('Time')
+        ax.set_ylabel('CPU %')
+        handles, labels = ax.get_legend_handles_labels()
+
+        if 'mean_ready' in w:
+            ax2 = ax.twinx()
+            ax2.step(starts, np.append(w['mean_ready'], w['mean_ready'][-1:]), where='post',
+                     color='#f97316', label='mean ready')
+            ax2.step(starts, np.append(w['max_ready'], w['max_ready'][-1:]), where='post',
+                     color='#f97316', linestyle='--', alpha=0.6, label='peak ready')
+            ax2.set_ylabel('Ready queue')
+            h2, l2 = ax2.get_legend_handles_labels()
+            handles, labels = handles + h2, labels + l2
+
+        ax.legend(handles, labels, loc='upper right', fontsize=8)
+        ax.set_title(f'Utilization per {width:g}-tick window — {self.algo_combo.get()}')
+
     # run scheduler
     def run_sched(self):
         if not getattr(self.controller, 'tasks', []):
@@ -499,23 +829,109 @@ class SchedulerPage(ttk.Frame):
         except Exception:
             q = 2
 
+        try:
+            self.controller.mlfq_config['levels'] = max(1, int(self.levels_entry.get()))
+        except Exception:
+            pass
+        boost = self.boost_entry.get().strip()
+        self.controller.mlfq_config['boost'] = int(boost) if boost.isdigit() else None
+
+        try:
+            self.controller.group_config['weights'] = sl.parse_group_weights(self.weights_entry.get())
+        except ValueError:
+            messagebox.showerror('Invalid', 'Group weights must look like A:3;B:1')
+            return
+        self.controller.group_config['inner'] = self.inner_combo.get()
+
+        pred = self.controller.prediction_config
+        pred['enabled'] = bool(self.predict_var.get())
+        try:
+            pred['alpha'] = min(1.0, max(0.0, float(self.alpha_entry.get())))
+            pred['initial'] = max(0.0, float(self.tau_entry.get()))
+        except ValueError:
+            messagebox.showerror('Invalid', 'α and τ0 must be numbers')
+            return
+
+        try:
+            self.controller.switch_cost = max(0, int(self.switch_entry.get()))
+        except Exception:
+            self.controller.switch_cost = 0
+
+        for key, entry in (('target_latency', self.latency_entry),
+                           ('min_granularity', self.gran_entry)):
+            try:
+                self.controller.cfs_config[key] = max(1, int(entry.get()))
+            except Exception:
+                pass
+
         self.progress.configure(maximum=100)
         self.progress.start(10)
 
+        resources = self.resources_var.get()
         try:
-            tl, m = self.controller.run_scheduler(algo, quantum=q)
+            tl, m = self.controller.run_scheduler(algo, quantum=q, resources=resources)
+        except ValueError as e:
+            # policy not available in this mode (resources, I/O bursts, group inner)
+            messagebox.showerror('Unsupported', str(e))
+            return
         finally:
             self.progress.stop()
 
         self.controller.current_timeline = tl
         self.current_timeline = tl
 
+        # earlier runs the background recorder could not save
+        errors = self.controller.run_history_errors()
+        if errors:
+            messagebox.showwarning('Run history', '\n'.join(errors[-5:]))
+
         self.avg_w_lbl.config(text=f"Avg WT: {m['avg_wait']:.2f}")
         self.avg_t_lbl.config(text=f"Avg TAT: {m['avg_tat']:.2f}")
+        self.resp_lbl.config(text=f"Avg RT: {m['avg_response']:.2f}" if 'avg_response' in m else 'Avg RT: --')
+        self.tail_lbl.config(text=f"p95/p99 WT: {m.get('p95_wait',0):.1f}/{m.get('p99_wait',0):.1f}")
         self.cpu_lbl.config(text=f"CPU%: {m.get('cpu_util',0):.1f}")
         self.through_lbl.config(text=f"Throughput: {m.get('throughput',0):.3f}")
+        self.switch_lbl.config(text=(
+            f"Switches: {m.get('switches',0)} | Overhead: {m.get('overhead',0)} | "
+            f"Eff CPU%: {m.get('effective_util', m.get('cpu_util',0)):.1f}"
+        ))
+
+        if resources:
+            deadlocks = self.controller.last_deadlocks
+            text = f"Blocked: {m.get('blocked_time', 0)}"
+            if deadlocks:
+                at, cycle = deadlocks[0]
+                text += f" | ❌ Deadlock at t={at}: " + ' → '.join(f'P{p}' for p in cycle)
+            self.deadlock_lbl.config(text=text, foreground='red' if deadlocks else '')
+        elif 'deadline_misses' in m:
+            sched = m.get('schedulability', {})
+            verdict = {True: 'schedulable', False: 'NOT schedulable', None: 'n/a'}[sched.get('schedulable')]
+            self.deadlock_lbl.config(
+                text=(f"U={sched.get('utilization', 0):.3f} ({sched.get('method', '')}: {verdict}) | "
+                      f"Misses: {m['deadline_misses']}/{m['jobs']} | Max lateness: {m['max_lateness']}"),
+                foreground='red' if m['deadline_misses'] else '')
+        elif 'actual' in m:
+            # no repeated names or burst sequences: nothing to learn from
+            no_history = not m.get('predicted_from_history')
+            self.deadlock_lbl.config(text=(
+                f"Predicted bursts: WT {m['avg_wait']:.2f} / TAT {m['avg_tat']:.2f} | "
+                f"Actual bursts: WT {m['actual']['avg_wait']:.2f} / TAT {m['actual']['avg_tat']:.2f}"
+                + (" | ⚠ No task name repeats: every estimate is τ0, so SJF runs as FCFS" if no_history else '')
+            ), foreground='red' if no_history else '')
+        else:
+            self.deadlock_lbl.config(text='')
 
-        self.draw_gantt(tl)
+        dev_util = m.get('device_util')
+        self.dev_lbl.config(text=' | '.join(f"{d}: {u:.1f}%" for d, u in dev_util.items())
+                            if dev_util else '')
+
+        groups = m.get('groups') or {}
+        self.group_lbl.config(text='   '.join(
+            f"[{g or '-'}] CPU {st['cpu_share']:.1f}% WT {st['avg_wait']:.1f} RT {st['avg_response']:.1f}"
+            for g, st in sorted(groups.items())[:8]
+        ) + (f"   (+{len(groups) - 8} groups)" if len(groups) > 8 else ''))
+
+        self.draw_gantt(tl, self.controller.current_blocked, self.controller.current_io)
         self.refresh_table()
 
     def on_show(self):
@@ -535,6 +951,27 @@ class ComparePage(ttk.Frame):
         tb.Button(top, text='Run Comparison (All Algos)', bootstyle='info',
                   command=self.run_all).pack(side='left', padx=8)
 
+        self.sens_btn = tb.Button(top, text='Prediction Sensitivity', bootstyle='info-outline',
+                                  command=self.run_sensitivity)
+        self.sens_btn.pack(side='left', padx=8)
+        self._sensitivity = None
+
+        # Monte Carlo over randomized / resampled workloads
+        ttk.Label(top, text='Runs:').pack(side='left', padx=(10,0))
+        self.runs_entry = ttk.Entry(top, width=6)
+        self.runs_entry.insert(0, '200')
+        self.runs_entry.pack(side='left')
+
+        self.resample_var = tk.BooleanVar(value=True)
+        mc_chk = ttk.Checkbutton(top, text='Resample tasks', variable=self.resample_var)
+        mc_chk.pack(side='left', padx=(6,0))
+        Tooltip(mc_chk, "On: bootstrap the current task set. Off: Poisson arrivals / exponential bursts with the same size and means")
+
+        self.mc_btn = tb.Button(top, text='Monte Carlo', bootstyle='info-outline',
+                                command=self.run_monte_carlo)
+        self.mc_btn.pack(side='left', padx=8)
+        self._monte_carlo = None
+
         tb.Button(top, text='Save Chart', bootstyle='secondary-outline',
                   command=self.save_chart).pack(side='left')
 
@@ -543,12 +980,12 @@ class ComparePage(ttk.Frame):
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
         self.canvas.get_tk_widget().pack(fill='both', expand=True, padx=12, pady=6)
 
-        self.table = ttk.Treeview(self, columns=('algo','avg_w','avg_t'),
-                                  show='headings', height=6)
+        cols = ('algo','avg_w','avg_t','avg_r','p95_w','p99_w','p99_t','switches','eff_cpu')
+        self.table = ttk.Treeview(self, columns=cols, show='headings', height=6)
 
-        for c in ('algo','avg_w','avg_t'):
+        for c in cols:
             self.table.heading(c, text=c.upper(), anchor='center')
-            self.table.column(c, width=220, anchor='center')
+            self.table.column(c, width=200 if c == 'algo' else 100, anchor='center')
 
         self.table.pack(padx=12, pady=8, fill='x')
 
@@ -558,28 +995,38 @@ class ComparePage(ttk.Frame):
             messagebox.showwarning('No tasks', 'Add tasks first')
             return
 
-        algos = [
-            'FCFS', 'SJF (Non-preemptive)', 'SJF (Preemptive)',
-            'Priority (Non-preemptive)', 'Priority (Preemptive)',
-            'LJF', 'Round Robin'
-        ]
-
+        algos = []
         avg_w = []
         avg_t = []
         results = {}
+        skipped = []
 
-        for a in algos:
-            tl, m = self.controller.run_scheduler(a, quantum=2)
+        for a in sl.algorithm_names():
+            try:
+                tl, m = self.controller.run_scheduler(a, quantum=2)
+            except ValueError:
+                # e.g. MLFQ / CFS on tasks with I/O bursts
+                skipped.append(a)
+                continue
+            algos.append(a)
             avg_w.append(m['avg_wait'])
             avg_t.append(m['avg_tat'])
             results[a] = m
+        if skipped:
+            messagebox.showinfo('Compare', 'Not supported for this task set: ' + ', '.join(skipped))
+        if not algos:
+            return
 
         for r in self.table.get_children():
             self.table.delete(r)
 
         for a in algos:
+            m = results[a]
             self.table.insert('', 'end', values=(
-                a, f"{results[a]['avg_wait']:.2f}", f"{results[a]['avg_tat']:.2f}"
+                a, f"{m['avg_wait']:.2f}", f"{m['avg_tat']:.2f}",
+                f"{m.get('avg_response', 0):.2f}", f"{m.get('p95_wait', 0):.2f}",
+                f"{m.get('p99_wait', 0):.2f}", f"{m.get('p99_tat', 0):.2f}",
+                m.get('switches', 0), f"{m.get('effective_util', m.get('cpu_util', 0)):.1f}"
             ))
 
         self.fig.clf()
@@ -610,6 +1057,134 @@ class ComparePage(ttk.Frame):
 
         self.canvas.draw_idle()
 
+    # means and 95% confidence intervals over many workloads (worker thread, polled)
+    def run_monte_carlo(self):
+        tasks = getattr(self.controller, 'tasks', [])
+        try:
+            runs = max(2, int(self.runs_entry.get()))
+        except ValueError:
+            messagebox.showerror('Invalid', 'Runs must be an integer')
+            return
+        if self.resample_var.get() and not tasks:
+            messagebox.showwarning('No tasks', 'Add tasks first (or untick Resample tasks)')
+            return
+        if self._monte_carlo is not None:
+            return
+
+        c = self.controller
+        config = {'quantum': 2, 'mlfq': c.mlfq_config, 'cfs': c.cfs_config, 'group': c.group_config}
+        if self.resample_var.get():
+            kwargs = {'tasks': [dict(t) for t in tasks]}
+        else:
+            kwargs = {'n': 50}
+            if tasks:
+                span = max(t['arrival'] for t in tasks) - min(t['arrival'] for t in tasks)
+                kwargs = {'n': len(tasks), 'mean_gap': max(span, 1) / len(tasks),
+                          'mean_burst': sum(t['burst'] for t in tasks) / len(tasks)}
+        job = {'runs': runs, 'result': None, 'error': None}
+
+        def work():
+            try:
+                job['result'] = mc.monte_carlo(runs, config=config, switch_cost=c.switch_cost, **kwargs)
+            except Exception as e:
+                job['error'] = e
+
+        job['thread'] = threading.Thread(target=work, daemon=True)
+        self._monte_carlo = job
+        self.mc_btn.config(state='disabled', text='Monte Carlo…')
+        job['thread'].start()
+        self.after(200, self._monte_carlo_done)
+
+    def _monte_carlo_done(self):
+        job = self._monte_carlo
+        if job['thread'].is_alive():
+            self.after(200, self._monte_carlo_done)
+            return
+        self._monte_carlo = None
+        self.mc_btn.config(state='normal', text='Monte Carlo')
+        if job['error'] is not None:
+            messagebox.showerror('Monte Carlo Error', str(job['error']))
+            return
+
+        res, runs = job['result'], job['runs']
+        algos = list(res)
+        for r in self.table.get_children():
+            self.table.delete(r)
+        ci = lambda st: f"{st['mean']:.2f}±{st['ci_high'] - st['mean']:.2f}"
+        for a in algos:
+            m = res[a]
+            self.table.insert('', 'end', values=(
+                a, ci(m['avg_wait']), ci(m['avg_tat']), ci(m['avg_response']), ci(m['p95_wait']),
+                ci(m['p99_wait']), ci(m['p99_tat']), f"{m['switches']['mean']:.1f}",
+                f"{m['effective_util']['mean']:.1f}"
+            ))
+
+        self.fig.clf()
+        self.ax = self.fig.add_subplot(111)
+        x = list(range(len(algos)))
+        mean = [res[a]['avg_wait']['mean'] for a in algos]
+        err = [res[a]['avg_wait']['ci_high'] - res[a]['avg_wait']['mean'] for a in algos]
+        self.ax.bar(x, mean, yerr=err, capsize=4, alpha=0.9, label='Avg WT (95% CI)')
+        p99 = [res[a]['p99_wait']['mean'] for a in algos]
+        self.ax.plot(x, p99, marker='o', linestyle='', color='#ff0066', label='p99 WT (mean)')
+        self.ax.set_xticks(x)
+        self.ax.set_xticklabels(algos, rotation=20, ha='right')
+        self.ax.set_ylabel('Waiting Time')
+        self.ax.set_title(f'Monte Carlo — {runs} workloads')
+        self.ax.legend(loc='upper left')
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+
+    # SJF / SRTF degradation as burst estimates get noisier (worker thread, polled)
+    def run_sensitivity(self):
+        tasks = getattr(self.controller, 'tasks', [])
+        if not tasks:
+            messagebox.showwarning('No tasks', 'Add tasks first')
+            return
+        if self._sensitivity is not None:
+            return
+
+        errors = (0.0, 0.1, 0.25, 0.5, 0.75, 1.0)
+        job = {'tasks': [dict(t) for t in tasks], 'result': None, 'error': None}
+
+        def work():
+            try:
+                job['result'] = [(label, sl.prediction_sensitivity(job['tasks'], errors, seeds=30,
+                                                                   preemptive=preemptive))
+                                 for label, preemptive in (('SJF', False), ('SRTF', True))]
+            except Exception as e:
+                job['error'] = e
+
+        job['thread'] = threading.Thread(target=work, daemon=True)
+        self._sensitivity = job
+        self.sens_btn.config(state='disabled', text='Sensitivity…')
+        job['thread'].start()
+        self.after(200, self._sensitivity_done)
+
+    def _sensitivity_done(self):
+        job = self._sensitivity
+        if job['thread'].is_alive():
+            self.after(200, self._sensitivity_done)
+            return
+        self._sensitivity = None
+        self.sens_btn.config(state='normal', text='Prediction Sensitivity')
+        if job['error'] is not None:
+            messagebox.showerror('Sensitivity Error', str(job['error']))
+            return
+
+        self.fig.clf()
+        self.ax = self.fig.add_subplot(111)
+        for label, res in job['result']:
+            self.ax.errorbar([r['error'] for r in res], [r['avg_wait'] for r in res],
+                             yerr=[r['avg_wait_std'] for r in res], marker='o', capsize=3, label=label)
+
+        self.ax.set_xlabel('Prediction error σ (log-normal)')
+        self.ax.set_ylabel('Avg Waiting Time')
+        self.ax.set_title('Sensitivity to Burst Prediction Error (30 seeds)')
+        self.ax.grid(True, linestyle='--', alpha=0.4)
+        self.ax.legend()
+        self.canvas.draw_idle()
+
     # save chart
     def save_chart(self):
         path = filedialog.asksaveasfilename(defaultextension='.png',
@@ -658,6 +1233,22 @@ class DeadlockPage(ttk.Frame):
         tb.Button(top, text='Refresh', bootstyle='secondary-outline',
                   command=self.refresh).grid(row=1, column=5, padx=6)
 
+        # multi-instance mode
+        ttk.Label(top, text='Available (R:n;...)').grid(row=2, column=0, pady=(6,0))
+        self.p_avail = ttk.Entry(top, width=28)
+        self.p_avail.grid(row=3, column=0, columnspan=2, padx=6, sticky='w')
+        self.p_avail.insert(0, sl.format_resource_counts(self.controller.available_resources))
+        Tooltip(self.p_avail, "Free instances per resource type, e.g. R1:2;R2:1")
+
+        tb.Button(top, text='Matrix Detect', bootstyle='warning',
+                  command=self.detect_matrix).grid(row=3, column=3, padx=8)
+
+        self.scc_only = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text='Cycles only (SCCs + neighbours)', variable=self.scc_only,
+                        command=self.redraw).grid(row=3, column=4, columnspan=2, padx=6)
+        self._layout_cache = {}
+        self._last_edges, self._last_cycle = [], []
+
         cols = ('pid','name','holding','waiting')
         self.table = ttk.Treeview(self, columns=cols, show='headings', height=6)
 
@@ -728,34 +1319,76 @@ class DeadlockPage(ttk.Frame):
 
         self.visualize_wait_for_graph(cycle if found else [])
 
-    # build wait-for graph edges
-    def visualize_wait_for_graph(self, cycle_nodes):
+    # detect with Available / Allocation / Request matrices
+    def detect_matrix(self):
         tasks = self.controller.tasks
+        try:
+            available = sl.parse_resource_counts(self.p_avail.get())
+        except ValueError:
+            messagebox.showerror('Invalid', 'Available must look like R1:2;R2:1')
+            return
+        self.controller.available_resources = available
+
+        found, stuck = sl.detect_deadlock_matrix(tasks, available)
 
-        holders = {}
-        for t in tasks:
-            h = (t.get('holding') or '').strip()
-            if h:
-                holders.setdefault(h, []).append(t['pid'])
-
-        edges = []
-        for t in tasks:
-            w = (t.get('waiting') or '').strip()
-            if w:
-                owners = holders.get(w, [])
-                for o in owners:
-                    if o != t['pid']:
-                        edges.append((t['pid'], o))
+        if found:
+            names = [f"P{t['pid']} ({t.get('name', '')})" for t in tasks if t['pid'] in set(stuck)]
+            self.result_lbl.config(text=(
+                "❌ DEADLOCK DETECTED!\n\n"
+                "Requests cannot be satisfied by any completion order.\n\n"
+                f"Processes: {', '.join(names)}\n"
+            ), foreground='red')
+        else:
+            self.result_lbl.config(
+                text="✅ No deadlock detected.",
+                foreground='green'
+            )
 
+        self.visualize_wait_for_graph(stuck)
+
+    # build wait-for graph edges
+    def visualize_wait_for_graph(self, cycle_nodes):
+        edges = sl.wait_for_edges(self.controller.tasks)
         self.draw_graph(edges, cycle_nodes)
 
+    # cached circular layout, SCC members placed next to each other (keyed by the partition too,
+    # since an edited request can regroup the same nodes)
+    def _layout(self, nodes, comps):
+        key = (tuple(nodes), tuple(tuple(comp) for comp in comps), self.scc_only.get())
+        pos = self._layout_cache.get(key)
+        if pos is not None:
+            return pos
+
+        order = [u for comp in sorted(comps, key=len, reverse=True) for u in comp]
+        n = len(order)
+        pos = {}
+        for i, pid in enumerate(order):
+            angle = 2 * math.pi * i / n
+            pos[pid] = (math.cos(angle), math.sin(angle))
+
+        if len(self._layout_cache) >= 8:
+            self._layout_cache.clear()
+        self._layout_cache[key] = pos
+        return pos
+
     # draw wait-for graph
     def draw_graph(self, edges, cycle_nodes=[]):
+        self._last_edges, self._last_cycle = edges, cycle_nodes
         self.ax.clear()
         tasks = self.controller.tasks
 
         pid_to_task = {t['pid']: t for t in tasks}
-        nodes = sorted({n for e in edges for n in e} | {t['pid'] for t in tasks})
+        nodes = sorted({n for e in edges for n in e} | set(pid_to_task))
+        comps = sl.strongly_connected_components(nodes, edges)
+
+        # keep only non-trivial SCCs and their direct neighbours
+        if self.scc_only.get():
+            core = {u for comp in comps if len(comp) > 1 for u in comp}
+            keep = core | {b for a, b in edges if a in core} | {a for a, b in edges if b in core}
+            nodes = [u for u in nodes if u in keep]
+            edges = [(a, b) for a, b in edges if a in keep and b in keep]
+            comps = [[u for u in comp if u in keep] for comp in comps]
+            comps = [comp for comp in comps if comp]
 
         if not nodes:
             self.ax.text(0.5, 0.5, 'No nodes', ha='center')
@@ -763,55 +1396,75 @@ class DeadlockPage(ttk.Frame):
             self.canvas.draw_idle()
             return
 
+        pos = self._layout(nodes, comps)
         n = len(nodes)
-        pos = {}
-
-        for i, pid in enumerate(nodes):
-            angle = 2 * math.pi * i / n
-            pos[pid] = (math.cos(angle), math.sin(angle))
-
-        for pid, (x, y) in pos.items():
-            color = '#22c55e' if pid not in cycle_nodes else '#ef4444'
-            self.ax.scatter(x, y, s=1200, color=color)
-            name = pid_to_task.get(pid, {}).get('name', f'P{pid}')
-            self.ax.text(x, y, f'{name}\n(P{pid})',
-                         ha='center', va='center', color='white', fontsize=9)
-
-        for a, b in edges:
-            x1, y1 = pos[a]
-            x2, y2 = pos[b]
-
-            dx = x2 - x1
-            dy = y2 - y1
-            dist = math.sqrt(dx*dx + dy*dy)
-            offset = 0.1 / dist if dist > 0 else 0
-
-            xs = x1 + dx * offset
-            ys = y1 + dy * offset
-            xe = x2 - dx * offset
-            ye = y2 - dy * offset
-
-            arrow_color = '#ff0033' if (a in cycle_nodes or b in cycle_nodes) else '#000'
-            self.ax.annotate('', xy=(xe, ye), xytext=(xs, ys),
-                             arrowprops=dict(arrowstyle='->', color=arrow_color, lw=2))
-
-            mid_x = x1 + dx / 2.5
-            mid_y = y1 + dy / 2.5
-            label_x = mid_x + dy * 0.05
-            label_y = mid_y - dx * 0.05
-
-            waiting_res = pid_to_task[a].get('waiting', '')
-            self.ax.text(label_x, label_y, f'{waiting_res}',
-                         fontsize=8,
-                         color='blue' if arrow_color=='#000' else '#ff0033',
-                         ha='center', va='center',
-                         bbox=dict(facecolor='white', alpha=0.9, edgecolor='none', pad=1))
-
+        cycle_set = set(cycle_nodes)
+        show_labels = n <= 40
+
+        # nodes in one scatter call
+        xs = [pos[u][0] for u in nodes]
+        ys = [pos[u][1] for u in nodes]
+        node_colors = ['#ef4444' if u in cycle_set else '#22c55e' for u in nodes]
+        size = 1200 if show_labels else max(8, 12000 / n)
+        self.ax.scatter(xs, ys, s=size, color=node_colors, zorder=3)
+
+        if show_labels:
+            for pid in nodes:
+                x, y = pos[pid]
+                name = pid_to_task.get(pid, {}).get('name', f'P{pid}')
+                self.ax.text(x, y, f'{name}\n(P{pid})',
+                             ha='center', va='center', color='white', fontsize=9, zorder=4)
+
+        # edges as one LineCollection, arrow heads as one quiver
+        if edges:
+            shrink = 0.16 if show_labels else 0.02
+            segs, heads, edge_colors = [], [], []
+            for a, b in edges:
+                x1, y1 = pos[a]
+                x2, y2 = pos[b]
+                dx, dy = x2 - x1, y2 - y1
+                dist = math.hypot(dx, dy)
+                off = shrink / dist if dist > 0 else 0
+                xs_, ys_ = x1 + dx * off, y1 + dy * off
+                xe, ye = x2 - dx * off, y2 - dy * off
+                segs.append(((xs_, ys_), (xe, ye)))
+                heads.append((xe, ye, dx * off * 0.5, dy * off * 0.5))
+                in_cycle = a in cycle_set or b in cycle_set
+                edge_colors.append('#ff0033' if in_cycle else '#000')
+
+            lw = 2 if show_labels else 0.6
+            self.ax.add_collection(LineCollection(segs, colors=edge_colors, linewidths=lw, zorder=2))
+            hx, hy, hu, hv = zip(*heads)
+            self.ax.quiver(hx, hy, hu, hv, color=edge_colors, angles='xy', scale_units='xy',
+                           scale=1, pivot='tip', width=0.004 if show_labels else 0.002,
+                           headwidth=4, headlength=5, headaxislength=4.5, zorder=4)
+
+            if len(edges) <= 40:
+                for (a, b), color in zip(edges, edge_colors):
+                    x1, y1 = pos[a]
+                    x2, y2 = pos[b]
+                    dx, dy = x2 - x1, y2 - y1
+                    label_x = x1 + dx / 2.5 + dy * 0.05
+                    label_y = y1 + dy / 2.5 - dx * 0.05
+                    waiting_res = pid_to_task.get(a, {}).get('waiting', '')
+                    self.ax.text(label_x, label_y, f'{waiting_res}',
+                                 fontsize=8,
+                                 color='blue' if color == '#000' else '#ff0033',
+                                 ha='center', va='center',
+                                 bbox=dict(facecolor='white', alpha=0.9, edgecolor='none', pad=1))
+
+        self.ax.set_xlim(-1.25, 1.25)
+        self.ax.set_ylim(-1.25, 1.25)
+        self.ax.set_aspect('equal')
         self.ax.axis('off')
-        self.ax.set_title('Wait-For Graph')
+        self.ax.set_title(f'Wait-For Graph ({n} nodes, {len(edges)} edges)')
 
         self.canvas.draw_idle()
 
+    # redraw after toggling the SCC filter
+    def redraw(self):
+        self.draw_graph(self._last_edges, self._last_cycle)
+
     def on_show(self):
         self.refresh()
 
@@ -826,15 +1479,28 @@ class PowerPage(ttk.Frame):
         top = ttk.Frame(self)
         top.pack(fill='x', pady=6)
 
-        ttk.Label(top, text='Power rate:').pack(side='left', padx=6)
-        self.rate = ttk.Entry(top, width=8)
-        self.rate.insert(0, '1')
-        self.rate.pack(side='left', padx=6)
+        # CPU power model and energy-aware mode
+        ttk.Label(top, text='Model:').pack(side='left', padx=6)
+        self.model_combo = ttk.Combobox(top, values=list(pw.PRESETS), width=16, state='readonly')
+        self.model_combo.set('big.LITTLE 2+4')
+        self.model_combo.pack(side='left', padx=6)
+        ttk.Label(top, text='Mode:').pack(side='left', padx=6)
+        self.mode_combo = ttk.Combobox(top, values=list(pw.ENERGY_MODES), width=16, state='readonly')
+        self.mode_combo.set('Slow and steady')
+        self.mode_combo.pack(side='left', padx=6)
+
+        # optional window; blank means the whole run
+        ttk.Label(top, text='From:').pack(side='left', padx=(12, 2))
+        self.win_from = ttk.Entry(top, width=8)
+        self.win_from.pack(side='left', padx=2)
+        ttk.Label(top, text='To:').pack(side='left', padx=(6, 2))
+        self.win_to = ttk.Entry(top, width=8)
+        self.win_to.pack(side='left', padx=2)
 
         tb.Button(top, text='Compute Power', bootstyle='primary',
                   command=self.compute_power).pack(side='left', padx=6)
 
-        self.result_lbl = ttk.Label(self, text='Energy stats here.', anchor='center')
+        self.result_lbl = ttk.Label(self, text='Energy stats here.', anchor='center', justify='center')
         self.result_lbl.pack(pady=8)
 
         self.fig = Figure(figsize=(9, 4), dpi=100)
@@ -849,44 +1515,59 @@ class PowerPage(ttk.Frame):
             return
 
         try:
-            rate = float(self.rate.get())
+            lo = int(self.win_from.get()) if self.win_from.get().strip() else None
+            hi = int(self.win_to.get()) if self.win_to.get().strip() else None
         except ValueError:
-            messagebox.showerror('Invalid', 'Enter numeric rate.')
+            messagebox.showerror('Invalid', 'Enter a numeric window.')
             return
 
-        tl = self.controller.current_timeline
+        model = pw.PowerModel.preset(self.model_combo.get())
+        mode = self.mode_combo.get()
 
-        min_start = min((s for (_, s, _) in tl), default=0)
-        max_end = max((e for (_, _, e) in tl), default=0)
-
-        total_time = max_end - min_start
-        total_exec = sum(e - s for (_, s, e) in tl)
-        idle_time = total_time - total_exec
-
-        energy_used = total_exec * rate
-        energy_idle = idle_time * (rate * 0.2)
-        total_energy = energy_used + energy_idle
-
-        efficiency = (energy_used / total_energy) * 100 if total_energy > 0 else 0
-
-        self.result_lbl.config(text=(
-            f"Span: {total_time} | Active: {energy_used:.2f} | "
-            f"Idle: {energy_idle:.2f} | Eff: {efficiency:.1f}%"
-        ))
+        # the run as scheduled, at the highest P-states, over the window
+        try:
+            cur = pw.timeline_energy(self.controller.current_timeline, model, lo=lo, hi=hi,
+                                     index=self.controller.timeline_index())
+        except ValueError as e:
+            messagebox.showerror('Power model', str(e))
+            return
+        bars = [('This run', cur)]
+        lines = [f"This run [{cur['start']}, {cur['end']}): active {cur['active']:.1f} | "
+                 f"idle {cur['idle'] + cur['wake']:.1f} | eff {cur['efficiency']:.1f}%"]
+
+        # the same workload re-run on the model in the chosen mode (kernel policies only)
+        plan = self.controller.energy_plan(model, mode)
+        if plan is not None:
+            for r in plan['runs']:
+                label = 'Race to idle' if r is plan['runs'][0] else f"{r['fraction']:.0%} freq"
+                if r is plan['chosen']:
+                    label += ' *'
+                bars.append((label, r['energy']))
+            c = plan['chosen']
+            lines.append(f"{mode}: {c['fraction']:.0%} of max frequency | "
+                         f"{c['energy']['total']:.1f} over [{plan['start']}, {plan['end']}) | "
+                         f"avg wait {c['metrics']['avg_wait']:.2f} | makespan {c['end'] - plan['start']}")
+        else:
+            lines.append('Energy-aware modes need a kernel policy run.')
+        self.result_lbl.config(text='\n'.join(lines))
 
         self.ax.clear()
+        x = np.arange(len(bars))
+        active = [e['active'] for _, e in bars]
+        idle = [e['idle'] + e['wake'] for _, e in bars]
+        self.ax.bar(x, active, label='Active')
+        self.ax.bar(x, idle, bottom=active, label='Idle (C-states)')
+
+        for i, (_, e) in enumerate(bars):
+            self.ax.text(i, e['total'] / 2, f"{e['efficiency']:.1f}%", ha='center', va='center',
+                         fontsize=9, fontweight='bold',
+                         color='white' if e['efficiency'] > 50 else 'black',
+                         bbox=dict(facecolor='#333', alpha=0.6, pad=3))
 
-        self.ax.bar(['Energy'], [energy_used], label='Active')
-        self.ax.bar(['Energy'], [energy_idle], bottom=[energy_used], label='Idle')
-
-        self.ax.text(0, energy_used + energy_idle/2,
-                     f'{efficiency:.1f}%', ha='center', va='center',
-                     fontsize=10, fontweight='bold',
-                     color='white' if efficiency>50 else 'black',
-                     bbox=dict(facecolor='#333', alpha=0.6, pad=4))
-
-        self.ax.set_ylabel('Energy')
-        self.ax.set_title('Power Efficiency')
+        self.ax.set_xticks(x)
+        self.ax.set_xticklabels([name for name, _ in bars], rotation=15 if len(bars) > 4 else 0)
+        self.ax.set_ylabel('Energy (W x ticks)')
+        self.ax.set_title(f'Power Efficiency - {self.model_combo.get()}')
         self.ax.legend()
 
         self.canvas.draw_idle()
@@ -1,9 +1,334 @@
 # Main execution file
-from app_controller import SmartSchedulerApp
+import argparse
+import os
+import sys
+import time
 
-def main():
+
+def run_gui(args):
+    # imported here so the headless commands don't need Tk
+    from app_controller import SmartSchedulerApp
     app = SmartSchedulerApp()
     app.mainloop()
 
+
+def run_plan(args):
+    import capacity
+    import scheduling_logic as sl
+    import workload_io as wio
+
+    if args.policy not in sl.POLICY_REGISTRY:
+        sys.exit(f'unknown policy {args.policy!r}; choose from: {", ".join(sl.POLICY_REGISTRY)}')
+    try:
+        slo = capacity.parse_slo(args.slo)
+    except ValueError as e:
+        sys.exit(str(e))
+    tasks = wio.load_tasks(args.workload)
+    config = {'quantum': args.quantum, 'mlfq': {}, 'cfs': {}, 'group': {}}
+
+    t0 = time.perf_counter()
+    try:
+        res = capacity.plan_capacity(tasks, args.policy, slo, config, args.switch_cost,
+                                     args.max_cores, args.max_speed, args.speed, args.frontier)
+    except ValueError as e:
+        sys.exit(str(e))
+    elapsed = time.perf_counter() - t0
+
+    print(f'{args.policy} on {len(tasks)} tasks, SLO {args.slo}')
+    if res['cores'] is None:
+        print(f'not met with {args.max_cores} cores at {args.speed:.2f}x')
+    else:
+        print(f'min cores at {args.speed:.2f}x: {res["cores"]}')
+        m = res['metrics']
+        print('  ' + '  '.join(f'{name}={m[name]:.2f}' for name in dict.fromkeys(
+            [name for name, _, _ in slo] + ['avg_wait', 'p99_wait', 'cpu_util'])))
+    if res['frontier']:
+        print('min speed per core count:')
+        for cores, speed in res['frontier']:
+            print(f'  {cores:>5} cores: {speed:.2f}x')
+    print(f'{res["simulations"]} simulations, {elapsed:.1f}s')
+
+
+def run_convert(args):
+    import workload_io as wio
+
+    t0 = time.perf_counter()
+    try:
+        n = wio.csv_to_binary(args.csv, args.out, args.workers)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f'{n} tasks -> {args.out} ({time.perf_counter() - t0:.1f}s)')
+
+
+def run_swf(args):
+    import traces
+
+    filters = {
+        'start': args.start, 'end': args.end, 'min_runtime': args.min_runtime,
+        'max_jobs': args.max_jobs, 'time_scale': args.time_scale,
+        'priority_field': args.priority_field, 'group_field': args.group_field,
+        'status': _int_list(args.status), 'users': _int_list(args.users),
+        'queues': _int_list(args.queues),
+    }
+    header = traces.swf_header(args.trace)
+    t0 = time.perf_counter()
+    n = traces.swf_to_binary(args.trace, args.out, **filters)
+    print(f'{n} jobs -> {args.out} ({time.perf_counter() - t0:.1f}s)')
+    for key in ('Computer', 'MaxProcs', 'MaxJobs'):
+        if key in header:
+            print(f'  {key}: {header[key]}')
+
+
+def run_replay(args):
+    import traces
+    import scheduling_logic as sl
+    import workload_io as wio
+
+    for name in args.policy or ():
+        if name not in sl.POLICY_REGISTRY:
+            sys.exit(f'unknown policy {name!r}; choose from: {", ".join(sl.POLICY_REGISTRY)}')
+    t0 = time.perf_counter()
+    obs = traces.load_sched_trace(args.trace, args.tick, args.cores, start=args.start, end=args.end,
+                                  comms=tuple(args.comm.split(',')) if args.comm else None,
+                                  tids=_int_list(args.tids))
+    tasks, cores, stats = obs['tasks'], obs['cores'], obs['stats']
+    print(f'{stats["events"]} events, {len(tasks)} jobs on {cores} CPUs '
+          f'({time.perf_counter() - t0:.1f}s; times in ticks of {args.tick:g}s)')
+    if args.out:
+        wio.write_binary(args.out, wio.tasks_columns(tasks))
+        print(f'  jobs -> {args.out}')
+    if args.trace_out:
+        import trace_export as tx
+        n = tx.write_chrome_trace(args.trace_out, obs['timeline'], tasks, tick=args.tick, process='Observed')
+        print(f'  observed timeline -> {args.trace_out} ({n} events)')
+    if not tasks:
+        return
+
+    # Linux defaults: 4ms round-robin slices, 6ms CFS latency / 0.75ms granularity
+    ms = 1e-3 / args.tick
+    config = {'quantum': max(1, round(args.quantum * ms)), 'mlfq': {}, 'group': {},
+              'cfs': {'target_latency': max(1, round(6 * ms)), 'min_granularity': max(1, round(0.75 * ms))}}
+    rows = [('Observed', obs['metrics'])]
+    for name in args.policy or ('FCFS', 'Round Robin', 'CFS'):
+        tl = sl.run_policy(tasks, name, config, args.switch_cost, cores)
+        rows.append((name, sl.compute_metrics(tasks, tl, cores)))
+    print(f'  {"":<26} {"avg_wait":>12} {"p99_wait":>12} {"avg_resp":>12} {"cpu_util":>9}')
+    for name, m in rows:
+        print(f'  {name:<26} {m["avg_wait"]:>12.1f} {m["p99_wait"]:>12.1f} '
+              f'{m["avg_response"]:>12.1f} {m["cpu_util"]:>9.1f}')
+
+
+def run_sample(args):
+    import procfs
+    import workload_io as wio
+
+    if not procfs.proc_available():
+        sys.exit('live sampling needs Linux /proc')
+    sampler = procfs.ProcSampler(args.interval, args.tick, threads=args.threads,
+                                 kernel_threads=args.kernel_threads)
+    try:
+        sampler.run(args.duration)
+    except KeyboardInterrupt:
+        pass
+    tasks = sampler.stop()
+    wio.write_binary(args.out, wio.tasks_columns(tasks))
+    print(f'{len(tasks)} bursts -> {args.out} ({sampler.passes} passes, '
+          f'{sampler.overhead():.2f}% of one CPU)')
+
+
+def _int_list(text):
+    return tuple(int(x) for x in text.split(',')) if text else None
+
+
+def run_db(args):
+    import store as st
+    import workload_io as wio
+
+    with st.WorkloadStore(args.db) as db:
+        if args.db_command == 'import':
+            t0 = time.perf_counter()
+            if wio.is_binary(args.path):
+                wid = db.save_workload(args.name or os.path.basename(args.path),
+                                       wio.load_tasks(args.path), source=args.path)
+            else:
+                wid = db.import_csv(args.path, args.name)
+            w = next(w for w in db.workloads() if w['id'] == wid)
+            print(f'workload {wid} ({w["name"]}): {w["n_tasks"]} tasks, {time.perf_counter() - t0:.1f}s')
+        elif args.db_command == 'list':
+            for w in db.workloads():
+                print(f'{w["id"]:>5}  {w["name"]:<24} {w["n_tasks"]:>9} tasks {w["runs"]:>5} runs')
+        elif args.db_command == 'runs':
+            wid = None
+            if args.workload is not None:
+                wid = db.workload_id(args.workload)
+                if wid is None:
+                    sys.exit(f'no workload {args.workload!r}')
+            for r in db.runs(wid, args.algo):
+                m = r['metrics']
+                print(f'{r["id"]:>5}  workload {r["workload_id"]:<5} {r["algo"]:<26} '
+                      f'avg_wait={m.get("avg_wait", 0):.2f}  p99_wait={m.get("p99_wait", 0):.2f}  '
+                      f'cpu_util={m.get("cpu_util", 0):.1f}')
+        elif args.db_command == 'window':
+            import scheduling_logic as sl
+            import timeline as tli
+            run = db.runs(run_id=args.run)
+            if not run:
+                sys.exit(f'no run {args.run}')
+            lo, hi = args.start, args.end
+            if args.at is not None:
+                # load enough of the run to answer the point query too
+                lo = None if lo is None else min(lo, int(args.at))
+                hi = None if hi is None else max(hi, int(args.at) + 1)
+            index = tli.TimelineIndex(db.load_timeline(args.run, lo, hi))
+            if args.at is not None:
+                running = ['switch' if p == sl.CTX_SWITCH_PID else f'P{p}' for p in index.running_at(args.at)]
+                print(f't={args.at:g}: ' + (', '.join(running) or 'idle'))
+            if len(index) == 0:
+                print('no segments in the window')
+                return
+            w = index.window(args.start, args.end, run[0]['cores'])
+            print(f'[{w["start"]}, {w["end"]}) on {run[0]["cores"]} CPU(s): busy {w["busy"]} '
+                  f'(overhead {w["overhead"]}), idle {w["idle"]}, util {w["utilization"]:.1f}%')
+            top = sorted(w['occupancy'].items(), key=lambda kv: -kv[1])
+            for pid, t in top[:args.top]:
+                print(f'  P{pid:<8} {t:>10}')
+            if len(top) > args.top:
+                print(f'  (+{len(top) - args.top} more)')
+        elif args.db_command == 'trace':
+            import trace_export as tx
+            run = db.runs(run_id=args.run)
+            if not run:
+                sys.exit(f'no run {args.run}')
+            # segments stream from the database cursor straight into the file
+            n = tx.write_chrome_trace(args.out, db.iter_timeline(args.run, args.start, args.end),
+                                      tick=args.tick, process=f'Run {args.run}: {run[0]["algo"]}')
+            print(f'run {args.run}: {n} events -> {args.out}')
+        elif args.db_command == 'run':
+            import scheduling_logic as sl
+            if args.policy not in sl.POLICY_REGISTRY:
+                sys.exit(f'unknown policy {args.policy!r}; choose from: {", ".join(sl.POLICY_REGISTRY)}')
+            wid = db.workload_id(args.workload)
+            if wid is None:
+                sys.exit(f'no workload {args.workload!r}')
+            tasks = db.load_tasks(wid)
+            config = {'quantum': args.quantum, 'mlfq': {}, 'cfs': {}, 'group': {}}
+            t0 = time.perf_counter()
+            tl = sl.run_policy(tasks, args.policy, config, args.switch_cost, args.cores)
+            metrics = sl.compute_metrics(tasks, tl, args.cores)
+            seconds = time.perf_counter() - t0
+            rid = db.save_run(wid, args.policy, tl, metrics, config, args.switch_cost, args.cores)
+            print(f'run {rid}: {args.policy} avg_wait={metrics["avg_wait"]:.2f} '
+                  f'p99_wait={metrics["p99_wait"]:.2f} cpu_util={metrics["cpu_util"]:.1f}')
+            if args.metrics_file:
+                import metrics_export as mx
+                exporter = mx.SchedulerMetrics()
+                exporter.record_run(args.policy, metrics, seconds, args.quantum,
+                                    st.fingerprint(tasks)[:12], args.cores)
+                exporter.write(args.metrics_file)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='main.py', description='Smart CPU Scheduler & Manager '
+                                     '(no command opens the GUI)')
+    sub = parser.add_subparsers(dest='command')
+
+    plan = sub.add_parser('plan', help='smallest core count / speed factor meeting an SLO')
+    plan.add_argument('workload', help='task CSV (Task Manager import format) or binary workload')
+    plan.add_argument('--slo', required=True,
+                      help="metric bounds from compute_metrics, e.g. 'p99_wait<=50,avg_tat<200'")
+    plan.add_argument('--policy', default='FCFS', help='registered policy name (default FCFS)')
+    plan.add_argument('--quantum', type=int, default=2)
+    plan.add_argument('--switch-cost', type=int, default=0)
+    plan.add_argument('--speed', type=float, default=1.0, help='relative CPU speed for the core search')
+    plan.add_argument('--max-cores', type=int, default=1024)
+    plan.add_argument('--max-speed', type=float, default=16.0)
+    plan.add_argument('--frontier', action='store_true',
+                      help='also find the minimum speed for smaller core counts')
+    plan.set_defaults(func=run_plan)
+
+    conv = sub.add_parser('convert', help='convert a task CSV to the binary workload format')
+    conv.add_argument('csv')
+    conv.add_argument('out', help='output file (conventionally *.oswl)')
+    conv.add_argument('--workers', type=int, help='parser processes (default: all CPUs)')
+    conv.set_defaults(func=run_convert)
+
+    swf = sub.add_parser('swf', help='import a Standard Workload Format trace (.swf / .swf.gz)')
+    swf.add_argument('trace')
+    swf.add_argument('out', help='binary workload to write')
+    swf.add_argument('--start', type=int, help='first submit time to keep (trace seconds)')
+    swf.add_argument('--end', type=int, help='stop at this submit time')
+    swf.add_argument('--status', help='comma-separated SWF status codes, e.g. 1 (completed)')
+    swf.add_argument('--users', help='comma-separated user ids')
+    swf.add_argument('--queues', help='comma-separated queue numbers')
+    swf.add_argument('--min-runtime', type=int, default=0)
+    swf.add_argument('--max-jobs', type=int)
+    swf.add_argument('--time-scale', type=float, default=1, help='trace seconds per tick')
+    swf.add_argument('--priority-field', default='queue', help='SWF field used as priority')
+    swf.add_argument('--group-field', choices=('user', 'group'), help='SWF field used as task group')
+    swf.set_defaults(func=run_swf)
+
+    rep = sub.add_parser('replay', help='metrics of a Linux sched_switch trace vs simulated policies')
+    rep.add_argument('trace', help='ftrace or perf script text with sched_switch / sched_wakeup events')
+    rep.add_argument('--tick', type=float, default=1e-6, help='seconds per tick (default 1us)')
+    rep.add_argument('--start', type=float, help='first trace timestamp to keep (seconds)')
+    rep.add_argument('--end', type=float, help='stop at this timestamp')
+    rep.add_argument('--comm', help='comma-separated thread names to keep')
+    rep.add_argument('--tids', help='comma-separated thread ids to keep')
+    rep.add_argument('--cores', type=int, help='CPU count (default: CPUs seen in the trace)')
+    rep.add_argument('--policy', action='append', help='policy to compare (repeatable; '
+                     'default FCFS, Round Robin, CFS)')
+    rep.add_argument('--quantum', type=float, default=4, help='round-robin slice in ms')
+    rep.add_argument('--switch-cost', type=int, default=0)
+    rep.add_argument('--out', help='also write the derived jobs as a binary workload')
+    rep.add_argument('--trace-out', help='also write the observed timeline as Chrome trace JSON (.json / .json.gz)')
+    rep.set_defaults(func=run_replay)
+
+    smp = sub.add_parser('sample', help='record CPU bursts of running processes from /proc (Linux)')
+    smp.add_argument('out', help='binary workload to write')
+    smp.add_argument('--duration', type=float, help='seconds to sample (default: until Ctrl-C)')
+    smp.add_argument('--interval', type=float, default=0.1, help='seconds between passes')
+    smp.add_argument('--tick', type=float, default=1e-3, help='seconds per tick (default 1ms)')
+    smp.add_argument('--threads', action='store_true', help='sample every thread, not just processes')
+    smp.add_argument('--kernel-threads', action='store_true')
+    smp.set_defaults(func=run_sample)
+
+    db = sub.add_parser('db', help='workload / results database')
+    db.add_argument('--db', help='database path (default ~/.smart_scheduler/scheduler.db)')
+    db_sub = db.add_subparsers(dest='db_command', required=True)
+    imp = db_sub.add_parser('import', help='load a task CSV or binary workload')
+    imp.add_argument('path')
+    imp.add_argument('--name')
+    db_sub.add_parser('list', help='stored workloads')
+    runs = db_sub.add_parser('runs', help='stored runs, newest first')
+    runs.add_argument('--workload', help='workload id or name')
+    runs.add_argument('--algo')
+    run = db_sub.add_parser('run', help='simulate a stored workload and record the run')
+    run.add_argument('workload', help='workload id or name')
+    run.add_argument('--policy', default='FCFS')
+    run.add_argument('--quantum', type=int, default=2)
+    run.add_argument('--switch-cost', type=int, default=0)
+    run.add_argument('--cores', type=int, default=1)
+    run.add_argument('--metrics-file', help='also write the run as OpenMetrics text (Prometheus textfile)')
+    win = db_sub.add_parser('window', help="a stored run's busy time and per-pid occupancy in a window")
+    win.add_argument('run', type=int, help='run id (see db runs)')
+    win.add_argument('--start', type=int)
+    win.add_argument('--end', type=int)
+    win.add_argument('--at', type=float, help='also show what was running at this time')
+    win.add_argument('--top', type=int, default=10, help='pids to list (most CPU first)')
+    trc = db_sub.add_parser('trace', help="export a stored run as Chrome trace JSON (chrome://tracing, Perfetto)")
+    trc.add_argument('run', type=int, help='run id (see db runs)')
+    trc.add_argument('out', help='output file (.json, or .json.gz to compress)')
+    trc.add_argument('--start', type=int)
+    trc.add_argument('--end', type=int)
+    trc.add_argument('--tick', type=float, default=1e-3, help='seconds per tick (default 1ms)')
+    db.set_defaults(func=run_db)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    getattr(args, 'func', run_gui)(args)
+
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,168 @@
+import math
+import os
+import re
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Tuple, Any
+
+import scheduling_logic as sl
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# engine run time histogram buckets (seconds)
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+_NAME_BAD = re.compile(r'[^a-zA-Z0-9_]')
+# suffixes OpenMetrics reserves for counter / histogram / info samples
+_RESERVED = re.compile(r'_(total|created|count|sum|bucket|info|gcount|gsum)$')
+
+
+def _metric_name(key: str) -> str:
+    name = _NAME_BAD.sub('_', key)
+    return name + '_value' if _RESERVED.search(name) else name
+
+
+def _label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs) -> str:
+    return '{' + ','.join(f'{k}="{_label(v)}"' for k, v in pairs) + '}'
+
+
+def _num(x) -> str:
+    if isinstance(x, float) and not math.isfinite(x):
+        return 'NaN' if math.isnan(x) else ('+Inf' if x > 0 else '-Inf')
+    return repr(x)
+
+
+# --------------------- OpenMetrics Exporter ---------------------
+
+class SchedulerMetrics:
+    """compute_metrics results, engine timings and deadlock-check counts as OpenMetrics text
+
+    Recording only updates a few dicts under a lock; render() copies them and
+    formats outside it, and the HTTP endpoint answers scrapes on its own
+    threads, so scraping never holds up a simulation. Results keep the latest
+    value per (algorithm, quantum, workload, cores) label set, at most
+    `max_series` of them (oldest dropped first).
+    """
+
+    def __init__(self, prefix: str = 'scheduler', max_series: int = 1000):
+        self.prefix = prefix
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._results: Dict[Tuple[str,str,str,int],Dict[str,float]] = {}
+        self._timings: Dict[str,List[float]] = {}         # algo -> bucket counts + [count, sum]
+        self._checks: Dict[Tuple[str,str],int] = {}
+        self._server = None
+        self._observing = False
+
+    # ----- recording -----
+
+    def record_run(self, algo: str, metrics: Dict[str,Any], seconds: float, quantum: int = None,
+                   workload: str = '', cores: int = 1):
+        """Latest scalar metrics of a run and its engine time"""
+        values = {_metric_name(k): float(v) for k, v in metrics.items()
+                  if isinstance(v, (int, float)) and not isinstance(v, bool)}
+        key = (algo, '' if quantum is None else str(quantum), workload, cores)
+        with self._lock:
+            self._results.pop(key, None)
+            self._results[key] = values
+            while len(self._results) > self.max_series:
+                self._results.pop(next(iter(self._results)))
+            h = self._timings.setdefault(algo, [0] * len(TIME_BUCKETS) + [0, 0.0])
+            for i, b in enumerate(TIME_BUCKETS):
+                if seconds <= b:
+                    h[i] += 1
+            h[-2] += 1
+            h[-1] += seconds
+
+    def count_check(self, check: str, outcome: str):
+        """One deadlock / Banker's check (see scheduling_logic.CHECK_OBSERVERS)"""
+        with self._lock:
+            self._checks[(check, outcome)] = self._checks.get((check, outcome), 0) + 1
+
+    def observe_checks(self):
+        """Count every check scheduling_logic runs in this process"""
+        if not self._observing:
+            sl.CHECK_OBSERVERS.append(self.count_check)
+            self._observing = True
+
+    # ----- exposition -----
+
+    def render(self) -> str:
+        """The OpenMetrics text exposition (ends with # EOF)"""
+        with self._lock:
+            results = list(self._results.items())
+            timings = {k: list(v) for k, v in self._timings.items()}
+            checks = dict(self._checks)
+
+        p = self.prefix
+        out = []
+        names = sorted({name for _, values in results for name in values})
+        for name in names:
+            out.append(f'# TYPE {p}_{name} gauge')
+            out.append(f'# HELP {p}_{name} compute_metrics {name} of the latest run')
+            for (algo, quantum, workload, cores), values in results:
+                if name in values:
+                    labels = _labels((('algorithm', algo), ('quantum', quantum),
+                                      ('workload', workload), ('cores', cores)))
+                    out.append(f'{p}_{name}{labels} {_num(values[name])}')
+
+        out.append(f'# TYPE {p}_engine_seconds histogram')
+        out.append(f'# UNIT {p}_engine_seconds seconds')
+        out.append(f'# HELP {p}_engine_seconds Wall time of scheduler runs per algorithm')
+        for algo, h in sorted(timings.items()):
+            for b, n in zip(TIME_BUCKETS, h):
+                out.append(f'{p}_engine_seconds_bucket{_labels((("algorithm", algo), ("le", b)))} {n}')
+            out.append(f'{p}_engine_seconds_bucket{_labels((("algorithm", algo), ("le", "+Inf")))} {h[-2]}')
+            out.append(f'{p}_engine_seconds_count{_labels((("algorithm", algo),))} {h[-2]}')
+            out.append(f'{p}_engine_seconds_sum{_labels((("algorithm", algo),))} {_num(h[-1])}')
+
+        out.append(f'# TYPE {p}_deadlock_checks counter')
+        out.append(f"# HELP {p}_deadlock_checks Deadlock detection and Banker's algorithm checks by outcome")
+        for (check, outcome), n in sorted(checks.items()):
+            out.append(f'{p}_deadlock_checks_total{_labels((("check", check), ("outcome", outcome)))} {n}')
+        out.append('# EOF')
+        return '\n'.join(out) + '\n'
+
+    def write(self, path: str):
+        """Write the exposition to a file atomically (e.g. for node_exporter's textfile collector)"""
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def serve(self, port: int = 9464, host: str = '127.0.0.1') -> Tuple[str,int]:
+        """Serve the exposition over HTTP on a background thread; returns the bound address"""
+        if self._server is not None:
+            return self._server.server_address[:2]
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = exporter.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[:2]
+
+    def shutdown(self):
+        """Stop the HTTP endpoint and stop counting checks"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._observing:
+            sl.CHECK_OBSERVERS.remove(self.count_check)
+            self._observing = False
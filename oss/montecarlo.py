@@ -0,0 +1,148 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from statistics import NormalDist
+from typing import List, Dict, Tuple, Any
+
+import numpy as np
+
+import scheduling_logic as sl
+
+# per-run metrics collected for every algorithm
+MC_METRICS = ('avg_wait', 'avg_tat', 'avg_response', 'p95_wait', 'p99_wait', 'p99_tat',
+              'cpu_util', 'effective_util', 'throughput', 'switches')
+
+# workload array columns
+_ARRIVAL, _BURST, _PRIORITY, _GROUP = range(4)
+
+
+# --------------------- Workload Generation ---------------------
+
+def random_workloads(runs: int, n: int, mean_gap: float = 2.0, mean_burst: float = 5.0,
+                     burst_dist: str = 'exponential', priorities: int = 5,
+                     seed: int = 0, out: np.ndarray = None) -> np.ndarray:
+    """(runs, n, 4) int64 workloads: Poisson arrivals, exponential or log-normal bursts"""
+    rng = np.random.default_rng(seed)
+    w = out if out is not None else np.empty((runs, n, 4), dtype=np.int64)
+    arrivals = np.floor(np.cumsum(rng.exponential(mean_gap, (runs, n)), axis=1))
+    w[:, :, _ARRIVAL] = arrivals - arrivals[:, :1]
+    if burst_dist == 'lognormal':
+        # sigma 1, scaled so the mean stays mean_burst
+        bursts = rng.lognormal(np.log(mean_burst) - 0.5, 1.0, (runs, n))
+    else:
+        bursts = rng.exponential(mean_burst, (runs, n))
+    w[:, :, _BURST] = np.maximum(1, np.rint(bursts))
+    w[:, :, _PRIORITY] = rng.integers(0, max(1, priorities), (runs, n))
+    w[:, :, _GROUP] = -1
+    return w
+
+
+def resampled_workloads(tasks: List[Dict[str,Any]], runs: int, seed: int = 0,
+                        out: np.ndarray = None) -> Tuple[np.ndarray, List[str]]:
+    """Bootstrap workloads: tasks and inter-arrival gaps drawn with replacement"""
+    rng = np.random.default_rng(seed)
+    ords = sorted(tasks, key=lambda t: (t['arrival'], t['pid']))
+    n = len(ords)
+    groups = sorted({t.get('group') or '' for t in ords} - {''})
+    gid = {g: i for i, g in enumerate(groups)}
+
+    base = np.array([(t['arrival'], t['burst'], t.get('priority', 0), gid.get(t.get('group') or '', -1))
+                     for t in ords], dtype=np.int64).reshape(n, 4)
+    gaps = np.diff(base[:, _ARRIVAL], prepend=base[0, _ARRIVAL])
+
+    w = out if out is not None else np.empty((runs, n, 4), dtype=np.int64)
+    w[:] = base[rng.integers(0, n, (runs, n))]
+    picked = gaps[rng.integers(0, n, (runs, n))]
+    picked[:, 0] = 0
+    w[:, :, _ARRIVAL] = base[0, _ARRIVAL] + np.cumsum(picked, axis=1)
+    return w, groups
+
+
+def workload_tasks(w: np.ndarray, groups: List[str] = ()) -> List[Dict[str,Any]]:
+    """Task dicts for one (n, 4) workload"""
+    return [{
+        'pid': i + 1, 'name': f'T{i + 1}', 'arrival': int(a), 'burst': int(b),
+        'priority': int(p), 'group': groups[g] if 0 <= g < len(groups) else None
+    } for i, (a, b, p, g) in enumerate(w.tolist())]
+
+
+# --------------------- Parallel Evaluation ---------------------
+
+def _evaluate(w: np.ndarray, algos, config, switch_cost, groups) -> np.ndarray:
+    """(runs, algos, metrics) results for a block of workloads"""
+    out = np.zeros((len(w), len(algos), len(MC_METRICS)))
+    for r in range(len(w)):
+        tasks = workload_tasks(w[r], groups)
+        for a, name in enumerate(algos):
+            snap = [dict(t) for t in tasks]
+            m = sl.compute_metrics(snap, sl.run_policy(snap, name, config, switch_cost))
+            out[r, a] = [m.get(k, 0) for k in MC_METRICS]
+    return out
+
+
+def _shm_worker(job):
+    """Attach to the shared workload block and evaluate rows lo:hi"""
+    shm_name, shape, lo, hi, algos, config, switch_cost, groups = job
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        # copy the rows out: the mapping can't be closed while views exist
+        rows = np.ndarray(shape, dtype=np.int64, buffer=shm.buf)[lo:hi].copy()
+    finally:
+        shm.close()
+    return lo, _evaluate(rows, algos, config, switch_cost, groups)
+
+
+def summarize(samples: np.ndarray, confidence: float = 0.95) -> Dict[str,float]:
+    """Mean, std and normal-approximation confidence interval of one metric"""
+    n = len(samples)
+    mean = float(samples.mean()) if n else 0.0
+    std = float(samples.std(ddof=1)) if n > 1 else 0.0
+    half = float(NormalDist().inv_cdf(0.5 + confidence / 2) * std / np.sqrt(n)) if n > 1 else 0.0
+    return {'mean': mean, 'std': std, 'ci_low': mean - half, 'ci_high': mean + half}
+
+
+def monte_carlo(runs: int = 200, tasks: List[Dict[str,Any]] = None, algos: List[str] = None,
+                config: Dict[str,Any] = None, switch_cost: int = 0, workers: int = None,
+                confidence: float = 0.95, seed: int = 0, **dist) -> Dict[str,Dict[str,Dict[str,float]]]:
+    """Run every algorithm over `runs` workloads and report mean / CI per metric
+
+    With `tasks` the workloads resample that task set, otherwise they are drawn from
+    random_workloads(**dist). Workloads live in one shared-memory block that the pool
+    workers map, so only row ranges cross process boundaries.
+    """
+    algos = list(algos or sl.POLICY_REGISTRY)
+    config = {k: v for k, v in (config or {}).items() if k != 'estimates'}
+    n = len(tasks) if tasks else int(dist.pop('n', 50))
+    shape = (runs, n, 4)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+    w = None
+    try:
+        w = np.ndarray(shape, dtype=np.int64, buffer=shm.buf)
+        if tasks:
+            _, groups = resampled_workloads(tasks, runs, seed, out=w)
+        else:
+            random_workloads(runs, n, seed=seed, out=w, **dist)
+            groups = []
+
+        workers = max(1, min(workers or os.cpu_count() or 1, runs))
+        results = np.zeros((runs, len(algos), len(MC_METRICS)))
+        if workers == 1:
+            results[:] = _evaluate(w, algos, config, switch_cost, groups)
+        else:
+            # a few blocks per worker keeps the pool busy when run times vary
+            bounds = np.linspace(0, runs, min(runs, workers * 4) + 1).astype(int)
+            jobs = [(shm.name, shape, lo, hi, algos, config, switch_cost, groups)
+                    for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for lo, block in pool.map(_shm_worker, jobs):
+                    results[lo:lo + len(block)] = block
+    finally:
+        w = None
+        shm.close()
+        shm.unlink()
+
+    return {
+        name: {k: summarize(results[:, a, m], confidence) for m, k in enumerate(MC_METRICS)}
+        for a, name in enumerate(algos)
+    }
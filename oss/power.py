@@ -0,0 +1,292 @@
+from typing import List, Dict, Tuple, Any
+
+import numpy as np
+
+import scheduling_logic as sl
+import capacity
+import timeline as tli
+
+# --------------------- Power Model ---------------------
+
+# per core type: relative IPC, P-states as (GHz, active W) from lowest to highest and
+# C-states as (name, target residency in ticks, idle W, wake-up energy in W*ticks),
+# shallowest first; the first C-state must have residency 0
+CORE_TYPES = {
+    'big': {
+        'ipc': 1.0,
+        'pstates': [(0.6, 0.35), (1.2, 0.80), (1.8, 1.60), (2.4, 3.00)],
+        'cstates': [('WFI', 0, 0.12, 0.0), ('retention', 5, 0.05, 0.2), ('power-down', 50, 0.005, 2.0)],
+    },
+    'little': {
+        'ipc': 0.5,
+        'pstates': [(0.5, 0.06), (1.0, 0.15), (1.4, 0.27), (1.8, 0.45)],
+        'cstates': [('WFI', 0, 0.03, 0.0), ('retention', 5, 0.012, 0.05), ('power-down', 50, 0.001, 0.5)],
+    },
+}
+
+PRESETS = {
+    'Single big core': ['big'],
+    'Quad big': ['big'] * 4,
+    'big.LITTLE 2+4': ['big'] * 2 + ['little'] * 4,
+    'big.LITTLE 4+4': ['big'] * 4 + ['little'] * 4,
+}
+
+# label -> mode
+ENERGY_MODES = {'Race to idle': 'race', 'Slow and steady': 'steady', 'Min energy': 'min'}
+
+
+class PowerModel:
+    """Per-CPU P-states, C-states and speed factors of a (possibly heterogeneous) machine
+
+    A core's speed at a P-state is ipc * GHz relative to the fastest core type
+    at its highest P-state, so bursts stay in ticks of work on that core.
+    """
+
+    def __init__(self, cores: List[Any], core_types: Dict[str,Dict[str,Any]] = None):
+        types = core_types or CORE_TYPES
+        self.cores = []
+        for c in cores:
+            if isinstance(c, str):
+                if c not in types:
+                    raise ValueError(f'unknown core type {c!r}')
+                c = dict(types[c], name=c)
+            if not c['pstates'] or not c['cstates'] or c['cstates'][0][1] != 0:
+                raise ValueError(f'core type {c.get("name")!r} needs P-states and a residency-0 C-state')
+            self.cores.append(c)
+        if not self.cores:
+            raise ValueError('a power model needs at least one core')
+        self.ref = max(c['ipc'] * c['pstates'][-1][0] for c in self.cores)
+
+    @classmethod
+    def preset(cls, name: str) -> 'PowerModel':
+        return cls(PRESETS[name])
+
+    def __len__(self):
+        return len(self.cores)
+
+    @property
+    def names(self) -> List[str]:
+        return [c.get('name', f'cpu{i}') for i, c in enumerate(self.cores)]
+
+    def top(self) -> List[int]:
+        """Highest P-state of every core"""
+        return [len(c['pstates']) - 1 for c in self.cores]
+
+    def fractions(self) -> List[float]:
+        """Distinct frequency levels (fraction of each core's maximum), lowest first"""
+        return sorted({round(f / c['pstates'][-1][0], 6) for c in self.cores for f, _ in c['pstates']})
+
+    def pstates_at(self, fraction: float) -> List[int]:
+        """Per core, the lowest P-state running at least `fraction` of its maximum frequency"""
+        out = []
+        for c in self.cores:
+            fmax = c['pstates'][-1][0]
+            out.append(next(i for i, (f, _) in enumerate(c['pstates'])
+                            if f >= fraction * fmax * (1 - 1e-5) or i == len(c['pstates']) - 1))
+        return out
+
+    def speeds(self, pstates: List[int] = None) -> List[float]:
+        pstates = self.top() if pstates is None else pstates
+        return [c['ipc'] * c['pstates'][p][0] / self.ref for c, p in zip(self.cores, pstates)]
+
+    def active_power(self, pstates: List[int] = None) -> np.ndarray:
+        pstates = self.top() if pstates is None else pstates
+        return np.array([c['pstates'][p][1] for c, p in zip(self.cores, pstates)], dtype=np.float64)
+
+    # ----- energy accounting -----
+
+    def energy(self, cpu_timelines: List[List[Tuple[int,int,int]]], pstates: List[int] = None,
+               lo: int = None, hi: int = None) -> Dict[str,Any]:
+        """Energy of per-CPU timelines (timeline i runs on core i) over [lo, hi)"""
+        if len(cpu_timelines) > len(self.cores):
+            raise ValueError(f'{len(cpu_timelines)} CPUs used, the model has {len(self.cores)}')
+        segs = [np.asarray(tl, dtype=np.int64).reshape(-1, 3) for tl in cpu_timelines]
+        core = np.concatenate([np.full(len(s), i, dtype=np.int64) for i, s in enumerate(segs)]
+                              or [np.zeros(0, dtype=np.int64)])
+        seg = np.concatenate(segs or [np.zeros((0, 3), dtype=np.int64)])
+        return self._account(core, seg[:, 1], seg[:, 2], pstates, lo, hi)
+
+    def _account(self, core, starts, ends, pstates, lo, hi):
+        # one vectorized pass: per-segment active energy, per-gap C-state energy
+        n = len(self.cores)
+        lo = int(starts.min()) if lo is None and len(starts) else (lo or 0)
+        hi = int(ends.max()) if hi is None and len(ends) else (hi if hi is not None else lo)
+        hi = max(hi, lo)
+        s = np.clip(starts, lo, hi)
+        e = np.clip(ends, lo, hi)
+        keep = e > s
+        core, s, e = core[keep], s[keep], e[keep]
+        order = np.lexsort((s, core))
+        core, s, e = core[order], s[order], e[order]
+
+        busy = np.bincount(core, weights=e - s, minlength=n)
+        active = busy * self.active_power(pstates)
+
+        # idle gaps: before each segment (since the last one on its CPU, or lo) and after the last
+        first = np.ones(len(core), dtype=bool)
+        first[1:] = core[1:] != core[:-1]
+        prev = np.empty_like(s)
+        prev[1:] = e[:-1]
+        prev[first] = lo
+        last = np.ones(len(core), dtype=bool)
+        last[:-1] = first[1:]
+        tail = np.full(n, hi - lo, dtype=np.int64)
+        tail[core[last]] = hi - e[last]
+        gap = np.concatenate([s - prev, tail])
+        gcore = np.concatenate([core, np.arange(n)])
+        wakes = np.concatenate([np.ones(len(s), dtype=bool), np.zeros(n, dtype=bool)])
+        keep = gap > 0
+        gap, gcore, wakes = gap[keep], gcore[keep], wakes[keep]
+
+        # the deepest C-state whose target residency fits the gap
+        idle = np.zeros(n)
+        wake = np.zeros(n)
+        residency: Dict[str,float] = {}
+        tables = {}
+        for i, c in enumerate(self.cores):
+            tables.setdefault(id(c['cstates']), (c['cstates'], []))[1].append(i)
+        for cstates, members in tables.values():
+            m = np.isin(gcore, members)
+            g, gc = gap[m], gcore[m]
+            k = np.searchsorted(np.array([r for _, r, _, _ in cstates]), g, side='right') - 1
+            watts = np.array([w for _, _, w, _ in cstates])
+            joules = np.array([j for _, _, _, j in cstates])
+            idle += np.bincount(gc, weights=g * watts[k], minlength=n)
+            wake += np.bincount(gc, weights=joules[k] * wakes[m], minlength=n)
+            for j, (name, _, _, _) in enumerate(cstates):
+                residency[name] = residency.get(name, 0) + int(g[k == j].sum())
+
+        idle_total = idle + wake
+        by_type: Dict[str,Dict[str,float]] = {}
+        for name, a, i in zip(self.names, active, idle_total):
+            d = by_type.setdefault(name, {'active': 0.0, 'idle': 0.0})
+            d['active'] += float(a)
+            d['idle'] += float(i)
+        total = float(active.sum() + idle_total.sum())
+        return {
+            'start': lo,
+            'end': hi,
+            'busy': int(busy.sum()),
+            'active': float(active.sum()),
+            'idle': float(idle.sum()),
+            'wake': float(wake.sum()),
+            'total': total,
+            'efficiency': 100 * float(active.sum()) / total if total > 0 else 0.0,
+            'per_core': [{'type': n_, 'busy': int(b), 'active': float(a), 'idle': float(i)}
+                         for n_, b, a, i in zip(self.names, busy, active, idle_total)],
+            'by_type': by_type,
+            'cstates': residency,
+        }
+
+
+def timeline_energy(timeline: List[Tuple[int,int,int]], model: PowerModel,
+                    pstates: List[int] = None, lo: int = None, hi: int = None,
+                    index=None) -> Dict[str,Any]:
+    """Energy of a merged timeline, its overlapping segments packed onto the model's cores in order"""
+    index = index or tli.TimelineIndex(timeline)
+    lanes = index.lanes
+    if len(lanes) > len(model):
+        raise ValueError(f'{len(lanes)} CPUs used, the model has {len(model)}')
+    core = np.concatenate([np.full(len(st), i, dtype=np.int64) for i, (st, _, _) in enumerate(lanes)]
+                          or [np.zeros(0, dtype=np.int64)])
+    starts = np.concatenate([np.asarray(st, dtype=np.int64) for st, _, _ in lanes] or [core])
+    ends = np.concatenate([np.asarray(en, dtype=np.int64) for _, en, _ in lanes] or [core])
+    return model._account(core, starts, ends, pstates, lo, hi)
+
+
+# --------------------- Energy-Aware Scheduling ---------------------
+
+class EnergyPlanner:
+    """Runs one workload and policy on a PowerModel at chosen P-states
+
+    'race' runs every core at its highest P-state, fastest cores first, and
+    lets them drop into C-states once the work is done. 'steady' picks the
+    lowest frequency level whose capacity still covers the work within the
+    race-to-idle span (and meets the SLO), filling the most energy-efficient
+    cores first. 'min' simulates every level and keeps the cheapest one that
+    meets the SLO. Energies are compared over a common horizon, so a run that
+    finishes early pays for idling until the slowest one is done.
+    """
+
+    def __init__(self, tasks: List[Dict[str,Any]], policy: str, model: PowerModel,
+                 config: Dict[str,Any] = None, switch_cost: int = 0,
+                 slo: List[Tuple[str,str,float]] = ()):
+        self.tasks = tasks
+        self.policy = policy
+        self.model = model
+        self.config = config or {}
+        self.switch_cost = switch_cost
+        self.slo = list(slo)
+        self.results: Dict[Tuple[Tuple[int,...],str],Dict[str,Any]] = {}
+
+    def _order(self, pstates, placement):
+        # CPU ids are handed out lowest first, so this is the dispatch preference
+        speeds = self.model.speeds(pstates)
+        power = self.model.active_power(pstates)
+        if placement == 'fast':
+            return sorted(range(len(speeds)), key=lambda i: -speeds[i])
+        return sorted(range(len(speeds)), key=lambda i: power[i] / speeds[i])
+
+    def run(self, fraction: float, placement: str = 'fast') -> Dict[str,Any]:
+        """Simulate at frequency level `fraction` (cached)"""
+        pstates = self.model.pstates_at(fraction)
+        key = (tuple(pstates), placement)
+        if key not in self.results:
+            order = self._order(pstates, placement)
+            speeds = self.model.speeds(pstates)
+            tasks = [dict(t) for t in self.tasks]
+            lanes = []
+            tl = sl.run_policy(tasks, self.policy, self.config, self.switch_cost,
+                               speeds=[speeds[i] for i in order], cpu_timelines=lanes)
+            by_core = [[] for _ in self.model.cores]
+            for i, lane in zip(order, lanes):
+                by_core[i] = lane
+            metrics = sl.compute_metrics(tasks, tl, len(self.model))
+            self.results[key] = {
+                'fraction': round(fraction, 6),
+                'placement': placement,
+                'pstates': pstates,
+                'timeline': tl,
+                'cpu_timelines': by_core,
+                'metrics': metrics,
+                'meets': capacity.meets_slo(metrics, self.slo),
+                'end': max((e for _, _, e in tl), default=0),
+            }
+        return self.results[key]
+
+    def plan(self, mode: str = 'race') -> Dict[str,Any]:
+        """Chosen run plus every run it was compared with, energies over a common horizon"""
+        mode = ENERGY_MODES.get(mode, mode)
+        if mode not in ENERGY_MODES.values():
+            raise ValueError(f'unknown energy mode {mode!r}')
+        race = self.run(1.0, 'fast')
+        runs = [race]
+        chosen = race
+        fractions = self.model.fractions()
+        lo = min((t['arrival'] for t in self.tasks), default=0)
+
+        if mode == 'steady':
+            demand = sum(t['burst'] for t in self.tasks)
+            span = max(1, race['end'] - lo)
+            for f in fractions:
+                if sum(self.model.speeds(self.model.pstates_at(f))) * span < demand:
+                    continue
+                r = self.run(f, 'efficient')
+                if r['meets']:
+                    chosen = r
+                    break
+            if chosen is not race:
+                runs.append(chosen)
+        elif mode == 'min':
+            for f in fractions:
+                r = self.run(f, 'efficient')
+                if all(r is not x for x in runs):
+                    runs.append(r)
+
+        hi = max(r['end'] for r in runs)
+        for r in runs:
+            r['energy'] = self.model.energy(r['cpu_timelines'], r['pstates'], lo, hi)
+        if mode == 'min':
+            ok = [r for r in runs if r['meets']] or [race]
+            chosen = min(ok, key=lambda r: r['energy']['total'])
+        return {'mode': mode, 'chosen': chosen, 'runs': runs, 'start': lo, 'end': hi}
@@ -0,0 +1,354 @@
+import errno
+import math
+import os
+import threading
+import time
+from typing import List, Dict, Tuple, Any, Optional
+
+import workload_io as wio
+
+try:
+    import resource
+except ImportError:     # not on Windows; /proc isn't either
+    resource = None
+
+PROC = '/proc'
+CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+# /proc/[pid]/stat fields after the ')' closing the command name (field 3 is index 0)
+_STAT_PPID, _STAT_NICE, _STAT_STARTTIME = 1, 16, 19
+
+
+def proc_available(proc: str = PROC) -> bool:
+    return os.path.exists(os.path.join(proc, 'self', 'schedstat'))
+
+
+def _raise_fd_limit() -> Optional[Tuple[int,int]]:
+    """Let the soft open-file limit reach the hard one; returns the previous limits if raised"""
+    if resource is None:
+        return None
+    try:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        want = max(soft, 65536) if hard == resource.RLIM_INFINITY else hard
+        if want > soft:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (want, hard))
+            return soft, hard
+    except (ValueError, OSError):
+        pass
+    return None
+
+
+def _restore_fd_limit(limits: Tuple[int,int]):
+    try:
+        resource.setrlimit(resource.RLIMIT_NOFILE, limits)
+    except (ValueError, OSError):
+        pass
+
+
+def read_stat(path: str) -> Optional[Tuple[str,int,int,int]]:
+    """(comm, ppid, nice, start time in clock ticks since boot) from a /proc stat file"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    # the command name may contain spaces and parentheses
+    lo, hi = data.find(b'('), data.rfind(b')')
+    fields = data[hi + 2:].split()
+    try:
+        return (data[lo + 1:hi].decode('utf-8', 'replace'), int(fields[_STAT_PPID]),
+                int(fields[_STAT_NICE]), int(fields[_STAT_STARTTIME]))
+    except (IndexError, ValueError):
+        return None
+
+
+class _Entry:
+    """Sampling state of one process (or thread)"""
+
+    __slots__ = ('path', 'fd', 'name', 'comm', 'nice', 'cpu', 'delay', 'seen', 'burst_start',
+                 'burst_cpu', 'idle')
+
+    def __init__(self, path, cpu, delay, seen):
+        self.path = path
+        self.fd = None
+        self.name = None            # from /proc/[pid]/stat, read on the first burst
+        self.comm = None
+        self.nice = 0
+        self.cpu = cpu              # schedstat CPU time (ns) at the last read
+        self.delay = delay          # schedstat run-queue wait (ns) at the last read
+        self.seen = seen            # tick of the last read
+        self.burst_start = None     # tick the current burst began, None when idle
+        self.burst_cpu = 0
+        self.idle = 0               # consecutive reads without progress
+
+
+class ProcSampler:
+    """Live /proc sampler turning observed CPU bursts into tasks
+
+    Each pass reads /proc/[pid]/schedstat (CPU time and run-queue wait, in ns)
+    through a file descriptor kept open per process. The process list is only
+    rescanned when /proc/loadavg shows a pid was allocated since the last pass
+    (so short-lived processes are caught on the next pass) and at least every
+    `rescan` seconds to drop exited ones, and /proc/[pid]/stat (name, nice
+    value, start time) is only read for processes born while sampling or once
+    a process shows a burst. A burst runs from the first read that sees CPU
+    progress to the first that sees none; its length is the CPU time consumed,
+    and its arrival is backdated from that read by the CPU and wait time it
+    accumulated (never before the previous read). Processes that keep sleeping
+    are read only every `idle_backoff` passes, so thousands of mostly-idle
+    processes stay cheap. Times are ticks of `tick` seconds from the start of
+    sampling. If descriptors run out, the soft open-file limit is raised to the
+    hard one until stop().
+    """
+
+    def __init__(self, interval: float = 0.1, tick: float = 1e-3, rescan: float = 2.0,
+                 threads: bool = False, kernel_threads: bool = False, idle_backoff: int = 32,
+                 min_burst: int = 1, max_bursts: int = 100_000, proc: str = PROC):
+        self.interval = interval
+        self.tick = tick
+        self.rescan = rescan
+        self.threads = threads
+        self.kernel_threads = kernel_threads
+        self.idle_backoff = max(1, idle_backoff)
+        self.min_burst = min_burst
+        self.max_bursts = max_bursts
+        self.proc = proc
+        self.entries: Dict[str,_Entry] = {}
+        self._due: Dict[int,List[_Entry]] = {}                # pass number -> entries to read
+        self.bursts: List[Tuple[str,int,int,int,str]] = []   # (name, arrival, burst, nice, comm)
+        self.passes = 0
+        self.cpu_time = 0.0         # seconds spent sampling (this thread)
+        self._t0 = None
+        self._last_scan = None
+        self._last_pid = None
+        self._loadavg = None        # fd of /proc/loadavg
+        self._fd_raised = False
+        self._saved_limit = None    # open-file limit before we raised it
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    # ----- clock -----
+
+    def _now(self) -> float:
+        # CLOCK_BOOTTIME is the clock process start times are measured on
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+
+    def _ticks(self, t: float) -> int:
+        return int((t - self._t0) / self.tick)
+
+    # ----- discovery -----
+
+    def _paths(self):
+        me = str(os.getpid())
+        for name in os.listdir(self.proc):
+            if not name.isdigit() or name == me:
+                continue
+            path = f'{self.proc}/{name}'
+            if self.threads:
+                try:
+                    for tid in os.listdir(path + '/task'):
+                        yield f'{path}/task/{tid}'
+                except OSError:
+                    continue
+            else:
+                yield path
+
+    def _newest_pid(self) -> Optional[int]:
+        """Last pid allocated in our pid namespace (the last field of /proc/loadavg)"""
+        try:
+            if self._loadavg is None:
+                self._loadavg = os.open(self.proc + '/loadavg', os.O_RDONLY)
+            return int(os.pread(self._loadavg, 128, 0).split()[-1])
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def _open(self, path: str) -> Optional[int]:
+        try:
+            return os.open(path, os.O_RDONLY)
+        except OSError as err:
+            if err.errno != errno.EMFILE or self._fd_raised:
+                return None
+        self._fd_raised = True
+        self._saved_limit = _raise_fd_limit()
+        try:
+            return os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+
+    def _describe(self, e: _Entry, stat=None) -> bool:
+        """Fill in name / comm / nice; False for processes that aren't sampled"""
+        st = stat or read_stat(e.path + '/stat')
+        if st is None:
+            return False
+        comm, ppid, nice, _ = st
+        pid = os.path.basename(e.path)
+        # kthreadd (pid 2) and its children
+        if not self.kernel_threads and (pid == '2' or ppid == 2):
+            return False
+        e.name, e.comm, e.nice = f'{comm}-{pid}', comm, nice
+        return True
+
+    def _scan(self, now: float):
+        tnow = self._ticks(now)
+        alive = set(self._paths())
+        for path in alive.difference(self.entries):
+            e = _Entry(path, 0, 0, tnow)
+            # None when out of descriptors: reopened on every read instead
+            e.fd = self._open(path + '/schedstat')
+            self.entries[path] = e
+            self._due.setdefault(self.passes, []).append(e)
+            if self._last_scan is not None:
+                st = read_stat(path + '/stat')
+                if st is not None and st[3] / CLK_TCK > self._t0:
+                    # born while sampling: all its CPU time is new, from its start
+                    if self._describe(e, st):
+                        e.seen = e.burst_start = max(0, self._ticks(st[3] / CLK_TCK))
+                    else:
+                        self._drop(e)
+                    continue
+            # running before sampling started: only CPU time from here on counts
+            cur = self._read(e)
+            if cur is None:
+                self._drop(e)
+            else:
+                e.cpu, e.delay = cur
+        for path in [p for p in self.entries if p not in alive]:
+            self._drop(self.entries[path])
+        self._last_scan = now
+
+    # ----- sampling -----
+
+    def _read(self, e: _Entry) -> Optional[Tuple[int,int]]:
+        try:
+            if e.fd is not None:
+                data = os.pread(e.fd, 128, 0)
+            else:
+                with open(e.path + '/schedstat', 'rb') as f:
+                    data = f.read()
+            cpu, delay, _ = data.split(None, 2)
+            return int(cpu), int(delay)
+        except (OSError, ValueError):
+            return None
+
+    def _end_burst(self, e: _Entry):
+        if e.burst_start is not None:
+            burst = math.ceil(e.burst_cpu / (self.tick * 1e9))
+            if (burst >= self.min_burst and len(self.bursts) < self.max_bursts
+                    and (e.name is not None or self._describe(e))):
+                self.bursts.append((e.name, e.burst_start, burst, e.nice, e.comm))
+            e.burst_start = None
+            e.burst_cpu = 0
+
+    def _drop(self, e: _Entry):
+        self._end_burst(e)
+        if e.fd is not None:
+            try:
+                os.close(e.fd)
+            except OSError:
+                pass
+        self.entries.pop(e.path, None)
+
+    def sample(self):
+        """One pass over every known process (rescanning /proc when a pid was allocated or due)"""
+        c0 = time.thread_time()
+        now = self._now()
+        with self._lock:
+            if self._t0 is None:
+                self._t0 = now
+            # read before listing /proc, so a fork in between triggers the next scan
+            newest = self._newest_pid()
+            if (self._last_scan is None or now - self._last_scan >= self.rescan
+                    or newest is None or newest != self._last_pid):
+                self._last_pid = newest
+                self._scan(now)
+            tnow = self._ticks(now)
+            tick_ns = self.tick * 1e9
+            gone = []
+            for e in self._due.pop(self.passes, ()):
+                if self.entries.get(e.path) is not e:
+                    continue
+                cur = self._read(e)
+                if cur is None:
+                    gone.append(e)
+                    continue
+                cpu, delay = cur
+                if cpu > e.cpu:
+                    if e.burst_start is None:
+                        # woke at least as long ago as it has since run and waited
+                        back = math.ceil((cpu - e.cpu + delay - e.delay) / tick_ns)
+                        e.burst_start = max(e.seen, tnow - back)
+                    e.burst_cpu += cpu - e.cpu
+                    e.idle = 0
+                else:
+                    self._end_burst(e)
+                    e.idle += 1
+                e.cpu, e.delay = cpu, delay
+                e.seen = tnow
+                # processes that keep sleeping are read half as often each time
+                nxt = self.passes + min(1 << min(e.idle, 16), self.idle_backoff)
+                self._due.setdefault(nxt, []).append(e)
+            for e in gone:
+                self._drop(e)
+            self.passes += 1
+        self.cpu_time += time.thread_time() - c0
+
+    def run(self, duration: float = None):
+        """Sample every `interval` seconds until stop() (or for `duration` seconds)"""
+        self._stop.clear()
+        deadline = None if duration is None else time.monotonic() + duration
+        nxt = time.monotonic()
+        while not self._stop.is_set():
+            self.sample()
+            nxt += self.interval
+            if deadline is not None and nxt > deadline:
+                break
+            # fixed rate; a late pass doesn't queue up extra ones
+            nxt = max(nxt, time.monotonic())
+            self._stop.wait(nxt - time.monotonic())
+
+    def start(self):
+        """Sample on a background thread"""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> List[Dict[str,Any]]:
+        """Stop sampling, close every descriptor, restore the open-file limit and return the tasks"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            for e in list(self.entries.values()):
+                self._drop(e)
+            self._due.clear()
+            if self._loadavg is not None:
+                os.close(self._loadavg)
+                self._loadavg = None
+            if self._saved_limit is not None:
+                _restore_fd_limit(self._saved_limit)
+            self._fd_raised = False
+            self._saved_limit = None
+        return self.tasks()
+
+    # ----- results -----
+
+    def overhead(self) -> float:
+        """Sampling CPU time as a percentage of one CPU over the elapsed time"""
+        if self._t0 is None:
+            return 0.0
+        return 100 * self.cpu_time / max(1e-9, self._now() - self._t0)
+
+    def tasks(self, first_pid: int = 1) -> List[Dict[str,Any]]:
+        """Observed bursts so far as task dicts in arrival order (nice -> priority, name -> group)"""
+        with self._lock:
+            bursts = sorted(self.bursts, key=lambda b: b[1])
+        return [wio.make_task(first_pid + i, name, arrival, burst, nice, group=comm)
+                for i, (name, arrival, burst, nice, comm) in enumerate(bursts)]
+
+
+def sample_tasks(duration: float, interval: float = 0.1, **options) -> List[Dict[str,Any]]:
+    """Sample /proc for `duration` seconds in the calling thread and return the tasks"""
+    sampler = ProcSampler(interval, **options)
+    sampler.run(duration)
+    return sampler.stop()
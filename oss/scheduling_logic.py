@@ -1,17 +1,26 @@
 import math
-from typing import List, Dict, Tuple, Any
+import functools
+import heapq
+import random
+import itertools
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from typing import List, Dict, Tuple, Any, Optional, Callable
 
 # --------------------- Timeline Helpers ---------------------
 
 def merge_segments(timeline: List[Tuple[int,int,int]]) -> List[Tuple[int,int,int]]:
-    """Merge consecutive same-PID segments"""
+    """Merge consecutive same-PID segments (each switch overhead stays separate)"""
     if not timeline:
         return []
     merged = []
     cur_pid, s, e = timeline[0]
 
     for pid, ss, ee in timeline[1:]:
-        if pid == cur_pid and ss == e:
+        if pid == cur_pid and ss == e and pid != CTX_SWITCH_PID:
             e = ee
         else:
             merged.append((cur_pid, s, e))
@@ -21,314 +30,1665 @@ def merge_segments(timeline: List[Tuple[int,int,int]]) -> List[Tuple[int,int,int
     return merged
 
 
-# --------------------- FCFS ---------------------
+# context-switch overhead segments carry this pseudo-PID
+CTX_SWITCH_PID = -1
 
-def sched_fcfs(tasks: List[Dict[str,Any]]) -> List[Tuple[int,int,int]]:
-    """First-Come First-Serve"""
-    ords = sorted(tasks, key=lambda t: (t['arrival'], t['pid']))
-    timeline = []
-    tcur = 0
 
-    for t in ords:
-        start = max(tcur, t['arrival'])
-        end = start + t['burst']
-        timeline.append((t['pid'], start, end))
-        tcur = end
+def _switch(timeline, last, pid, tcur, cost):
+    """Charge a context switch when the CPU changes hands; returns the new time"""
+    if cost and last is not None and last != pid:
+        timeline.append((CTX_SWITCH_PID, tcur, tcur + cost))
+        return tcur + cost
+    return tcur
 
-    return timeline
 
+def context_switches(timeline: List[Tuple[int,int,int]], cores: int = 1) -> Tuple[int,int]:
+    """(switch count, overhead time) of a time-ordered timeline
 
-# --------------------- SJF ---------------------
+    With several CPUs the segments interleave, so only charged switches
+    (overhead segments) are counted.
+    """
+    switches = overhead = 0
+    last = None
+    for pid, s, e in timeline:
+        if pid == CTX_SWITCH_PID:
+            # a switch can be wasted when an arrival preempts right after it
+            switches += 1
+            overhead += e - s
+        elif cores == 1 and last not in (None, CTX_SWITCH_PID, pid):
+            switches += 1
+        last = pid
+    return switches, overhead
+
+
+class StateSeries:
+    """Ready-queue length and busy-CPU count over a run, run-length encoded
+
+    Engines call record() at their events; an entry is kept only when the state
+    changes, and a later record at the same instant replaces the earlier one.
+    Entry i holds from times[i] until times[i + 1] (the last until `end`).
+    """
+
+    def __init__(self):
+        self.times: List[int] = []
+        self.ready: List[int] = []
+        self.busy: List[int] = []
+        self.end = 0
+
+    def record(self, t: int, ready: int, busy: int):
+        if self.times and self.times[-1] == t:
+            self.times.pop()
+            self.ready.pop()
+            self.busy.pop()
+        if self.times and self.ready[-1] == ready and self.busy[-1] == busy:
+            return
+        self.times.append(t)
+        self.ready.append(ready)
+        self.busy.append(busy)
+
+    def __len__(self):
+        return len(self.times)
+
+    def _integral(self, values, x):
+        # prefix sums of value * duration, evaluated at x (scalar or array)
+        t = np.asarray(self.times, dtype=np.float64)
+        v = np.asarray(values, dtype=np.float64)
+        cum = np.concatenate([[0.0], np.cumsum(v[:-1] * np.diff(t))])
+        x = np.clip(x, t[0], max(self.end, t[-1]))
+        j = np.searchsorted(t, x, side='right') - 1
+        return cum[j] + v[j] * (x - t[j])
+
+    def windows(self, width: float, cores: int = 1, lo: float = None,
+                hi: float = None) -> Dict[str,np.ndarray]:
+        """Per-window utilization (%), mean and peak ready-queue length over [lo, hi)"""
+        if not self.times:
+            return {k: np.empty(0) for k in ('start', 'util', 'mean_ready', 'max_ready')}
+        lo = self.times[0] if lo is None else lo
+        hi = max(self.end, self.times[-1]) if hi is None else hi
+        edges = np.append(np.arange(lo, hi, width, dtype=np.float64), hi)
+        if len(edges) < 2:
+            edges = np.array([lo, lo + width], dtype=np.float64)
+        spans = np.diff(edges)
+        busy = np.diff(self._integral(self.busy, edges))
+        ready = np.diff(self._integral(self.ready, edges))
+        # peak: the state at each window start plus every change inside it
+        t = np.asarray(self.times, dtype=np.float64)
+        r = np.asarray(self.ready)
+        first = np.maximum(np.searchsorted(t, edges[:-1], side='right') - 1, 0)
+        last = np.maximum(np.searchsorted(t, edges[1:], side='left') - 1, first)
+        bounds = np.empty(2 * len(first), dtype=np.intp)
+        bounds[0::2], bounds[1::2] = first, last + 1
+        peak = np.maximum.reduceat(np.append(r, r[-1]), bounds)[0::2]
+        return {
+            'start': edges[:-1],
+            'util': 100 * busy / (spans * max(1, cores)),
+            'mean_ready': ready / spans,
+            'max_ready': peak,
+        }
 
-def sched_sjf(tasks: List[Dict[str,Any]], preemptive=False) -> List[Tuple[int,int,int]]:
-    """Shortest Job First"""
 
-    # Non-preemptive SJF
-    if not preemptive:
-        remaining = sorted(tasks, key=lambda t: (t['arrival'], t['burst'], t['pid']))
-        timeline = []
-        tcur = 0
-        completed = set()
-        n = len(tasks)
-
-        while len(completed) < n:
-            ready = [t for t in remaining if t['arrival'] <= tcur and t['pid'] not in completed]
-
-            if not ready:
-                arrivals = [t['arrival'] for t in remaining if t['pid'] not in completed]
-                if not arrivals:
-                    break
-                tcur = min(arrivals)
-                continue
+# --------------------- Discrete-Event Kernel ---------------------
 
-            chosen = min(ready, key=lambda t: (t['burst'], t['arrival'], t['pid']))
-            start = max(tcur, chosen['arrival'])
-            end = start + chosen['burst']
-            timeline.append((chosen['pid'], start, end))
-            tcur = end
-            completed.add(chosen['pid'])
+class Policy(ABC):
+    """Scheduling policy driven by simulate(); subclasses own their ready queue"""
 
-        return timeline
+    # False when arrivals never preempt, so simulate() can skip the checks
+    preemptive = True
 
-    # Preemptive SJF (SRTF)
-    bursts = {t['pid']: t['burst'] for t in tasks}
-    arrived = set()
-    ready = []
+    def reset(self, tasks: List[Dict[str,Any]]):
+        """Called once before a run"""
+
+    @abstractmethod
+    def on_arrival(self, task: Dict[str,Any], now: int,
+                   running: Optional[Tuple[int,int,int]]) -> bool:
+        """Queue an arrived task; return True to preempt running = (pid, remaining, ran)"""
+
+    @abstractmethod
+    def pick_next(self, now: int) -> Optional[Tuple[int, Optional[int]]]:
+        """Dequeue the next task as (pid, max slice); slice None runs it to completion"""
+
+    @abstractmethod
+    def on_tick_boundary(self, pid: int, ran: int, remaining: int, now: int):
+        """The dispatched task stopped (slice over, preempted or done); requeue it if remaining"""
+
+    def pick_victim(self, now: int, running: List[Tuple[int,int,int]]) -> Optional[int]:
+        """Several CPUs, all busy, after arrivals: pid of a running task to preempt, if any"""
+        return None
+
+
+def _table_policy(table: Dict[str,Any], algo: str, where: str):
+    """Entry of a simulator's own policy table; ValueError for policies it doesn't support"""
+    if algo not in table:
+        raise ValueError(f"{algo!r} is not supported {where}; choose from: {', '.join(table)}")
+    return table[algo]
+
+
+def simulate(tasks: List[Dict[str,Any]], policy: Policy, switch_cost: int = 0, cores: int = 1,
+             series: StateSeries = None, speeds: List[float] = None,
+             cpu_timelines: List = None) -> List[Tuple[int,int,int]]:
+    """Shared event loop: arrivals, idle gaps, preemption, switch overhead and timeline
+
+    Pass a StateSeries to also record ready-queue length and busy CPUs.
+    `speeds` gives each CPU a speed factor (one entry per CPU; bursts and
+    slices are work at speed 1), and a list passed as `cpu_timelines` receives
+    the timeline of each CPU.
+    """
+    if speeds:
+        cores = len(speeds)
+    if cores > 1 or speeds or cpu_timelines is not None:
+        return _simulate_cores(tasks, policy, switch_cost, cores, series, speeds, cpu_timelines)
+    # stable sort: tasks arriving together are admitted in list order
+    order = sorted(tasks, key=lambda t: t['arrival'])
+    arrivals = [t['arrival'] for t in order]
+    remaining = {t['pid']: t['burst'] for t in tasks}
+    n = len(order)
     timeline = []
+    ai = 0
     tcur = 0
-    pids = [t['pid'] for t in tasks]
+    last = None
+    ready = 0       # queued in the policy
+    policy.reset(tasks)
+
+    def admit(running=None):
+        nonlocal ai, ready
+        preempt = False
+        while ai < n and arrivals[ai] <= tcur:
+            preempt = policy.on_arrival(order[ai], tcur, running) or preempt
+            ai += 1
+            ready += 1
+        return preempt
 
     while True:
-        for t in tasks:
-            if t['pid'] not in arrived and t['arrival'] <= tcur:
-                arrived.add(t['pid'])
-                ready.append(t['pid'])
-
-        if not ready:
-            future = [t['arrival'] for t in tasks if t['pid'] not in arrived]
-            if not future:
+        admit()
+        pick = policy.pick_next(tcur)
+        if pick is None:
+            if series is not None:
+                series.record(tcur, ready, 0)
+            if ai >= n:
                 break
-            tcur = min(future)
+            tcur = max(tcur, arrivals[ai])
             continue
 
-        cur = min(ready, key=lambda pid: bursts[pid])
-        start = tcur
-        bursts[cur] -= 1
-        tcur += 1
-        end = tcur
+        pid, slice_len = pick
+        ready -= 1
+        budget = remaining[pid] if slice_len is None else max(0, min(slice_len, remaining[pid]))
+        ran = 0
+        preempt = False
+        if budget:
+            if series is not None:
+                series.record(tcur, ready, 1)
+            tcur = _switch(timeline, last, pid, tcur, switch_cost)
+            last = pid
+            # arrivals during the switch are seen before the task runs
+            preempt = admit((pid, remaining[pid], 0))
+            if series is not None:
+                series.record(tcur, ready, 1)
+
+        # run in pieces cut at arrivals, which may preempt
+        while ran < budget and not preempt:
+            run = budget - ran
+            if ai < n:
+                run = min(run, arrivals[ai] - tcur)
+            timeline.append((pid, tcur, tcur + run))
+            tcur += run
+            ran += run
+            remaining[pid] -= run
+            preempt = admit((pid, remaining[pid], ran))
+            if series is not None:
+                series.record(tcur, ready, 1)
+
+        policy.on_tick_boundary(pid, ran, remaining[pid], tcur)
+        if remaining[pid]:
+            ready += 1
+
+    if series is not None:
+        series.end = tcur
+    return merge_segments(timeline)
+
 
-        timeline.append((cur, start, end))
+def _simulate_cores(tasks, policy, switch_cost, cores, series=None, speeds=None, cpu_timelines=None):
+    """simulate() on several CPUs; the timeline is ordered by start, segments may overlap"""
+    order = sorted(tasks, key=lambda t: t['arrival'])
+    arrivals = [t['arrival'] for t in order]
+    remaining = {t['pid']: t['burst'] for t in tasks}
+    n = len(order)
+    lanes = [[] for _ in range(cores)]      # per-CPU timelines
+    last = [None] * cores
+    cur = [None] * cores                    # running pid per CPU
+    start = [0] * cores                     # when its piece started (after the switch)
+    gen = [0] * cores                       # invalidates stale completion events
+    speed = list(speeds) if speeds else [1] * cores
+    budget = [0] * cores                    # work in the current piece
+    free = list(range(cores))
+    ends = []                               # heap of (piece end, cpu, gen)
+    ai = 0
+    tcur = 0
+    ready = busy = 0
+    victims = policy.preemptive and type(policy).pick_victim is not Policy.pick_victim
+    policy.reset(tasks)
+
+    def done(c, ran):
+        # work finished on CPU c in `ran` ticks (partial work units are lost on preemption)
+        return ran if speed[c] == 1 else min(budget[c], int(ran * speed[c] + 1e-9))
+
+    def stop(c):
+        nonlocal ready, busy
+        pid = cur[c]
+        ran = max(0, tcur - start[c])
+        work = done(c, ran)
+        if ran:
+            lanes[c].append((pid, start[c], tcur))
+        elif lanes[c] and lanes[c][-1][0] == CTX_SWITCH_PID and lanes[c][-1][2] > tcur:
+            # preempted while switching in: cut the overhead short
+            lanes[c][-1] = (CTX_SWITCH_PID, lanes[c][-1][1], tcur)
+        remaining[pid] -= work
+        cur[c] = None
+        gen[c] += 1
+        heapq.heappush(free, c)
+        policy.on_tick_boundary(pid, work, remaining[pid], tcur)
+        busy -= 1
+        if remaining[pid]:
+            ready += 1
+
+    def dispatch(c):
+        # returns False when nothing is ready
+        nonlocal ready, busy
+        while True:
+            pick = policy.pick_next(tcur)
+            if pick is None:
+                return False
+            pid, slice_len = pick
+            work = remaining[pid] if slice_len is None else max(0, min(slice_len, remaining[pid]))
+            if work:
+                break
+            policy.on_tick_boundary(pid, 0, remaining[pid], tcur)
+        ready -= 1
+        busy += 1
+        start[c] = _switch(lanes[c], last[c], pid, tcur, switch_cost)
+        last[c] = cur[c] = pid
+        budget[c] = work
+        wall = work if speed[c] == 1 else math.ceil(work / speed[c] - 1e-9)
+        heapq.heappush(ends, (start[c] + wall, c, gen[c]))
+        return True
 
-        if bursts[cur] == 0:
-            ready.remove(cur)
+    while True:
+        # same order as one CPU: arrivals queue ahead of tasks whose slice ends now
+        arrived = False
+        while ai < n and arrivals[ai] <= tcur:
+            policy.on_arrival(order[ai], tcur, None)
+            ai += 1
+            ready += 1
+            arrived = True
+        while ends and ends[0][0] <= tcur:
+            _, c, g = heapq.heappop(ends)
+            if g == gen[c]:
+                stop(c)
+
+        while free:
+            c = heapq.heappop(free)
+            if not dispatch(c):
+                heapq.heappush(free, c)
+                break
 
-        if all(bursts[p] == 0 for p in pids):
+        while arrived and victims and not free:
+            running = [(cur[c], remaining[cur[c]] - done(c, max(0, tcur - start[c])),
+                        done(c, max(0, tcur - start[c]))) for c in range(cores)]
+            pid = policy.pick_victim(tcur, running)
+            if pid is None:
+                break
+            c = cur.index(pid)
+            stop(c)
+            heapq.heappop(free)
+            if not dispatch(c):
+                heapq.heappush(free, c)
+
+        if series is not None:
+            series.record(tcur, ready, busy)
+        while ends and ends[0][2] != gen[ends[0][1]]:
+            heapq.heappop(ends)
+        if not ends and ai >= n:
             break
+        tcur = min(ends[0][0] if ends else math.inf, arrivals[ai] if ai < n else math.inf)
+
+    if series is not None:
+        series.end = tcur
+    lanes = [merge_segments(lane) for lane in lanes]
+    if cpu_timelines is not None:
+        cpu_timelines.extend(lanes)
+    return sorted(itertools.chain.from_iterable(lanes), key=lambda seg: seg[1])
+
+
+class KeyPolicy(Policy):
+    """Ready heap ordered by key(task, remaining); ties go to the earlier admitted task"""
+
+    def __init__(self, key, preemptive: bool = False, tick: int = None):
+        self.key = key
+        self.preemptive = preemptive
+        self.tick = tick
+
+    def reset(self, tasks):
+        self.by_pid = {t['pid']: t for t in tasks}
+        self.seq = {}
+        self.ready = []
+
+    def on_arrival(self, task, now, running):
+        pid = task['pid']
+        self.seq[pid] = len(self.seq)
+        entry = (self.key(task, task['burst']), self.seq[pid], pid)
+        heapq.heappush(self.ready, entry)
+        if not self.preemptive or running is None:
+            return False
+        rpid, rem, _ = running
+        return entry[:2] < (self.key(self.by_pid[rpid], rem), self.seq[rpid])
 
-    return merge_segments(timeline)
+    def pick_next(self, now):
+        if not self.ready:
+            return None
+        return heapq.heappop(self.ready)[2], self.tick
+
+    def on_tick_boundary(self, pid, ran, remaining, now):
+        if remaining > 0:
+            heapq.heappush(self.ready, (self.key(self.by_pid[pid], remaining), self.seq[pid], pid))
+
+    def pick_victim(self, now, running):
+        if not self.preemptive or not self.ready:
+            return None
+        worst = max((self.key(self.by_pid[pid], rem), self.seq[pid], pid) for pid, rem, _ in running)
+        return worst[2] if self.ready[0][:2] < worst[:2] else None
+
+
+# --------------------- FCFS ---------------------
+
+def fcfs_policy() -> Policy:
+    """FCFS as a kernel policy"""
+    return KeyPolicy(lambda t, rem: (t['arrival'], t['pid']))
+
+
+def sched_fcfs(tasks: List[Dict[str,Any]], switch_cost: int = 0) -> List[Tuple[int,int,int]]:
+    """First-Come First-Serve"""
+    return simulate(tasks, fcfs_policy(), switch_cost)
+
+
+# --------------------- SJF ---------------------
+
+def sjf_policy(preemptive: bool = False, estimates: Dict[int,float] = None) -> Policy:
+    """SJF / SRTF as a kernel policy"""
+    if not preemptive:
+        if estimates:
+            return KeyPolicy(lambda t, rem: (estimates[t['pid']], t['arrival'], t['pid']))
+        return KeyPolicy(lambda t, rem: (t['burst'], t['arrival'], t['pid']))
+    if estimates:
+        # predicted remaining time = estimate minus service so far (never below 0);
+        # it keeps shrinking while the task runs, so re-evaluate every tick
+        return KeyPolicy(lambda t, rem: (max(0.0, estimates[t['pid']] - (t['burst'] - rem)),),
+                         preemptive=True, tick=1)
+    return KeyPolicy(lambda t, rem: (rem,), preemptive=True)
+
+
+def sched_sjf(tasks: List[Dict[str,Any]], preemptive=False, switch_cost: int = 0,
+              estimates: Dict[int,float] = None) -> List[Tuple[int,int,int]]:
+    """Shortest Job First (ordered by estimates instead of true bursts when given)"""
+    return simulate(tasks, sjf_policy(preemptive, estimates), switch_cost)
 
 
 # --------------------- Priority Scheduling ---------------------
 
-def sched_priority(tasks: List[Dict[str,Any]], preemptive=False) -> List[Tuple[int,int,int]]:
+def priority_policy(preemptive: bool = False) -> Policy:
+    """Priority scheduling as a kernel policy (lower value runs first)"""
+    if preemptive:
+        return KeyPolicy(lambda t, rem: (t['priority'],), preemptive=True)
+    return KeyPolicy(lambda t, rem: (t['priority'], t['arrival'], t['pid']))
+
+
+def sched_priority(tasks: List[Dict[str,Any]], preemptive=False,
+                   switch_cost: int = 0) -> List[Tuple[int,int,int]]:
     """Priority scheduling"""
+    return simulate(tasks, priority_policy(preemptive), switch_cost)
 
-    # Non-preemptive
-    if not preemptive:
-        remaining = sorted(tasks, key=lambda t: (t['arrival'], t['priority'], t['pid']))
-        timeline = []
-        tcur = 0
-        completed = set()
-        n = len(tasks)
-
-        while len(completed) < n:
-            ready = [t for t in remaining if t['arrival'] <= tcur and t['pid'] not in completed]
-
-            if not ready:
-                arrivals = [t['arrival'] for t in remaining if t['pid'] not in completed]
-                if not arrivals:
-                    break
-                tcur = min(arrivals)
-                continue
 
-            chosen = min(ready, key=lambda t: (t['priority'], t['arrival'], t['pid']))
-            start = max(tcur, chosen['arrival'])
-            end = start + chosen['burst']
+# --------------------- LJF ---------------------
 
-            timeline.append((chosen['pid'], start, end))
-            tcur = end
-            completed.add(chosen['pid'])
+def ljf_policy() -> Policy:
+    """LJF as a kernel policy"""
+    return KeyPolicy(lambda t, rem: (-t['burst'], -t['arrival'], -t['pid']))
 
-        return timeline
 
-    # Preemptive priority
-    remaining = {t['pid']: t['burst'] for t in tasks}
-    arrived = set()
-    ready = []
-    timeline = []
-    tcur = 0
-    pids = [t['pid'] for t in tasks]
+def sched_ljf(tasks: List[Dict[str,Any]], switch_cost: int = 0) -> List[Tuple[int,int,int]]:
+    """Longest Job First"""
+    return simulate(tasks, ljf_policy(), switch_cost)
 
-    priority = lambda pid: next(x['priority'] for x in tasks if x['pid'] == pid)
 
-    while True:
-        for t in tasks:
-            if t['pid'] not in arrived and t['arrival'] <= tcur:
-                arrived.add(t['pid'])
-                ready.append(t['pid'])
+# --------------------- Round Robin ---------------------
 
-        if not ready:
-            future = [t['arrival'] for t in tasks if t['pid'] not in arrived]
-            if not future:
-                break
-            tcur = min(future)
-            continue
+class RoundRobinPolicy(Policy):
+    """FIFO ready queue, fixed time slice"""
 
-        cur = min(ready, key=lambda pid: priority(pid))
-        start = tcur
-        remaining[cur] -= 1
-        tcur += 1
-        end = tcur
+    preemptive = False
 
-        timeline.append((cur, start, end))
+    def __init__(self, quantum: int = 2):
+        self.q = max(1, int(quantum))
 
-        if remaining[cur] == 0:
-            ready.remove(cur)
+    def reset(self, tasks):
+        self.ready = deque()
 
-        if all(remaining[p] == 0 for p in pids):
+    def on_arrival(self, task, now, running):
+        self.ready.append(task['pid'])
+        return False
+
+    def pick_next(self, now):
+        return (self.ready.popleft(), self.q) if self.ready else None
+
+    def on_tick_boundary(self, pid, ran, remaining, now):
+        # arrivals during the slice are already queued ahead of it
+        if remaining > 0:
+            self.ready.append(pid)
+
+
+def sched_rr(tasks: List[Dict[str,Any]], quantum:int, switch_cost: int = 0) -> List[Tuple[int,int,int]]:
+    """Round Robin"""
+    return simulate(tasks, RoundRobinPolicy(quantum), switch_cost)
+
+
+# --------------------- Multilevel Feedback Queue ---------------------
+
+class MLFQPolicy(Policy):
+    """Multilevel Feedback Queue (demote on quantum expiry, periodic boost)"""
+
+    def __init__(self, quantum: int = 2, levels: int = 3, quanta: List[int] = None,
+                 boost: int = None):
+        levels = max(1, int(levels))
+        if quanta:
+            quanta = [max(1, int(x)) for x in quanta][:levels]
+        else:
+            base = max(1, int(quantum))
+            quanta = [base * (2 ** i) for i in range(levels)]
+        self.quanta = quanta
+        self.levels = len(quanta)
+        # boost <= 0 disables it; default to a few rounds of the lowest level
+        if boost is None:
+            boost = 5 * quanta[-1]
+        self.boost = int(boost) if boost and boost > 0 else None
+
+    def reset(self, tasks):
+        self.level = {}
+        self.used = {}              # time used at the current level
+        self.queues = [deque() for _ in range(self.levels)]
+        self.next_boost = self.boost
+
+    def on_arrival(self, task, now, running):
+        pid = task['pid']
+        self.level[pid] = 0
+        self.used[pid] = 0
+        self.queues[0].append(pid)
+        # a new arrival lands in the top queue and preempts lower levels
+        return running is not None and self.level[running[0]] > 0
+
+    def pick_next(self, now):
+        lv = next((i for i, qu in enumerate(self.queues) if qu), None)
+        if lv is None:
+            return None
+        if self.next_boost is not None and now >= self.next_boost:
+            # only after an idle gap: boosts with nothing queued are skipped
+            self.next_boost += ((now - self.next_boost) // self.boost + 1) * self.boost
+
+        pid = self.queues[lv].popleft()
+        run = self.quanta[lv] - self.used[pid]
+        if self.next_boost is not None:
+            run = min(run, self.next_boost - now)
+        return pid, run
+
+    def on_tick_boundary(self, pid, ran, remaining, now):
+        lv = self.level[pid]
+        self.used[pid] += ran
+        if remaining > 0:
+            if self.used[pid] >= self.quanta[lv] and lv + 1 < self.levels:
+                self.level[pid] = lv + 1
+                self.used[pid] = 0
+                self.queues[lv + 1].append(pid)
+            elif self.used[pid] >= self.quanta[lv]:
+                self.used[pid] = 0
+                self.queues[lv].append(pid)
+            else:
+                # preempted before its quantum ran out: keep its place
+                self.queues[lv].appendleft(pid)
+
+        if self.next_boost is not None and now >= self.next_boost:
+            for lv in range(1, self.levels):
+                while self.queues[lv]:
+                    p = self.queues[lv].popleft()
+                    self.level[p] = 0
+                    self.used[p] = 0
+                    self.queues[0].append(p)
+            self.next_boost += self.boost
+
+    def pick_victim(self, now, running):
+        top = next((i for i, qu in enumerate(self.queues) if qu), None)
+        if top is None:
+            return None
+        pid = max(running, key=lambda r: self.level[r[0]])[0]
+        return pid if self.level[pid] > top else None
+
+
+def sched_mlfq(tasks: List[Dict[str,Any]], quantum: int = 2, levels: int = 3,
+               quanta: List[int] = None, boost: int = None,
+               switch_cost: int = 0) -> List[Tuple[int,int,int]]:
+    """Multilevel Feedback Queue (demote on quantum expiry, periodic boost)"""
+    return simulate(tasks, MLFQPolicy(quantum, levels, quanta, boost), switch_cost)
+
+
+# --------------------- CFS (Completely Fair Scheduler) ---------------------
+
+NICE_0_LOAD = 1024
+
+# Linux sched_prio_to_weight, nice -20 .. 19
+NICE_TO_WEIGHT = [
+    88761, 71755, 56483, 46273, 36291,
+    29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906,
+    3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423,
+    335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45,
+    36, 29, 23, 18, 15,
+]
+
+
+def cfs_weight(priority: int) -> int:
+    """Load weight of a task; priority is read as a nice value (lower = more CPU)"""
+    nice = min(19, max(-20, int(priority)))
+    return NICE_TO_WEIGHT[nice + 20]
+
+
+class CFSPolicy(Policy):
+    """CFS-style fair scheduling ordered by weighted virtual runtime"""
+
+    def __init__(self, target_latency: int = 20, min_granularity: int = 4):
+        self.latency = max(1, int(target_latency))
+        self.min_gran = max(1, int(min_granularity))
+
+    def reset(self, tasks):
+        self.weight = {t['pid']: cfs_weight(t.get('priority', 0)) for t in tasks}
+        self.vruntime = {}
+        self.ready = []         # heap of (vruntime, seq, pid)
+        self.seq = 0
+        self.total_weight = 0
+        self.min_vruntime = 0.0
+        self.accounted = {}     # pid -> part of its current slice already charged
+
+    def _enqueue(self, pid):
+        heapq.heappush(self.ready, (self.vruntime[pid], self.seq, pid))
+        self.seq += 1
+
+    def _charge(self, pid, ran):
+        self.vruntime[pid] += (ran - self.accounted[pid]) * NICE_0_LOAD / self.weight[pid]
+        self.accounted[pid] = ran
+
+    def on_arrival(self, task, now, running):
+        pid = task['pid']
+        # new tasks start at the queue's min_vruntime so they can't starve others
+        self.vruntime[pid] = self.min_vruntime
+        self.total_weight += self.weight[pid]
+        self._enqueue(pid)
+        if running is None:
+            return False
+        # wakeup preemption once the current task had its minimum granularity
+        rpid, _, ran = running
+        self._charge(rpid, ran)
+        return ran >= self.min_gran and self.ready[0][0] < self.vruntime[rpid]
+
+    def pick_next(self, now):
+        if not self.ready:
+            return None
+        _, _, pid = heapq.heappop(self.ready)
+        self.accounted[pid] = 0
+        return pid, max(self.min_gran, self.latency * self.weight[pid] // self.total_weight)
+
+    def on_tick_boundary(self, pid, ran, remaining, now):
+        self._charge(pid, ran)
+        if self.ready:
+            self.min_vruntime = max(self.min_vruntime, min(self.vruntime[pid], self.ready[0][0]))
+        else:
+            self.min_vruntime = max(self.min_vruntime, self.vruntime[pid])
+
+        if remaining > 0:
+            self._enqueue(pid)
+        else:
+            self.total_weight -= self.weight[pid]
+
+    def pick_victim(self, now, running):
+        if not self.ready:
+            return None
+        worst = None
+        for pid, _, ran in running:
+            self._charge(pid, ran)
+            if ran >= self.min_gran and (worst is None or self.vruntime[pid] > self.vruntime[worst]):
+                worst = pid
+        return worst if worst is not None and self.ready[0][0] < self.vruntime[worst] else None
+
+
+def sched_cfs(tasks: List[Dict[str,Any]], target_latency: int = 20,
+              min_granularity: int = 4, switch_cost: int = 0) -> List[Tuple[int,int,int]]:
+    """CFS-style fair scheduling ordered by weighted virtual runtime"""
+    return simulate(tasks, CFSPolicy(target_latency, min_granularity), switch_cost)
+
+
+# --------------------- Group (Tenant) Fair Share ---------------------
+
+# inner policy -> (task key, preemptive between slices, round robin)
+GROUP_INNER_POLICIES = {
+    'FCFS': (lambda t, rem: (t['arrival'], t['pid']), False, False),
+    'SJF (Non-preemptive)': (lambda t, rem: (t['burst'], t['arrival'], t['pid']), False, False),
+    'SJF (Preemptive)': (lambda t, rem: (rem, t['arrival'], t['pid']), True, False),
+    'Priority (Non-preemptive)': (lambda t, rem: (t['priority'], t['arrival'], t['pid']), False, False),
+    'Priority (Preemptive)': (lambda t, rem: (t['priority'], t['arrival'], t['pid']), True, False),
+    'LJF': (lambda t, rem: (-t['burst'], t['arrival'], t['pid']), False, False),
+    'Round Robin': (None, False, True),
+}
+
+
+def parse_group_weights(text: str) -> Dict[str,float]:
+    """Parse 'tenantA:3;tenantB:1.5' into a weight dict"""
+    weights = {}
+    for part in (text or '').replace(',', ';').split(';'):
+        if ':' in part:
+            name, w = part.split(':', 1)
+            if name.strip() and float(w) > 0:
+                weights[name.strip()] = float(w)
+    return weights
+
+
+class GroupFairPolicy(Policy):
+    """Two-level scheduling: weighted fair queueing across groups, inner policy per group"""
+
+    preemptive = False
+
+    def __init__(self, weights: Dict[str,float] = None, inner: str = 'FCFS', quantum: int = 2):
+        self.weights = weights or {}
+        self.key_fn, self.inner_preempt, self.rr = _table_policy(
+            GROUP_INNER_POLICIES, inner, 'inside a group')
+        self.q = max(1, int(quantum))
+
+    def reset(self, tasks):
+        self.by_pid = {t['pid']: t for t in tasks}
+        self.group_of = {t['pid']: (t.get('group') or '') for t in tasks}
+        self.queues = {}        # group -> heap / deque of its ready tasks
+        self.current = {}       # group -> task holding the group's turn (non-preemptive inner)
+        self.vpass = {}         # group -> virtual pass (service / weight)
+        self.active = []        # heap of (pass, group) for groups with ready work
+        self.in_active = set()
+        self.running = {}       # pid -> (group, pass when dispatched); one task per group
+        self.vtime = 0.0
+        self.seq = 0
+
+    def _push_task(self, g, pid, rem):
+        qu = self.queues.setdefault(g, deque() if self.rr else [])
+        if self.rr:
+            qu.append(pid)
+        else:
+            heapq.heappush(qu, (self.key_fn(self.by_pid[pid], rem), self.seq, pid))
+            self.seq += 1
+
+    def _activate(self, g):
+        self.in_active.add(g)
+        heapq.heappush(self.active, (self.vpass[g], g))
+
+    def on_arrival(self, task, now, running):
+        pid = task['pid']
+        g = self.group_of[pid]
+        self._push_task(g, pid, task['burst'])
+        if g not in self.in_active and all(rg != g for rg, _ in self.running.values()):
+            # an idle group re-enters at the current virtual time (no banked credit)
+            self.vpass[g] = max(self.vpass.get(g, 0.0), self.vtime)
+            self._activate(g)
+        return False
+
+    def pick_next(self, now):
+        if not self.active:
+            return None
+        gpass, g = heapq.heappop(self.active)
+        self.in_active.discard(g)
+        self.vtime = gpass
+
+        # pick the task inside the group
+        if g in self.current:
+            pid = self.current.pop(g)
+        elif self.rr:
+            pid = self.queues[g].popleft()
+        else:
+            pid = heapq.heappop(self.queues[g])[2]
+        self.running[pid] = (g, gpass)
+        return pid, self.q
+
+    def on_tick_boundary(self, pid, ran, remaining, now):
+        g, gpass = self.running.pop(pid)
+        self.vpass[g] = gpass + ran / self.weights.get(g, 1.0)
+        if remaining > 0:
+            if self.rr or self.inner_preempt:
+                self._push_task(g, pid, remaining)
+            else:
+                self.current[g] = pid
+        if self.queues.get(g) or g in self.current:
+            self._activate(g)
+
+
+def sched_group_fair(tasks: List[Dict[str,Any]], weights: Dict[str,float] = None,
+                     inner: str = 'FCFS', quantum: int = 2,
+                     switch_cost: int = 0) -> List[Tuple[int,int,int]]:
+    """Two-level scheduling: weighted fair queueing across groups, inner policy per group"""
+    return simulate(tasks, GroupFairPolicy(weights, inner, quantum), switch_cost)
+
+
+def group_metrics(tasks: List[Dict[str,Any]], timeline: List[Tuple[int,int,int]]) -> Dict[str,Dict[str,Any]]:
+    """Per-group CPU share and latency for any timeline"""
+    group_of = {t['pid']: (t.get('group') or '') for t in tasks}
+    first = {}
+    last = {}
+    busy = {}
+    for pid, s, e in timeline:
+        if pid == CTX_SWITCH_PID:
+            continue
+        first.setdefault(pid, s)
+        last[pid] = e
+        g = group_of.get(pid, '')
+        busy[g] = busy.get(g, 0) + (e - s)
+
+    total = sum(busy.values()) or 1
+    out = {}
+    for t in tasks:
+        g = t.get('group') or ''
+        st = out.setdefault(g, {'tasks': 0, 'cpu_share': busy.get(g, 0) / total * 100,
+                                'avg_wait': 0.0, 'avg_tat': 0.0, 'avg_response': 0.0})
+        if t['pid'] not in last:
+            continue
+        st['tasks'] += 1
+        tat = last[t['pid']] - t['arrival']
+        st['avg_tat'] += tat
+        st['avg_wait'] += tat - t['burst']
+        st['avg_response'] += first[t['pid']] - t['arrival']
+
+    for st in out.values():
+        if st['tasks']:
+            for k in ('avg_wait', 'avg_tat', 'avg_response'):
+                st[k] /= st['tasks']
+    return out
+
+
+# --------------------- Policy Registry ---------------------
+
+# name -> factory(config) -> Policy; config carries 'quantum', 'estimates' and the
+# per-policy settings dicts 'mlfq', 'cfs' and 'group'
+POLICY_REGISTRY: Dict[str, Callable[[Dict[str,Any]], Policy]] = {}
+
+
+def register_policy(name: str):
+    """Decorator adding a policy factory to the registry (and to the GUI lists)"""
+    def deco(factory):
+        POLICY_REGISTRY[name] = factory
+        return factory
+    return deco
+
+
+register_policy('FCFS')(lambda cfg: fcfs_policy())
+register_policy('SJF (Non-preemptive)')(lambda cfg: sjf_policy(False, cfg.get('estimates')))
+register_policy('SJF (Preemptive)')(lambda cfg: sjf_policy(True, cfg.get('estimates')))
+register_policy('Priority (Non-preemptive)')(lambda cfg: priority_policy(False))
+register_policy('Priority (Preemptive)')(lambda cfg: priority_policy(True))
+register_policy('LJF')(lambda cfg: ljf_policy())
+register_policy('Round Robin')(lambda cfg: RoundRobinPolicy(cfg.get('quantum', 2)))
+register_policy('MLFQ')(lambda cfg: MLFQPolicy(cfg.get('quantum', 2), **cfg.get('mlfq', {})))
+register_policy('CFS')(lambda cfg: CFSPolicy(**cfg.get('cfs', {})))
+register_policy('Group Fair Share')(
+    lambda cfg: GroupFairPolicy(quantum=cfg.get('quantum', 2), **cfg.get('group', {})))
+
+
+def run_policy(tasks: List[Dict[str,Any]], name: str, config: Dict[str,Any] = None,
+               switch_cost: int = 0, cores: int = 1,
+               series: StateSeries = None, speeds: List[float] = None,
+               cpu_timelines: List = None) -> List[Tuple[int,int,int]]:
+    """Simulate a registered policy (ValueError for unknown names)"""
+    factory = _table_policy(POLICY_REGISTRY, name, 'by the kernel')
+    return simulate(tasks, factory(config or {}), switch_cost, cores, series, speeds, cpu_timelines)
+
+
+def algorithm_names() -> List[str]:
+    """Everything the Scheduler / Compare pages offer"""
+    return list(POLICY_REGISTRY) + list(REALTIME_POLICIES)
+
+
+# --------------------- Real-Time (EDF / Rate-Monotonic) ---------------------
+
+# periodic-job policies run on their own release loop (sched_realtime)
+REALTIME_POLICIES = {'EDF': 'EDF', 'Rate-Monotonic': 'RM'}
+
+
+def _rt_params(t: Dict[str,Any]) -> Tuple[int,int]:
+    """(relative deadline, period) of a task; 0 when not set"""
+    period = int(t.get('period') or 0)
+    deadline = int(t.get('deadline') or 0) or period
+    return deadline, period
+
+
+def schedulability_test(tasks: List[Dict[str,Any]], policy: str = 'EDF') -> Dict[str,Any]:
+    """Pre-simulation schedulability test over the periodic tasks"""
+    periodic = [t for t in tasks if _rt_params(t)[1] > 0]
+    if not periodic:
+        return {'utilization': 0.0, 'bound': 1.0, 'schedulable': None, 'method': 'no periodic tasks'}
+
+    C = np.array([t['burst'] for t in periodic], dtype=np.float64)
+    D = np.array([_rt_params(t)[0] for t in periodic], dtype=np.float64)
+    T = np.array([_rt_params(t)[1] for t in periodic], dtype=np.float64)
+    util = float((C / T).sum())
+
+    if policy == 'EDF':
+        # exact for implicit deadlines, sufficient (density) otherwise
+        density = float((C / np.minimum(D, T)).sum())
+        implicit = bool((D >= T).all())
+        return {
+            'utilization': util,
+            'bound': 1.0,
+            'schedulable': (util if implicit else density) <= 1.0,
+            'method': 'U <= 1' if implicit else 'density <= 1'
+        }
+
+    # Rate-Monotonic: Liu & Layland bound first, response-time analysis if it fails
+    n = len(periodic)
+    bound = n * (2 ** (1 / n) - 1)
+    if util <= bound and (D >= T).all():
+        return {'utilization': util, 'bound': bound, 'schedulable': True, 'method': 'Liu-Layland'}
+    if util > 1.0:
+        return {'utilization': util, 'bound': bound, 'schedulable': False, 'method': 'U > 1'}
+
+    idx = np.argsort(T, kind='stable')
+    C, D, T = C[idx], D[idx], T[idx]
+    for i in range(n):
+        r = C[:i + 1].sum()
+        while True:
+            nxt = C[i] + (np.ceil(r / T[:i]) * C[:i]).sum()
+            if nxt > D[i]:
+                return {'utilization': util, 'bound': bound, 'schedulable': False,
+                        'method': 'response-time analysis'}
+            if nxt == r:
+                break
+            r = nxt
+    return {'utilization': util, 'bound': bound, 'schedulable': True, 'method': 'response-time analysis'}
+
+
+def default_horizon(tasks: List[Dict[str,Any]], cap: int = 1_000_000) -> int:
+    """Hyperperiod of the periodic tasks (capped), or the end of the one-shot jobs"""
+    last = max((t['arrival'] + t['burst'] for t in tasks), default=0)
+    periods = [p for _, p in map(_rt_params, tasks) if p > 0]
+    if not periods:
+        return sum(t['burst'] for t in tasks) + last
+    hyper = 1
+    for p in periods:
+        hyper = hyper * p // math.gcd(hyper, p)
+        if hyper > cap:
+            hyper = cap
             break
+    return max(t['arrival'] for t in tasks) + hyper
 
-    return merge_segments(timeline)
 
+def sched_realtime(tasks: List[Dict[str,Any]], policy: str = 'EDF',
+                   horizon: int = None, switch_cost: int = 0) -> Dict[str,Any]:
+    """Preemptive EDF or Rate-Monotonic with periodic job release"""
+    if horizon is None:
+        horizon = default_horizon(tasks)
+    INF = float('inf')
 
-# --------------------- LJF ---------------------
+    by_pid = {t['pid']: t for t in tasks}
+    params = {t['pid']: _rt_params(t) for t in tasks}
 
-def sched_ljf(tasks: List[Dict[str,Any]]) -> List[Tuple[int,int,int]]:
-    """Longest Job First"""
-    remaining = sorted(tasks, key=lambda t: (t['arrival'], -t['burst'], t['pid']))
+    # releases: (time, pid, job index); periodic tasks re-arm after each release
+    releases = [(t['arrival'], t['pid'], 0) for t in tasks if t['arrival'] < horizon]
+    heapq.heapify(releases)
+
+    ready = []          # (key, release, pid, job)
+    jobs = []           # [pid, release, abs deadline, completion, burst]
+    job_left = {}
     timeline = []
     tcur = 0
-    completed = set()
-    n = len(tasks)
+    last = None
+
+    def prio(pid, abs_deadline):
+        if policy == 'EDF':
+            return abs_deadline
+        period = params[pid][1]
+        return period if period else params[pid][0] or INF
 
-    while len(completed) < n:
-        ready = [t for t in remaining if t['arrival'] <= tcur and t['pid'] not in completed]
+    while True:
+        while releases and releases[0][0] <= tcur:
+            rel, pid, k = heapq.heappop(releases)
+            deadline, period = params[pid]
+            abs_deadline = rel + deadline if deadline else INF
+            job = len(jobs)
+            jobs.append([pid, rel, abs_deadline, None, by_pid[pid]['burst']])
+            job_left[job] = by_pid[pid]['burst']
+            heapq.heappush(ready, (prio(pid, abs_deadline), rel, pid, job))
+            if period and rel + period < horizon:
+                heapq.heappush(releases, (rel + period, pid, k + 1))
 
         if not ready:
-            arrivals = [t['arrival'] for t in remaining if t['pid'] not in completed]
-            if not arrivals:
+            if not releases:
                 break
-            tcur = min(arrivals)
+            tcur = releases[0][0]
             continue
 
-        chosen = max(ready, key=lambda t: (t['burst'], t['arrival'], t['pid']))
-        start = max(tcur, chosen['arrival'])
-        end = start + chosen['burst']
+        key, rel, pid, job = heapq.heappop(ready)
+        if tcur < horizon:
+            tcur = _switch(timeline, last, pid, tcur, switch_cost)
+            last = pid
+        run = job_left[job]
+        # run until completion or the next release (which may preempt)
+        if releases:
+            run = min(run, releases[0][0] - tcur)
+        run = min(run, horizon - tcur)
+        if run <= 0:
+            heapq.heappush(ready, (key, rel, pid, job))
+            # a release that landed during the switch gets re-evaluated first
+            if tcur < horizon:
+                continue
+            break
 
-        timeline.append((chosen['pid'], start, end))
-        tcur = end
-        completed.add(chosen['pid'])
+        timeline.append((pid, tcur, tcur + run))
+        tcur += run
+        job_left[job] -= run
+        if job_left[job] == 0:
+            jobs[job][3] = tcur
+        else:
+            heapq.heappush(ready, (key, rel, pid, job))
 
-    return timeline
+    return {
+        'timeline': merge_segments(timeline),
+        'jobs': [tuple(j) for j in jobs],
+        'horizon': horizon,
+        'schedulability': schedulability_test(tasks, policy)
+    }
 
 
-# --------------------- Round Robin ---------------------
+def compute_deadline_metrics(jobs, timeline: List[Tuple[int,int,int]], horizon: int) -> Dict[str,Any]:
+    """Per-job metrics for real-time runs (jobs of one task share its pid)"""
+    misses = 0
+    max_late = None
+    for pid, rel, dl, comp, burst in jobs:
+        if dl == float('inf') or (comp is None and dl > horizon):
+            continue
+        # a job still running at the horizon is late by at least horizon - deadline
+        late = comp - dl if comp is not None else max(1, horizon - dl)
+        if late > 0:
+            misses += 1
+        max_late = late if max_late is None else max(max_late, late)
+
+    done = [j for j in jobs if j[3] is not None]
+    switches, overhead = context_switches(timeline)
+    total_exec = sum(e - s for _, s, e in timeline) - overhead
+    start = min((s for _, s, _ in timeline), default=0)
+    end = max((e for _, _, e in timeline), default=0)
+    span = max(1, end - start)
 
-def sched_rr(tasks: List[Dict[str,Any]], quantum:int) -> List[Tuple[int,int,int]]:
-    """Round Robin"""
+    n = len(done)
+    total_tat = sum(comp - rel for _, rel, _, comp, _ in done)
+    total_wait = total_tat - sum(burst for *_, burst in done)
+    return {
+        'avg_wait': total_wait / n if n else 0,
+        'avg_tat': total_tat / n if n else 0,
+        'cpu_util': (total_exec + overhead) / span * 100,
+        'effective_util': total_exec / span * 100,
+        'throughput': n / span,
+        'total_exec': total_exec,
+        'switches': switches,
+        'overhead': overhead,
+        'jobs': len(jobs),
+        'deadline_misses': misses,
+        'max_lateness': max_late if max_late is not None else 0,
+        **latency_summary({
+            'wait': [comp - rel - burst for _, rel, _, comp, burst in done],
+            'tat': [comp - rel for _, rel, _, comp, _ in done]
+        })
+    }
+
+
+# --------------------- Resource-Aware Simulation ---------------------
+
+def parse_resource_ops(text: str) -> List[Tuple[int,str,str]]:
+    """Parse 'acquire@0:R1;release@3:R1' into (offset, op, resource) tuples"""
+    ops = []
+    for part in (text or '').replace(',', ';').split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        head, res = part.split(':', 1)
+        op, offset = head.split('@', 1)
+        op = op.strip().lower()
+        if op not in ('acquire', 'release'):
+            raise ValueError(f"Unknown resource op '{op}'")
+        ops.append((int(offset), op, res.strip()))
+    return ops
+
+
+def task_resource_ops(t: Dict[str,Any]) -> List[Tuple[int,str,str]]:
+    """Resource ops of a task, derived from holding/waiting when not given"""
+    burst = t['burst']
+    ops = t.get('resource_ops')
+    if not ops:
+        ops = []
+        h = (t.get('holding') or '').strip()
+        w = (t.get('waiting') or '').strip()
+        if h:
+            ops.append((0, 'acquire', h))
+        if w and w != h:
+            ops.append((burst // 2, 'acquire', w))
+    # everything still held is released on completion
+    return sorted(((min(max(0, o), burst), op, r) for o, op, r in ops),
+                  key=lambda x: (x[0], x[1] != 'release'))
+
+
+# policy name -> (ready-queue key, preemptive on arrival, round robin)
+RESOURCE_POLICIES = {
+    'FCFS': (lambda t, rem: (t['arrival'],), False, False),
+    'SJF (Non-preemptive)': (lambda t, rem: (t['burst'], t['arrival']), False, False),
+    'SJF (Preemptive)': (lambda t, rem: (rem, t['arrival'], t['pid']), True, False),
+    'Priority (Non-preemptive)': (lambda t, rem: (t['priority'], t['arrival']), False, False),
+    'Priority (Preemptive)': (lambda t, rem: (t['priority'], t['arrival'], t['pid']), True, False),
+    'LJF': (lambda t, rem: (-t['burst'], t['arrival']), False, False),
+    'Round Robin': (None, False, True),
+}
+
+
+def sched_with_resources(tasks: List[Dict[str,Any]], algo: str = 'FCFS',
+                         quantum: int = 2, switch_cost: int = 0) -> Dict[str,Any]:
+    """Event-driven simulation where tasks acquire/release single-instance resources"""
+    key_fn, preemptive, rr = _table_policy(RESOURCE_POLICIES, algo, 'with resources')
     q = max(1, int(quantum))
 
-    bursts = {t['pid']: t['burst'] for t in tasks}
-    arrived = set()
-    ready = []
+    by_pid = {t['pid']: t for t in tasks}
+    order = sorted(tasks, key=lambda t: (t['arrival'], t['pid']))
+    ops = {t['pid']: task_resource_ops(t) for t in tasks}
+    op_idx = {pid: 0 for pid in by_pid}
+    remaining = {t['pid']: t['burst'] for t in tasks}
+
+    owner = {}          # resource -> pid
+    held = {pid: [] for pid in by_pid}
+    waiters = {}        # resource -> deque of blocked pids
+    waiting_on = {}     # blocked pid -> resource
+    blocked_since = {}
+    deadlocked = set()
+
     timeline = []
+    blocked = []
+    deadlocks = []
+
+    ready_rr = deque()
+    ready_heap = []
+    seq = 0
+    ai = 0
+    n = len(order)
     tcur = 0
-    pids = [t['pid'] for t in tasks]
+    last = None
+
+    def make_ready(pid):
+        nonlocal seq
+        if rr:
+            ready_rr.append(pid)
+        else:
+            heapq.heappush(ready_heap, (key_fn(by_pid[pid], remaining[pid]), seq, pid))
+            seq += 1
+
+    def admit(upto):
+        nonlocal ai
+        while ai < n and order[ai]['arrival'] <= upto:
+            make_ready(order[ai]['pid'])
+            ai += 1
+
+    def release(pid, res):
+        if owner.get(res) != pid:
+            return
+        del owner[res]
+        held[pid].remove(res)
+        queue = waiters.get(res)
+        if queue:
+            w = queue.popleft()
+            owner[res] = w
+            held[w].append(res)
+            del waiting_on[w]
+            blocked.append((w, blocked_since.pop(w), tcur))
+            make_ready(w)
+
+    def block(pid, res):
+        waiting_on[pid] = res
+        waiters.setdefault(res, deque()).append(pid)
+        blocked_since[pid] = tcur
+
+        # single-instance resources: every blocked task has exactly one outgoing
+        # wait-for edge, so a new cycle must pass through pid -- follow the chain
+        path = [pid]
+        cur = owner.get(res)
+        while cur is not None and cur != pid and cur not in deadlocked:
+            path.append(cur)
+            nxt = waiting_on.get(cur)
+            cur = owner.get(nxt) if nxt is not None else None
+        if cur == pid:
+            deadlocked.update(path)
+            deadlocks.append((tcur, path))
+
+    def run_ops(pid, upto):
+        """Apply ops due at offset <= upto; False if the task blocked"""
+        lst = ops[pid]
+        done = by_pid[pid]['burst'] - remaining[pid]
+        while op_idx[pid] < len(lst) and lst[op_idx[pid]][0] <= min(done, upto):
+            _, op, res = lst[op_idx[pid]]
+            if op == 'acquire':
+                if owner.get(res) not in (None, pid):
+                    block(pid, res)
+                    return False
+                if owner.get(res) is None:
+                    owner[res] = pid
+                    held[pid].append(res)
+            else:
+                release(pid, res)
+            op_idx[pid] += 1
+        return True
 
     while True:
-        for t in tasks:
-            if t['pid'] not in arrived and t['arrival'] <= tcur:
-                arrived.add(t['pid'])
-                ready.append(t['pid'])
+        admit(tcur)
 
-        if not ready:
-            if all(bursts[p] == 0 for p in pids):
+        if rr:
+            pid = ready_rr.popleft() if ready_rr else None
+        else:
+            pid = heapq.heappop(ready_heap)[2] if ready_heap else None
+
+        if pid is None:
+            if ai < n:
+                tcur = max(tcur, order[ai]['arrival'])
+                continue
+            break
+
+        tcur = _switch(timeline, last, pid, tcur, switch_cost)
+        last = pid
+        admit(tcur)
+
+        # run until completion, block, quantum expiry or arrival preemption;
+        # reaching an op point alone does not give up the CPU
+        budget = q if rr else None
+        while run_ops(pid, by_pid[pid]['burst']):
+            done = by_pid[pid]['burst'] - remaining[pid]
+            run = remaining[pid]
+            if op_idx[pid] < len(ops[pid]):
+                run = min(run, ops[pid][op_idx[pid]][0] - done)
+            if budget is not None:
+                run = min(run, budget)
+                budget -= run
+            preempt_at = order[ai]['arrival'] if preemptive and ai < n else None
+            if preempt_at is not None:
+                run = min(run, preempt_at - tcur)
+
+            if run > 0:
+                timeline.append((pid, tcur, tcur + run))
+                tcur += run
+                remaining[pid] -= run
+            admit(tcur)
+
+            if remaining[pid] == 0:
+                if run_ops(pid, by_pid[pid]['burst']):
+                    for res in list(held[pid]):
+                        release(pid, res)
                 break
-            future = [t['arrival'] for t in tasks if t['pid'] not in arrived]
-            if not future:
+            if budget == 0 or (preempt_at is not None and tcur >= preempt_at):
+                make_ready(pid)
                 break
-            tcur = min(future)
-            for t in tasks:
-                if t['pid'] not in arrived and t['arrival'] <= tcur:
-                    arrived.add(t['pid'])
-                    ready.append(t['pid'])
-            continue
 
-        cur = ready.pop(0)
+    # tasks still blocked are deadlocked or starved behind a deadlock
+    for pid, since in blocked_since.items():
+        blocked.append((pid, since, max(tcur, since)))
+    if CHECK_OBSERVERS:
+        notify_check('online', 'deadlock' if deadlocks else 'clear')
+
+    return {
+        'timeline': merge_segments(timeline),
+        'blocked': sorted(blocked, key=lambda b: (b[1], b[0])),
+        'deadlocks': deadlocks,
+        'unfinished': sorted(pid for pid in by_pid if remaining[pid] > 0 or pid in waiting_on)
+    }
 
-        if bursts[cur] <= 0:
-            continue
 
-        start = tcur
-        sl = min(q, bursts[cur])
-        bursts[cur] -= sl
-        tcur += sl
-        end = tcur
+# --------------------- CPU / I/O Burst Simulation ---------------------
 
-        timeline.append((cur, start, end))
+DEFAULT_DEVICE = 'io0'
 
-        for t in tasks:
-            if t['pid'] not in arrived and t['arrival'] <= tcur:
-                arrived.add(t['pid'])
-                ready.append(t['pid'])
 
-        if bursts[cur] > 0:
-            ready.append(cur)
+def parse_burst_sequence(text: str) -> Tuple[List[int], List[str]]:
+    """Parse '5;3@disk;4' into CPU/IO bursts [5, 3, 4] and IO devices ['disk']"""
+    bursts = []
+    devices = []
+    for i, part in enumerate(p.strip() for p in (text or '').split(';') if p.strip()):
+        if i % 2:
+            length, _, dev = part.partition('@')
+            devices.append(dev.strip() or DEFAULT_DEVICE)
+        else:
+            length = part
+        bursts.append(max(1, int(length)))
+    # a sequence always ends with a CPU burst
+    if bursts and len(bursts) % 2 == 0:
+        bursts.pop()
+        devices.pop()
+    return bursts, devices
+
+
+def task_burst_sequence(t: Dict[str,Any]) -> Tuple[List[int], List[str]]:
+    """Alternating CPU/IO bursts of a task; plain tasks are a single CPU burst"""
+    bursts = t.get('bursts') or [t['burst']]
+    devices = list(t.get('devices') or [])
+    devices += [DEFAULT_DEVICE] * (len(bursts) // 2 - len(devices))
+    return bursts, devices
+
+
+# policy name -> (ready-queue key on (task, remaining CPU burst), preemptive, round robin)
+IO_POLICIES = {
+    'FCFS': (lambda t, rem: (), False, False),
+    'SJF (Non-preemptive)': (lambda t, rem: (rem,), False, False),
+    'SJF (Preemptive)': (lambda t, rem: (rem,), True, False),
+    'Priority (Non-preemptive)': (lambda t, rem: (t['priority'],), False, False),
+    'Priority (Preemptive)': (lambda t, rem: (t['priority'],), True, False),
+    'LJF': (lambda t, rem: (-rem,), False, False),
+    'Round Robin': (lambda t, rem: (), False, True),
+}
+
+_EV_ARRIVAL = 0
+_EV_IO_DONE = 1
+
+
+def sched_cpu_io(tasks: List[Dict[str,Any]], algo: str = 'FCFS', quantum: int = 2,
+                 keep_timeline: bool = True, switch_cost: int = 0,
+                 predict: Tuple[float,float] = None) -> Dict[str,Any]:
+    """Event-driven CPU + device-queue simulation of alternating CPU/IO bursts
+
+    predict=(alpha, initial) orders by exponentially averaged CPU-burst estimates
+    instead of the true remaining burst.
+    """
+    key_fn, preemptive, rr = _table_policy(IO_POLICIES, algo, 'with CPU/IO burst sequences')
+    q = max(1, int(quantum))
+
+    by_pid = {t['pid']: t for t in tasks}
+    seqs = {t['pid']: task_burst_sequence(t) for t in tasks}
+    phase = {pid: 0 for pid in by_pid}          # index into the burst sequence
+    rem = {pid: seqs[pid][0][0] for pid in by_pid}
+    if predict:
+        alpha, initial = predict
+        tau = {pid: float(initial) for pid in by_pid}
 
-        if all(bursts[p] == 0 for p in pids):
+    events = [(t['arrival'], _EV_ARRIVAL, i, t['pid']) for i, t in enumerate(tasks)]
+    heapq.heapify(events)
+    ev_seq = len(events)
+
+    ready = []
+    seq = 0
+    ready_since = {}
+    ready_wait = {pid: 0 for pid in by_pid}
+
+    dev_queue = {}       # device -> deque of (pid, length)
+    dev_busy = {}        # device -> busy time
+    dev_free = {}        # device -> True when idle
+
+    timeline = []
+    io_timeline = []
+    first_start = {}
+    completion = {}
+    cpu_busy = 0
+    switches = overhead = 0
+
+    running = None
+    last = None
+    run_start = run_end = 0
+    tcur = 0
+
+    def guess(pid, ran=0):
+        """Remaining CPU burst as the policy sees it"""
+        if not predict:
+            return rem[pid] - ran
+        done = seqs[pid][0][phase[pid]] - rem[pid] + ran
+        return max(0.0, tau[pid] - done)
+
+    def make_ready(pid):
+        nonlocal seq
+        # preemptive policies break ties by arrival like sched_sjf/sched_priority
+        tie = (by_pid[pid]['arrival'], pid) if preemptive else ()
+        heapq.heappush(ready, (key_fn(by_pid[pid], guess(pid)), tie, seq, pid))
+        seq += 1
+        ready_since[pid] = tcur
+
+    def start_io(pid, dev, length):
+        nonlocal ev_seq
+        dev_free[dev] = False
+        dev_busy[dev] = dev_busy.get(dev, 0) + length
+        heapq.heappush(events, (tcur + length, _EV_IO_DONE, ev_seq, pid))
+        ev_seq += 1
+        if keep_timeline:
+            io_timeline.append((pid, dev, tcur, tcur + length))
+
+    def stop_running():
+        nonlocal running, cpu_busy
+        pid = running
+        ran = tcur - run_start
+        if ran > 0:
+            if keep_timeline:
+                timeline.append((pid, run_start, tcur))
+            cpu_busy += ran
+            rem[pid] -= ran
+        running = None
+
+        if rem[pid] > 0:
+            make_ready(pid)
+            return
+
+        # CPU burst done: move to the next IO burst or finish
+        bursts, devices = seqs[pid]
+        if predict:
+            tau[pid] = alpha * bursts[phase[pid]] + (1 - alpha) * tau[pid]
+        phase[pid] += 1
+        if phase[pid] >= len(bursts):
+            completion[pid] = tcur
+            return
+        dev = devices[phase[pid] // 2]
+        length = bursts[phase[pid]]
+        if dev_free.get(dev, True):
+            start_io(pid, dev, length)
+        else:
+            dev_queue.setdefault(dev, deque()).append((pid, length))
+
+    while True:
+        next_ev = events[0][0] if events else None
+
+        if running is not None and (next_ev is None or run_end < next_ev):
+            tcur = run_end
+            stop_running()
+        elif next_ev is not None:
+            tcur = next_ev
+            # drain every event at this instant before dispatching
+            while events and events[0][0] == tcur:
+                _, kind, _, pid = heapq.heappop(events)
+                if kind == _EV_IO_DONE:
+                    _, devices = seqs[pid]
+                    dev = devices[phase[pid] // 2]
+                    phase[pid] += 1
+                    rem[pid] = seqs[pid][0][phase[pid]]
+                    queue = dev_queue.get(dev)
+                    if queue:
+                        nxt, length = queue.popleft()
+                        start_io(nxt, dev, length)
+                    else:
+                        dev_free[dev] = True
+                make_ready(pid)
+
+            # tasks released at a slice boundary queue ahead of the preempted one
+            if running is not None and run_end == tcur:
+                stop_running()
+            elif preemptive and running is not None and ready:
+                cur_key = key_fn(by_pid[running], guess(running, max(0, tcur - run_start)))
+                if ready[0][0] < cur_key:
+                    if tcur >= run_start:
+                        stop_running()
+                    else:
+                        # a switch in progress completes, then yields the CPU
+                        run_end = run_start
+        elif running is None and not ready:
             break
 
-    return merge_segments(timeline)
+        if running is None and ready:
+            pid = heapq.heappop(ready)[-1]
+            run_start = tcur
+            if last is not None and last != pid:
+                switches += 1
+                if switch_cost:
+                    if keep_timeline:
+                        timeline.append((CTX_SWITCH_PID, tcur, tcur + switch_cost))
+                    overhead += switch_cost
+                    run_start += switch_cost
+            # switch-in time counts as waiting, like in compute_metrics
+            ready_wait[pid] += run_start - ready_since.pop(pid)
+            first_start.setdefault(pid, run_start)
+            running = last = pid
+            run_end = run_start + (min(rem[pid], q) if rr else rem[pid])
+        elif running is None and not events:
+            break
+
+    start = min((t['arrival'] for t in tasks), default=0)
+    span = max(1, max(completion.values(), default=0) - start)
+    n = len(completion)
+
+    return {
+        'timeline': merge_segments(timeline),
+        'io_timeline': io_timeline,
+        'start': first_start,
+        'completion': completion,
+        'ready_wait': ready_wait,
+        'stats': {
+            'cpu_busy': cpu_busy,
+            'cpu_util': (cpu_busy + overhead) / span * 100,
+            'effective_util': cpu_busy / span * 100,
+            'switches': switches,
+            'overhead': overhead,
+            'device_util': {d: b / span * 100 for d, b in sorted(dev_busy.items())},
+            'throughput': n / span,
+            'avg_wait': sum(ready_wait[p] for p in completion) / n if n else 0,
+            'avg_tat': sum(completion[p] - by_pid[p]['arrival'] for p in completion) / n if n else 0,
+            'avg_response': sum(first_start[p] - by_pid[p]['arrival'] for p in completion) / n if n else 0,
+            **latency_summary({
+                'wait': [ready_wait[p] for p in completion],
+                'tat': [completion[p] - by_pid[p]['arrival'] for p in completion],
+                'response': [first_start[p] - by_pid[p]['arrival'] for p in completion]
+            })
+        }
+    }
+
+
+# --------------------- Burst Prediction ---------------------
+
+def predict_bursts(tasks: List[Dict[str,Any]], alpha: float = 0.5,
+                   initial: float = 5) -> Dict[int,float]:
+    """Exponential-average burst estimates from each task's burst history
+
+    tau_next = alpha * actual + (1 - alpha) * tau. A task with a CPU/IO burst
+    sequence is predicted burst by burst from its own earlier CPU bursts (the
+    estimate is their sum), and each task continues the history of
+    earlier-arriving tasks with the same name. Without either history every
+    estimate is `initial`; see prediction_history.
+    """
+    alpha = min(1.0, max(0.0, float(alpha)))
+    tau = {}
+    estimates = {}
+    for t in sorted(tasks, key=lambda t: (t['arrival'], t['pid'])):
+        name = t.get('name') or t['pid']
+        guess = tau.get(name, float(initial))
+        total = 0.0
+        for burst in (t.get('bursts') or [t['burst']])[0::2]:
+            total += guess
+            guess = alpha * burst + (1 - alpha) * guess
+        estimates[t['pid']] = total
+        tau[name] = guess
+    return estimates
+
+
+def prediction_history(tasks: List[Dict[str,Any]]) -> int:
+    """Tasks predict_bursts can estimate from history (repeated name or several CPU bursts)"""
+    seen = set()
+    n = 0
+    for t in tasks:
+        name = t.get('name') or t['pid']
+        if name in seen or len(t.get('bursts') or ()) > 1:
+            n += 1
+        seen.add(name)
+    return n
+
+
+_SENSITIVITY_TASKS = None
+
+
+def _init_sensitivity(tasks):
+    global _SENSITIVITY_TASKS
+    _SENSITIVITY_TASKS = tasks
+
+
+def _sensitivity_run(job):
+    """One SJF run with log-normal estimate error (worker side)"""
+    error, seed, preemptive = job
+    tasks = [dict(t) for t in _SENSITIVITY_TASKS]
+    rng = random.Random(seed)
+    estimates = {t['pid']: t['burst'] * rng.lognormvariate(0, error) for t in tasks}
+    m = compute_metrics(tasks, sched_sjf(tasks, preemptive=preemptive, estimates=estimates))
+    return error, m['avg_wait'], m['avg_tat']
+
+
+def prediction_sensitivity(tasks: List[Dict[str,Any]], errors=(0.0, 0.1, 0.25, 0.5, 1.0),
+                           seeds: int = 20, preemptive: bool = False,
+                           workers: int = None) -> List[Dict[str,float]]:
+    """SJF/SRTF metrics vs. prediction error (sigma of a log-normal factor) over many seeds"""
+    tasks = [{k: t[k] for k in ('pid', 'arrival', 'burst', 'priority')} for t in tasks]
+    oracle = compute_metrics([dict(t) for t in tasks], sched_sjf(tasks, preemptive=preemptive))
+    jobs = [(e, seed, preemptive) for e in errors if e > 0 for seed in range(seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_sensitivity,
+                                 initargs=(tasks,)) as pool:
+            results = list(pool.map(_sensitivity_run, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    else:
+        _init_sensitivity(tasks)
+        results = [_sensitivity_run(j) for j in jobs]
+
+    by_error = {}
+    for e, w, tat in results:
+        by_error.setdefault(e, []).append((w, tat))
+    out = []
+    for e in errors:
+        runs = by_error.get(e) or [(oracle['avg_wait'], oracle['avg_tat'])]
+        waits = np.array([w for w, _ in runs])
+        out.append({
+            'error': e,
+            'avg_wait': float(waits.mean()),
+            'avg_wait_std': float(waits.std()),
+            'avg_tat': float(np.mean([tat for _, tat in runs])),
+            'vs_oracle': float(waits.mean() / oracle['avg_wait']) if oracle['avg_wait'] else 1.0
+        })
+    return out
 
 
 # --------------------- Apply Timeline ---------------------
 
 def apply_timeline(tasks: List[Dict[str,Any]], timeline: List[Tuple[int,int,int]]):
     """Update task stats"""
+    index = {}
     for t in tasks:
         t['start'] = None
         t['completion'] = None
         t['waiting_time'] = None
         t['turnaround'] = None
+        t['response'] = None
         t['status'] = 'Waiting'
+        index.setdefault(t['pid'], []).append(t)
 
     for pid, s, e in timeline:
-        for t in tasks:
-            if t['pid'] == pid:
-                if t['start'] is None:
-                    t['start'] = s
-                t['completion'] = e
-                t['status'] = 'Completed'
+        for t in index.get(pid, ()):
+            if t['start'] is None:
+                t['start'] = s
+            t['completion'] = e
+            t['status'] = 'Completed'
 
     for t in tasks:
         if t['start'] is not None:
             t['waiting_time'] = t['completion'] - t['arrival'] - t['burst']
             t['turnaround'] = t['completion'] - t['arrival']
+            t['response'] = t['start'] - t['arrival']
+
+
+# --------------------- Latency Percentiles ---------------------
+
+PERCENTILES = (50, 95, 99)
+
+
+def latency_summary(series: Dict[str, Any]) -> Dict[str, float]:
+    """Exact p50/p95/p99 per latency series (lists or float arrays)"""
+    out = {}
+    for name, values in series.items():
+        values = np.asarray(values, dtype=np.float64)
+        qs = np.percentile(values, PERCENTILES).tolist() if values.size else [0.0] * len(PERCENTILES)
+        for p, v in zip(PERCENTILES, qs):
+            out[f'p{p}_{name}'] = v
+    return out
 
 
 # --------------------- Compute Metrics ---------------------
 
-def compute_metrics(tasks: List[Dict[str,Any]], timeline: List[Tuple[int,int,int]]):
-    """Calculate scheduling metrics"""
+def compute_metrics(tasks: List[Dict[str,Any]], timeline: List[Tuple[int,int,int]], cores: int = 1):
+    """Calculate scheduling metrics (utilization is averaged over `cores` CPUs)"""
     apply_timeline(tasks, timeline)
     done = [t for t in tasks if t['start'] is not None]
     n = len(done)
 
     total_wait = sum(t['waiting_time'] for t in done) if n else 0
     total_tat = sum(t['turnaround'] for t in done) if n else 0
+    total_resp = sum(t['response'] for t in done) if n else 0
 
     timeline_start = min((s for (_, s, _) in timeline), default=0)
     timeline_end = max((e for (_, _, e) in timeline), default=0)
 
-    total_exec = sum((e - s) for (_, s, e) in timeline)
+    switches, overhead = context_switches(timeline, cores)
+    total_exec = sum((e - s) for (_, s, e) in timeline) - overhead
     total_time = max(1, timeline_end - timeline_start)
+    capacity = total_time * max(1, cores)
 
-    cpu_util = (total_exec / total_time) * 100
+    # cpu_util counts switch overhead as busy time, effective_util only useful work
+    cpu_util = ((total_exec + overhead) / capacity) * 100
     avg_wait = total_wait / n if n else 0
     avg_tat = total_tat / n if n else 0
+    avg_resp = total_resp / n if n else 0
     throughput = n / total_time
 
-    return {
+    metrics = {
         'avg_wait': avg_wait,
         'avg_tat': avg_tat,
+        'avg_response': avg_resp,
         'cpu_util': cpu_util,
+        'effective_util': (total_exec / capacity) * 100,
         'throughput': throughput,
-        'total_exec': total_exec
+        'total_exec': total_exec,
+        'switches': switches,
+        'overhead': overhead
     }
+    # float arrays, not lists of Python numbers: 8 bytes per task per series
+    metrics.update(latency_summary({
+        'wait': np.fromiter((t['waiting_time'] for t in done), np.float64, n),
+        'tat': np.fromiter((t['turnaround'] for t in done), np.float64, n),
+        'response': np.fromiter((t['response'] for t in done), np.float64, n),
+    }))
+    return metrics
+
+
+# --------------------- Check Observers ---------------------
+
+# callables (check, outcome) told about every deadlock / Banker's check, e.g. a metrics exporter
+CHECK_OBSERVERS: List[Callable[[str,str],None]] = []
+
+
+def notify_check(check: str, outcome: str):
+    for fn in CHECK_OBSERVERS:
+        fn(check, outcome)
+
+
+def observed_check(check: str, outcomes: Tuple[str,str]):
+    """Decorator reporting each call as outcomes[False] / outcomes[True] (by the bool, or a tuple's first item)"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            result = fn(*args, **kwargs)
+            if CHECK_OBSERVERS:
+                notify_check(check, outcomes[bool(result[0] if isinstance(result, tuple) else result)])
+            return result
+        return wrapper
+    return deco
 
 
 # --------------------- Deadlock Detection ---------------------
 
+@observed_check('hold_wait', ('clear', 'deadlock'))
 def detect_deadlock_from_hold_wait(tasks: List[Dict[str,Any]]) -> Tuple[bool, List[int]]:
     """Detect cycle in Wait-For graph"""
     holders = {}
@@ -375,10 +1735,181 @@ def detect_deadlock_from_hold_wait(tasks: List[Dict[str,Any]]) -> Tuple[bool, Li
     return False, []
 
 
+def wait_for_edges(tasks: List[Dict[str,Any]]) -> List[Tuple[int,int]]:
+    """Wait-For graph edges (waiter, holder)"""
+    holders = {}
+    for t in tasks:
+        h = (t.get('holding') or '').strip()
+        if h:
+            holders.setdefault(h, []).append(t['pid'])
+
+    edges = []
+    for t in tasks:
+        w = (t.get('waiting') or '').strip()
+        if w:
+            for owner in holders.get(w, []):
+                if owner != t['pid']:
+                    edges.append((t['pid'], owner))
+    return edges
+
+
+def strongly_connected_components(nodes, edges) -> List[List[int]]:
+    """Tarjan's SCC (iterative, safe for large graphs)"""
+    graph = {u: [] for u in nodes}
+    for a, b in edges:
+        graph.setdefault(a, []).append(b)
+        graph.setdefault(b, [])
+
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    comps = []
+    counter = 0
+
+    for root in graph:
+        if root in index:
+            continue
+        work = [(root, iter(graph[root]))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            u, it = work[-1]
+            advanced = False
+            for v in it:
+                if v not in index:
+                    index[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack.add(v)
+                    work.append((v, iter(graph[v])))
+                    advanced = True
+                    break
+                if v in on_stack:
+                    low[u] = min(low[u], index[v])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[u])
+            if low[u] == index[u]:
+                comp = []
+                while True:
+                    w = stack.pop()
+                    on_stack.discard(w)
+                    comp.append(w)
+                    if w == u:
+                        break
+                comps.append(comp)
+
+    return comps
+
+
+# --------------------- Multi-Instance Deadlock Detection ---------------------
+
+def parse_resource_counts(text: str) -> Dict[str,int]:
+    """Parse 'R1:2;R2:1' (or 'R1=2,R2') into a resource count dict"""
+    counts = {}
+    for part in (text or '').replace(',', ';').split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        if ':' in part or '=' in part:
+            name, qty = part.replace('=', ':').split(':', 1)
+            qty = int(qty.strip() or 0)
+        else:
+            name, qty = part, 1
+        name = name.strip()
+        if name and qty > 0:
+            counts[name] = counts.get(name, 0) + qty
+    return counts
+
+
+def format_resource_counts(counts: Dict[str,int]) -> str:
+    """Inverse of parse_resource_counts"""
+    return ';'.join(f"{r}:{q}" for r, q in counts.items() if q)
+
+
+def _resource_vector(t: Dict[str,Any], key: str, single_key: str) -> Dict[str,int]:
+    """Multi-instance counts of a task, falling back to the single holding/waiting string"""
+    counts = t.get(key)
+    if counts:
+        return counts
+    r = (t.get(single_key) or '').strip()
+    return {r: 1} if r else {}
+
+
+def build_resource_matrices(tasks: List[Dict[str,Any]], available: Dict[str,int]):
+    """Build (pids, resources, Available, Allocation, Request) arrays"""
+    allocs = [_resource_vector(t, 'allocation', 'holding') for t in tasks]
+    reqs = [_resource_vector(t, 'request', 'waiting') for t in tasks]
+
+    resources = list(available.keys())
+    index = {r: j for j, r in enumerate(resources)}
+    for counts in allocs + reqs:
+        for r in counts:
+            if r not in index:
+                index[r] = len(resources)
+                resources.append(r)
+
+    n, m = len(tasks), len(resources)
+    avail = np.zeros(m, dtype=np.int64)
+    for r, q in available.items():
+        avail[index[r]] = q
+
+    alloc = np.zeros((n, m), dtype=np.int64)
+    req = np.zeros((n, m), dtype=np.int64)
+    for i, (a, q) in enumerate(zip(allocs, reqs)):
+        for r, v in a.items():
+            alloc[i, index[r]] = v
+        for r, v in q.items():
+            req[i, index[r]] = v
+
+    pids = np.array([t['pid'] for t in tasks], dtype=np.int64)
+    return pids, resources, avail, alloc, req
+
+
+def detect_deadlock_matrix_arrays(available, allocation, request):
+    """Matrix detection algorithm; returns a bool mask of deadlocked rows"""
+    work = np.asarray(available, dtype=np.int64).copy()
+    allocation = np.asarray(allocation, dtype=np.int64)
+    request = np.asarray(request, dtype=np.int64)
+
+    # processes holding nothing can never be part of a deadlock
+    finish = ~allocation.any(axis=1)
+
+    while True:
+        # every unfinished process whose request fits finishes in the same pass;
+        # releases only grow Work, so the order inside a pass does not matter
+        runnable = ~finish & (request <= work).all(axis=1)
+        if not runnable.any():
+            break
+        work += allocation[runnable].sum(axis=0)
+        finish |= runnable
+
+    return ~finish
+
+
+@observed_check('matrix', ('clear', 'deadlock'))
+def detect_deadlock_matrix(tasks: List[Dict[str,Any]],
+                           available: Dict[str,int]) -> Tuple[bool, List[int]]:
+    """Multi-instance, multi-resource deadlock detection (Available/Allocation/Request)"""
+    if not tasks:
+        return False, []
+    pids, _, avail, alloc, req = build_resource_matrices(tasks, available)
+    deadlocked = detect_deadlock_matrix_arrays(avail, alloc, req)
+    stuck = pids[deadlocked].tolist()
+    return bool(stuck), stuck
+
+
 # --------------------- Banker's Algorithm ---------------------
 
-def is_safe_state(processes: List[Dict[str,Any]], available: Dict[str,int]) -> bool:
-    """Check safe state"""
+def _safe_state(processes: List[Dict[str,Any]], available: Dict[str,int]) -> bool:
     resource_types = list(available.keys())
     work = available.copy()
     finish = {p['pid']: False for p in processes}
@@ -413,6 +1944,13 @@ def is_safe_state(processes: List[Dict[str,Any]], available: Dict[str,int]) -> b
     return True
 
 
+@observed_check('bankers_safety', ('unsafe', 'safe'))
+def is_safe_state(processes: List[Dict[str,Any]], available: Dict[str,int]) -> bool:
+    """Check safe state"""
+    return _safe_state(processes, available)
+
+
+@observed_check('bankers_request', ('denied', 'granted'))
 def request_resources(processes: List[Dict[str,Any]], available: Dict[str,int],
                        pid: int, request: Dict[str,int]) -> Tuple[bool, str]:
     """Process resource request"""
@@ -443,8 +1981,8 @@ def request_resources(processes: List[Dict[str,Any]], available: Dict[str,int],
         temp_av[r] -= qty
         tp['allocation'][r] = tp['allocation'].get(r, 0) + qty
 
-    # Check safe state
-    if is_safe_state(temp_proc, temp_av):
+    # Check safe state (counted as part of this request, not as a check of its own)
+    if _safe_state(temp_proc, temp_av):
         for r, qty in request.items():
             available[r] -= qty
             process['allocation'] = process.get('allocation', {})
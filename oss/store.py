@@ -0,0 +1,395 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Tuple, Any, Iterator, Optional
+
+import workload_io as wio
+
+# override with the SMART_SCHEDULER_DB environment variable
+DEFAULT_DB = os.path.join(os.path.expanduser('~'), '.smart_scheduler', 'scheduler.db')
+
+# rows per executemany batch / per loaded chunk
+CHUNK = 50_000
+
+# runs kept per workload by the GUI's run history (oldest pruned first)
+RUNS_KEPT = 50
+
+# optional task fields kept as one JSON column
+_EXTRA_FIELDS = ('allocation', 'request', 'resource_ops', 'bursts', 'devices')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS workloads (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL,
+    fingerprint TEXT NOT NULL UNIQUE,
+    n_tasks     INTEGER NOT NULL DEFAULT 0,
+    source      TEXT,
+    created     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS workloads_name ON workloads(name);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    workload_id INTEGER NOT NULL REFERENCES workloads(id) ON DELETE CASCADE,
+    pid         INTEGER NOT NULL,
+    name        TEXT,
+    arrival     INTEGER NOT NULL,
+    burst       INTEGER NOT NULL,
+    priority    INTEGER NOT NULL,
+    holding     TEXT,
+    waiting     TEXT,
+    deadline    INTEGER,
+    period      INTEGER,
+    grp         TEXT,
+    extra       TEXT,
+    PRIMARY KEY (workload_id, pid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tasks_arrival ON tasks(workload_id, arrival, pid);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    workload_id INTEGER NOT NULL REFERENCES workloads(id) ON DELETE CASCADE,
+    algo        TEXT NOT NULL,
+    config      TEXT,
+    switch_cost INTEGER NOT NULL DEFAULT 0,
+    cores       INTEGER NOT NULL DEFAULT 1,
+    details     TEXT,
+    created     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_workload_algo ON runs(workload_id, algo);
+
+CREATE TABLE IF NOT EXISTS segments (
+    run_id  INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    pid     INTEGER NOT NULL,
+    start   INTEGER NOT NULL,
+    "end"   INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_run_start ON segments(run_id, start);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id  INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name    TEXT NOT NULL,
+    value   REAL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metrics_name ON metrics(name, value);
+
+CREATE TABLE IF NOT EXISTS settings (
+    key     TEXT PRIMARY KEY,
+    value   TEXT
+);
+'''
+
+
+# --------------------- Row Conversion ---------------------
+
+def _task_row(wid: int, t: Dict[str,Any]) -> tuple:
+    extra = {k: t[k] for k in _EXTRA_FIELDS if t.get(k)}
+    return (wid, t['pid'], t.get('name'), t['arrival'], t['burst'], t.get('priority', 0),
+            t.get('holding', ''), t.get('waiting', ''), t.get('deadline'), t.get('period'),
+            t.get('group') or '', json.dumps(extra) if extra else None)
+
+
+def _row_task(row: tuple) -> Dict[str,Any]:
+    pid, name, arrival, burst, priority, holding, waiting, deadline, period, grp, extra = row
+    t = {
+        'pid': pid, 'name': name, 'arrival': arrival, 'burst': burst, 'priority': priority,
+        'holding': holding or '', 'waiting': waiting or '', 'deadline': deadline,
+        'period': period, 'group': grp or ''
+    }
+    if extra:
+        t.update(json.loads(extra))
+        if 'resource_ops' in t:
+            t['resource_ops'] = [tuple(op) for op in t['resource_ops']]
+    return t
+
+
+def _hash_rows(h, rows: List[tuple]):
+    # one update per CHUNK rows; the workload id column is left out
+    h.update(repr([r[1:] for r in rows]).encode())
+
+
+def fingerprint(tasks: List[Dict[str,Any]]) -> str:
+    """Content hash of a task set (same tasks, same workload row)"""
+    h = hashlib.sha1()
+    for i in range(0, len(tasks), CHUNK):
+        _hash_rows(h, [_task_row(0, t) for t in tasks[i:i + CHUNK]])
+    return h.hexdigest()
+
+
+# --------------------- Store ---------------------
+
+class WorkloadStore:
+    """SQLite store for task sets, runs, timelines and metrics"""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.environ.get('SMART_SCHEDULER_DB') or DEFAULT_DB
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.execute('PRAGMA journal_mode = WAL')
+        self.db.execute('PRAGMA synchronous = NORMAL')
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----- workloads -----
+
+    def save_workload(self, name: str, tasks: List[Dict[str,Any]], source: str = None,
+                      fp: str = None) -> int:
+        """Store a task set in one transaction; an identical set returns its existing id
+
+        Pass `fp` when fingerprint(tasks) is already known to skip hashing.
+        """
+        fp = fp or fingerprint(tasks)
+        row = self.db.execute('SELECT id FROM workloads WHERE fingerprint = ?', (fp,)).fetchone()
+        if row:
+            return row[0]
+        with self.db:
+            wid = self.db.execute(
+                'INSERT INTO workloads (name, fingerprint, n_tasks, source, created) VALUES (?,?,?,?,?)',
+                (name, fp, len(tasks), source, time.time())).lastrowid
+            for i in range(0, len(tasks), CHUNK):
+                self.db.executemany('INSERT INTO tasks VALUES (?,?,?,?,?,?,?,?,?,?,?,?)',
+                                    [_task_row(wid, t) for t in tasks[i:i + CHUNK]])
+        return wid
+
+    def import_csv(self, path: str, name: str = None) -> int:
+        """Stream a Task Manager CSV into a new workload, CHUNK rows per insert"""
+        h = hashlib.sha1()
+        with self.db:
+            # placeholder fingerprint until the whole file is hashed
+            wid = self.db.execute(
+                'INSERT INTO workloads (name, fingerprint, source, created) VALUES (?,?,?,?)',
+                (name or os.path.basename(path), f'pending:{time.time()}', path, time.time())).lastrowid
+            n = 0
+            # file-ordered chunks from the parallel parser, re-cut to CHUNK rows
+            pending = []
+            for columns, extras in wio.iter_csv_chunks(path):
+                tasks = wio.chunk_tasks(columns, extras, n + len(pending) + 1)
+                pending.extend(_task_row(wid, t) for t in tasks)
+                while len(pending) >= CHUNK:
+                    batch, pending = pending[:CHUNK], pending[CHUNK:]
+                    _hash_rows(h, batch)
+                    self.db.executemany('INSERT INTO tasks VALUES (?,?,?,?,?,?,?,?,?,?,?,?)', batch)
+                    n += len(batch)
+            if pending:
+                _hash_rows(h, pending)
+                self.db.executemany('INSERT INTO tasks VALUES (?,?,?,?,?,?,?,?,?,?,?,?)', pending)
+                n += len(pending)
+
+            fp = h.hexdigest()
+            dup = self.db.execute('SELECT id FROM workloads WHERE fingerprint = ?', (fp,)).fetchone()
+            if dup:
+                # already stored: drop the copy (tasks cascade)
+                self.db.execute('DELETE FROM workloads WHERE id = ?', (wid,))
+                return dup[0]
+            self.db.execute('UPDATE workloads SET fingerprint = ?, n_tasks = ? WHERE id = ?', (fp, n, wid))
+        return wid
+
+    def workloads(self) -> List[Dict[str,Any]]:
+        cur = self.db.execute(
+            'SELECT id, name, n_tasks, source, created, '
+            '(SELECT COUNT(*) FROM runs WHERE runs.workload_id = workloads.id) FROM workloads ORDER BY id')
+        return [dict(zip(('id', 'name', 'n_tasks', 'source', 'created', 'runs'), r)) for r in cur]
+
+    def workload_id(self, ref) -> Optional[int]:
+        """Id for an id or name (latest workload with that name)"""
+        if str(ref).isdigit():
+            row = self.db.execute('SELECT id FROM workloads WHERE id = ?', (int(ref),)).fetchone()
+        else:
+            row = self.db.execute('SELECT id FROM workloads WHERE name = ? ORDER BY id DESC LIMIT 1',
+                                  (ref,)).fetchone()
+        return row[0] if row else None
+
+    def iter_tasks(self, workload_id: int, chunk: int = CHUNK) -> Iterator[List[Dict[str,Any]]]:
+        """Task dicts in (arrival, pid) order, `chunk` at a time (keyset pagination)"""
+        cols = 'pid, name, arrival, burst, priority, holding, waiting, deadline, period, grp, extra'
+        after = (-1, -1)
+        while True:
+            rows = self.db.execute(
+                f'SELECT {cols} FROM tasks WHERE workload_id = ? AND (arrival, pid) > (?, ?) '
+                f'ORDER BY arrival, pid LIMIT ?', (workload_id, *after, chunk)).fetchall()
+            if not rows:
+                return
+            yield [_row_task(r) for r in rows]
+            after = (rows[-1][2], rows[-1][0])
+
+    def load_tasks(self, workload_id: int) -> List[Dict[str,Any]]:
+        tasks = []
+        for block in self.iter_tasks(workload_id):
+            tasks.extend(block)
+        return tasks
+
+    def delete_workload(self, workload_id: int):
+        with self.db:
+            self.db.execute('DELETE FROM workloads WHERE id = ?', (workload_id,))
+
+    # ----- runs -----
+
+    def save_run(self, workload_id: int, algo: str, timeline: List[Tuple[int,int,int]],
+                 metrics: Dict[str,Any], config: Dict[str,Any] = None,
+                 switch_cost: int = 0, cores: int = 1, keep: int = None) -> int:
+        """Store a run: numeric metrics as rows, nested results as JSON details
+
+        With `keep`, only the newest `keep` runs of the workload survive.
+        """
+        scalars = {k: float(v) for k, v in metrics.items()
+                   if isinstance(v, (int, float)) and not isinstance(v, bool)}
+        details = {k: v for k, v in metrics.items() if k not in scalars}
+        with self.db:
+            rid = self.db.execute(
+                'INSERT INTO runs (workload_id, algo, config, switch_cost, cores, details, created) '
+                'VALUES (?,?,?,?,?,?,?)',
+                (workload_id, algo, json.dumps(config or {}, default=str), switch_cost, cores,
+                 json.dumps(details, default=str) if details else None, time.time())).lastrowid
+            for i in range(0, len(timeline), CHUNK):
+                self.db.executemany('INSERT INTO segments VALUES (?,?,?,?)',
+                                    [(rid, p, s, e) for p, s, e in timeline[i:i + CHUNK]])
+            self.db.executemany('INSERT INTO metrics VALUES (?,?,?)',
+                                [(rid, k, v) for k, v in scalars.items()])
+            if keep is not None:
+                self._prune_runs(workload_id, keep)
+        return rid
+
+    def _prune_runs(self, workload_id: int, keep: int):
+        # segments and metrics cascade
+        self.db.execute('DELETE FROM runs WHERE workload_id = ? AND id NOT IN '
+                        '(SELECT id FROM runs WHERE workload_id = ? ORDER BY id DESC LIMIT ?)',
+                        (workload_id, workload_id, max(0, keep)))
+
+    def runs(self, workload_id: int = None, algo: str = None,
+             run_id: int = None) -> List[Dict[str,Any]]:
+        """Runs (newest first) with their metrics, optionally filtered"""
+        where, args = [], []
+        if run_id is not None:
+            where.append('id = ?')
+            args.append(run_id)
+        if workload_id is not None:
+            where.append('workload_id = ?')
+            args.append(workload_id)
+        if algo is not None:
+            where.append('algo = ?')
+            args.append(algo)
+        cond = ' WHERE ' + ' AND '.join(where) if where else ''
+        out = {}
+        for rid, wid, name, config, cost, cores, created in self.db.execute(
+                'SELECT id, workload_id, algo, config, switch_cost, cores, created FROM runs'
+                + cond + ' ORDER BY id DESC', args):
+            out[rid] = {
+                'id': rid, 'workload_id': wid, 'algo': name, 'config': json.loads(config or '{}'),
+                'switch_cost': cost, 'cores': cores, 'created': created, 'metrics': {}
+            }
+        for rid, name, value in self.db.execute(
+                'SELECT run_id, name, value FROM metrics WHERE run_id IN (SELECT id FROM runs' + cond + ')',
+                args):
+            out[rid]['metrics'][name] = value
+        return list(out.values())
+
+    def iter_timeline(self, run_id: int, start: int = None, end: int = None) -> Iterator[Tuple[int,int,int]]:
+        """A run's segments in start order, streamed from the database"""
+        sql = 'SELECT pid, start, "end" FROM segments WHERE run_id = ?'
+        args = [run_id]
+        if end is not None:
+            sql += ' AND start < ?'
+            args.append(end)
+        if start is not None:
+            sql += ' AND "end" > ?'
+            args.append(start)
+        return self.db.execute(sql + ' ORDER BY start', args)
+
+    def load_timeline(self, run_id: int, start: int = None, end: int = None) -> List[Tuple[int,int,int]]:
+        """A run's segments, optionally only those overlapping [start, end)"""
+        return self.iter_timeline(run_id, start, end).fetchall()
+
+    # ----- session settings -----
+
+    def get_setting(self, key: str, default=None):
+        row = self.db.execute('SELECT value FROM settings WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_setting(self, key: str, value):
+        with self.db:
+            self.db.execute('INSERT OR REPLACE INTO settings VALUES (?, ?)', (key, json.dumps(value)))
+
+
+# --------------------- Background Run Recorder ---------------------
+
+class RunRecorder:
+    """Saves runs on a worker thread with its own connection
+
+    record() only queues the run, so the caller (the Tk thread) never waits
+    on SQLite. Each workload keeps its newest `keep` runs. Failures are kept
+    for the caller to report via errors(); a full queue drops the run and
+    counts as a failure too.
+    """
+
+    def __init__(self, path: str, keep: int = RUNS_KEPT, max_pending: int = 64):
+        self.path = path
+        self.keep = keep
+        self._queue = queue.Queue(max_pending)
+        self._errors = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def record(self, workload: str, tasks: List[Dict[str,Any]], fp: str, algo: str,
+               timeline: List[Tuple[int,int,int]], metrics: Dict[str,Any],
+               config: Dict[str,Any] = None, switch_cost: int = 0, cores: int = 1):
+        """Queue a run (and its task set, stored once per fingerprint)"""
+        try:
+            self._queue.put_nowait((workload, tasks, fp, algo, timeline, metrics, config,
+                                    switch_cost, cores))
+        except queue.Full:
+            self._fail(f'run history is {self._queue.maxsize} runs behind; {algo} run not saved')
+
+    def errors(self) -> List[str]:
+        """Failures since the last call"""
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+
+    def close(self, timeout: float = None):
+        """Save what is queued, then stop the worker"""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _fail(self, message: str):
+        with self._lock:
+            self._errors.append(message)
+
+    def _work(self):
+        try:
+            store = WorkloadStore(self.path)
+        except Exception as e:
+            self._fail(f'cannot open {self.path}: {e}')
+            store = None
+        wids = {}           # fingerprint -> workload id
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            if store is None:
+                continue
+            workload, tasks, fp, algo, timeline, metrics, config, switch_cost, cores = job
+            try:
+                if fp not in wids:
+                    wids[fp] = store.save_workload(workload, tasks, fp=fp)
+                store.save_run(wids[fp], algo, timeline, metrics, config, switch_cost, cores,
+                               keep=self.keep)
+            except Exception as e:
+                wids.pop(fp, None)
+                self._fail(f'{algo} run not saved: {e}')
+        if store is not None:
+            store.close()
@@ -0,0 +1,187 @@
+import bisect
+import heapq
+from typing import List, Dict, Tuple, Any, Union
+
+import numpy as np
+
+import scheduling_logic as sl
+
+# --------------------- Timeline Index ---------------------
+
+def _busy_before(x, starts, start_cum, ends, end_cum):
+    """Time covered by [start, end) intervals before x (scalar or array)
+
+    With S = #starts <= x and E = #ends <= x, the covered time is
+    x*(S - E) + sum(ends <= x) - sum(starts <= x), so two sorted arrays and
+    their prefix sums answer it with binary searches.
+    """
+    S = np.searchsorted(starts, x, side='right')
+    E = np.searchsorted(ends, x, side='right')
+    return x * (S - E) + end_cum[E] - start_cum[S]
+
+
+class TimelineIndex:
+    """Sorted-array index over a (pid, start, end) timeline
+
+    Busy time and the occupancy of one pid in any window take a few binary
+    searches over sorted starts / ends with prefix sums; "running at t" takes
+    a binary search per CPU lane, and the occupancy of every pid two per lane
+    to find the segments overlapping the window (segments are packed into non-overlapping lanes, one
+    per CPU for multi-core timelines). Switch-overhead segments count as busy
+    and are reported under CTX_SWITCH_PID.
+    """
+
+    def __init__(self, timeline: List[Tuple[int,int,int]]):
+        seg = np.asarray(timeline, dtype=np.int64).reshape(-1, 3)
+        seg = seg[seg[:, 2] > seg[:, 1]]
+        seg = seg[np.argsort(seg[:, 1], kind='stable')]
+        self.pids, self.starts, self.ends = seg[:, 0], seg[:, 1], seg[:, 2]
+        self._tables = self._build(self.starts, self.ends)
+        self.start = int(self.starts[0]) if len(seg) else 0
+        self.end = int(self.ends.max()) if len(seg) else 0
+
+        # per-pid tables over contiguous slices of a (pid, start) ordering
+        order = np.lexsort((self.starts, self.pids))
+        pids = self.pids[order]
+        self._pid_starts = self.starts[order]
+        self._pid_ends = self.ends[order]
+        uniq, first = np.unique(pids, return_index=True)
+        bounds = np.append(first, len(pids))
+        self._pid_slices = {int(p): (int(a), int(b)) for p, a, b in zip(uniq, bounds[:-1], bounds[1:])}
+        self._pid_tables = {}
+
+        self._lanes = None
+        self._lane_idx = None
+
+    @staticmethod
+    def _build(starts, ends):
+        ends = np.sort(ends)
+        zero = np.zeros(1, dtype=np.int64)
+        return starts, np.concatenate([zero, np.cumsum(starts)]), ends, np.concatenate([zero, np.cumsum(ends)])
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def lanes(self) -> List[Tuple[List[int],List[int],List[int]]]:
+        """(starts, ends, segment indexes) per lane, built on first use"""
+        if self._lanes is None:
+            # greedy interval partitioning: reuse the lane that frees up first
+            self._lanes = []
+            free = []       # (end, lane)
+            for i, (s, e) in enumerate(zip(self.starts.tolist(), self.ends.tolist())):
+                if free and free[0][0] <= s:
+                    _, lane = heapq.heappop(free)
+                else:
+                    lane = len(self._lanes)
+                    self._lanes.append(([], [], []))
+                starts, ends, idx = self._lanes[lane]
+                starts.append(s)
+                ends.append(e)
+                idx.append(i)
+                heapq.heappush(free, (e, lane))
+        return self._lanes
+
+    @property
+    def cores(self) -> int:
+        """Most segments overlapping at any instant"""
+        return len(self.lanes)
+
+    # ----- point queries -----
+
+    def segments_at(self, t: float) -> List[Tuple[int,int,int]]:
+        """(pid, start, end) of every segment covering t"""
+        out = []
+        for starts, ends, idx in self.lanes:
+            j = bisect.bisect_right(starts, t) - 1
+            if j >= 0 and t < ends[j]:
+                i = idx[j]
+                out.append((int(self.pids[i]), starts[j], ends[j]))
+        return out
+
+    def running_at(self, t: float) -> List[int]:
+        """PIDs on a CPU at time t (CTX_SWITCH_PID while a switch is charged)"""
+        return [pid for pid, _, _ in self.segments_at(t)]
+
+    # ----- window queries -----
+
+    def _overlapping(self, lo, hi) -> np.ndarray:
+        """Indexes of the segments overlapping [lo, hi)"""
+        if self._lane_idx is None:
+            self._lane_idx = [np.asarray(idx, dtype=np.int64) for _, _, idx in self.lanes]
+        parts = []
+        # a lane's segments don't overlap, so its ends are sorted too
+        for (starts, ends, _), idx in zip(self.lanes, self._lane_idx):
+            a = bisect.bisect_right(ends, lo)
+            b = bisect.bisect_left(starts, hi, a)
+            if a < b:
+                parts.append(idx[a:b])
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    def busy_before(self, x):
+        """CPU time used before x, summed over CPUs (x may be an array)"""
+        return _busy_before(x, *self._tables)
+
+    def busy(self, lo: int = None, hi: int = None) -> int:
+        """CPU time used in [lo, hi), summed over CPUs (overhead included)"""
+        lo = self.start if lo is None else lo
+        hi = self.end if hi is None else hi
+        return int(self.busy_before(hi) - self.busy_before(lo)) if hi > lo else 0
+
+    def utilization(self, lo: int = None, hi: int = None, cores: int = None) -> float:
+        """Busy percentage of `cores` CPUs (default: the lane count) over [lo, hi)"""
+        lo = self.start if lo is None else lo
+        hi = self.end if hi is None else hi
+        cores = cores or max(1, self.cores)
+        return 100 * self.busy(lo, hi) / (max(1, hi - lo) * cores)
+
+    def _pid_table(self, pid: int):
+        if pid not in self._pid_tables:
+            a, b = self._pid_slices[pid]
+            self._pid_tables[pid] = self._build(self._pid_starts[a:b], self._pid_ends[a:b])
+        return self._pid_tables[pid]
+
+    def occupancy(self, lo: int = None, hi: int = None,
+                  pid: int = None) -> Union[int,Dict[int,int]]:
+        """CPU time of `pid` in [lo, hi), or of every pid present as a dict"""
+        lo = self.start if lo is None else lo
+        hi = self.end if hi is None else hi
+        if pid is not None:
+            if pid not in self._pid_slices or hi <= lo:
+                return 0
+            table = self._pid_table(pid)
+            return int(_busy_before(hi, *table) - _busy_before(lo, *table))
+        i = self._overlapping(lo, hi)
+        ran = np.minimum(self.ends[i], hi) - np.maximum(self.starts[i], lo)
+        pids, which = np.unique(self.pids[i], return_inverse=True)
+        totals = np.bincount(which, weights=ran, minlength=len(pids))
+        return {int(p): int(v) for p, v in zip(pids, totals) if v}
+
+    def windows(self, width: float, lo: int = None, hi: int = None,
+                cores: int = None) -> Dict[str,np.ndarray]:
+        """Utilization (%) of consecutive `width`-long windows over [lo, hi), in one vectorized pass"""
+        lo = self.start if lo is None else lo
+        hi = self.end if hi is None else hi
+        cores = cores or max(1, self.cores)
+        edges = np.append(np.arange(lo, hi, width, dtype=np.float64), hi)
+        if len(edges) < 2:
+            edges = np.array([lo, lo + width], dtype=np.float64)
+        busy = np.diff(self.busy_before(edges))
+        return {'start': edges[:-1], 'util': 100 * busy / (np.diff(edges) * cores)}
+
+    def window(self, lo: int = None, hi: int = None, cores: int = None) -> Dict[str,Any]:
+        """Busy / idle time, utilization and per-pid occupancy of [lo, hi)"""
+        lo = self.start if lo is None else lo
+        hi = self.end if hi is None else hi
+        cores = cores or max(1, self.cores)
+        busy = self.busy(lo, hi)
+        occ = self.occupancy(lo, hi)
+        return {
+            'start': lo,
+            'end': hi,
+            'busy': busy,
+            'overhead': occ.pop(sl.CTX_SWITCH_PID, 0),
+            'idle': max(0, hi - lo) * cores - busy,
+            'utilization': self.utilization(lo, hi, cores),
+            'occupancy': occ,
+        }
@@ -0,0 +1,159 @@
+import gzip
+import heapq
+import json
+from typing import List, Dict, Tuple, Any, Iterable
+
+import scheduling_logic as sl
+
+# --------------------- Chrome Trace Events ---------------------
+
+# track of engine events that don't belong to a CPU
+EVENTS_TID = 0
+
+
+class ChromeTraceWriter:
+    """Streaming writer for Chrome Trace Event JSON (chrome://tracing, ui.perfetto.dev)
+
+    Events go straight to the file as they are added, so memory stays flat
+    however long the trace. Times are ticks of `tick` seconds. Segments given
+    without a CPU are packed onto CPU tracks greedily, which needs them in
+    start order (as simulate() and the store return them). A path ending in
+    .gz is gzip-compressed.
+    """
+
+    def __init__(self, out, tick: float = 1e-3, process: str = 'Scheduler',
+                 names: Dict[int,str] = None):
+        if isinstance(out, str):
+            self.f = gzip.open(out, 'wt', compresslevel=6, encoding='utf-8') if out.endswith('.gz') else open(out, 'w', encoding='utf-8')
+            self._own = True
+        else:
+            self.f = out
+            self._own = False
+        self.us = tick * 1e6
+        self.count = 0
+        self._names = {}                # pid -> JSON-encoded segment name
+        self._given = names or {}
+        self._free = []                 # heap of (end, cpu) for greedy packing
+        self._cpus = 0
+        self.f.write('{"displayTimeUnit":"ms","traceEvents":[\n')
+        self._emit({'name': 'process_name', 'ph': 'M', 'pid': 1, 'args': {'name': process}})
+        self._emit({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': EVENTS_TID, 'args': {'name': 'Events'}})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _emit(self, event):
+        self._write(json.dumps(event, separators=(',', ':')))
+
+    def _write(self, text: str):
+        self.f.write(',\n' + text if self.count else text)
+        self.count += 1
+
+    def _track(self, cpu: int) -> int:
+        # CPU tracks are named on first use; tid 0 is the events track
+        while self._cpus <= cpu:
+            self._emit({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': self._cpus + 1,
+                        'args': {'name': f'CPU {self._cpus}'}})
+            self._emit({'name': 'thread_sort_index', 'ph': 'M', 'pid': 1, 'tid': self._cpus + 1,
+                        'args': {'sort_index': self._cpus + 1}})
+            self._cpus += 1
+        return cpu + 1
+
+    def _pack(self, start: int, end: int) -> int:
+        if self._free and self._free[0][0] <= start:
+            _, cpu = heapq.heappop(self._free)
+        else:
+            cpu = len(self._free)
+        heapq.heappush(self._free, (end, cpu))
+        return cpu
+
+    # ----- events -----
+
+    def segment(self, pid: int, start: int, end: int, cpu: int = None) -> int:
+        """A run segment as a complete ('X') event on its CPU track; returns the CPU"""
+        if cpu is None:
+            cpu = self._pack(start, end)
+        tid = self._track(cpu)
+        name = self._names.get(pid)
+        if name is None:
+            if pid == sl.CTX_SWITCH_PID:
+                name = '"switch","cat":"overhead"'
+            else:
+                name = json.dumps(self._given.get(pid) or f'P{pid}') + ',"cat":"run"'
+            self._names[pid] = name
+        # hand-formatted: this is the hot path for million-segment runs
+        self._write(f'{{"name":{name},"ph":"X","pid":1,"tid":{tid},"ts":{start * self.us!r},'
+                    f'"dur":{(end - start) * self.us!r},"args":{{"pid":{pid}}}}}')
+        return cpu
+
+    def instant(self, name: str, t: int, cat: str, cpu: int = None,
+                args: Dict[str,Any] = None, scope: str = 't'):
+        """An instant ('i') event on a CPU track, the events track, or global (scope 'g')"""
+        event = {'name': name, 'cat': cat, 'ph': 'i', 's': scope, 'pid': 1,
+                 'tid': EVENTS_TID if cpu is None else self._track(cpu), 'ts': t * self.us}
+        if args:
+            event['args'] = args
+        self._emit(event)
+
+    def counter(self, name: str, t: int, values: Dict[str,float]):
+        """A counter ('C') sample"""
+        self._emit({'name': name, 'ph': 'C', 'pid': 1, 'ts': t * self.us, 'args': values})
+
+    def span(self, name: str, start: int, end: int, key: int, cat: str, args: Dict[str,Any] = None):
+        """An async begin / end pair (may overlap other spans)"""
+        event = {'name': name, 'cat': cat, 'ph': 'b', 'id': key, 'pid': 1, 'tid': EVENTS_TID,
+                 'ts': start * self.us}
+        if args:
+            event['args'] = args
+        self._emit(event)
+        self._emit({'name': name, 'cat': cat, 'ph': 'e', 'id': key, 'pid': 1, 'tid': EVENTS_TID,
+                    'ts': end * self.us})
+
+    def close(self):
+        if self.f is None:
+            return
+        self.f.write('\n]}\n')
+        if self._own:
+            self.f.close()
+        self.f = None
+
+
+def write_chrome_trace(out, timeline: Iterable[Tuple[int,int,int]], tasks: List[Dict[str,Any]] = None,
+                       series: sl.StateSeries = None, blocked: List[Tuple[int,int,int]] = None,
+                       deadlocks: List[Tuple[int,List[int]]] = None, tick: float = 1e-3,
+                       process: str = 'Scheduler') -> int:
+    """Write a run as Chrome trace events; returns the number of events
+
+    `timeline` may be any start-ordered iterable (a list, a store cursor), read
+    once. With tasks (after compute_metrics) arrivals, completions and
+    preemptions are marked too: a segment that ends before its task completes,
+    other than for I/O or a blocked resource, was preempted or used up its
+    slice. A StateSeries adds ready-queue and busy-CPU counters, and a
+    resource-aware run its blocked intervals and detected deadlocks.
+    """
+    tasks = tasks or []
+    done = {t['pid']: t['completion'] for t in tasks if t.get('completion') is not None}
+    # tasks leaving the CPU for I/O or a resource weren't preempted
+    waits = {t['pid'] for t in tasks if t.get('bursts')}
+    blocks = {(pid, s) for pid, s, _ in blocked or ()}
+    with ChromeTraceWriter(out, tick, process, {t['pid']: t['name'] for t in tasks}) as w:
+        for pid, s, e in timeline:
+            cpu = w.segment(pid, s, e)
+            if pid in done and e < done[pid] and pid not in waits and (pid, e) not in blocks:
+                w.instant('preempt', e, 'preempt', cpu, {'pid': pid})
+        for t in tasks:
+            w.instant(f"arrive {t['name']}", t['arrival'], 'arrival', args={'pid': t['pid']})
+            if t['pid'] in done:
+                w.instant(f"complete {t['name']}", done[t['pid']], 'completion', args={'pid': t['pid']})
+        if series is not None:
+            for t, ready, busy in zip(series.times, series.ready, series.busy):
+                w.counter('ready queue', t, {'ready': ready})
+                w.counter('busy CPUs', t, {'busy': busy})
+        for i, (pid, s, e) in enumerate(blocked or ()):
+            w.span('blocked', s, e, i, 'blocked', {'pid': pid})
+        for at, cycle in deadlocks or ():
+            w.instant('deadlock', at, 'deadlock', args={'cycle': cycle}, scope='g')
+        return w.count
@@ -0,0 +1,310 @@
+import gzip
+import itertools
+import math
+import re
+from typing import Dict, Tuple, Any, Iterator, Callable
+
+import numpy as np
+
+import scheduling_logic as sl
+import workload_io as wio
+
+# --------------------- Standard Workload Format (SWF) ---------------------
+
+# the 18 SWF job fields in file order; -1 marks a missing value
+SWF_FIELDS = ('job', 'submit', 'wait', 'run', 'procs', 'cpu', 'mem', 'req_procs', 'req_time',
+              'req_mem', 'status', 'user', 'group', 'app', 'queue', 'partition', 'prev_job', 'think')
+_SWF_INDEX = {name: i for i, name in enumerate(SWF_FIELDS)}
+
+
+def _open_text(path: str):
+    # archive traces usually ship gzipped
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, encoding='utf-8', errors='replace')
+
+
+def _swf_int(x: str) -> int:
+    try:
+        return int(x)
+    except ValueError:
+        return int(float(x))
+
+
+def is_swf(path: str) -> bool:
+    return path.endswith(('.swf', '.swf.gz'))
+
+
+def swf_header(path: str) -> Dict[str,str]:
+    """'; Key: value' comment lines at the top of an SWF file"""
+    header = {}
+    with _open_text(path) as f:
+        for line in f:
+            if not line.startswith(';'):
+                break
+            key, sep, value = line[1:].partition(':')
+            if sep and key.strip():
+                header[key.strip()] = value.strip()
+    return header
+
+
+def iter_swf(path: str, start: int = None, end: int = None, status: Tuple[int,...] = None,
+             users: Tuple[int,...] = None, queues: Tuple[int,...] = None, min_runtime: int = 0,
+             max_jobs: int = None, time_scale: float = 1, rebase: bool = True,
+             priority_field: str = 'queue', group_field: str = None,
+             where: Callable[[Dict[str,int]], bool] = None,
+             first_pid: int = 1) -> Iterator[Dict[str,Any]]:
+    """Stream SWF jobs as task dicts, filtering while reading
+
+    submit -> arrival, run time -> burst, `priority_field` (an SWF field name,
+    default the queue number) -> priority, optional `group_field` ('user' /
+    'group') -> group. Only jobs submitted in [start, end) with a known run time
+    >= min_runtime pass; `where` sees every field by name. Times are divided by
+    `time_scale` (bursts rounded up) and, with `rebase`, shifted so the first
+    selected job arrives at 0. SWF files are ordered by submit time, so reading
+    stops at the first job past `end`. Each job becomes one task, whatever its
+    processor count.
+    """
+    pri_i = _SWF_INDEX[priority_field] if priority_field else None
+    grp_i = _SWF_INDEX[group_field] if group_field else None
+    origin = start if rebase and start is not None else None
+    pid = first_pid
+
+    with _open_text(path) as f:
+        for line in f:
+            if line.startswith(';'):
+                continue
+            fields = line.split()
+            if len(fields) < 4:
+                continue
+            submit = _swf_int(fields[1])
+            if start is not None and submit < start:
+                continue
+            if end is not None and submit >= end:
+                break
+            run = _swf_int(fields[3])
+            if run < 0 or run < min_runtime:
+                continue
+            if len(fields) < len(SWF_FIELDS):
+                fields += ['-1'] * (len(SWF_FIELDS) - len(fields))
+            if status is not None and _swf_int(fields[10]) not in status:
+                continue
+            if users is not None and _swf_int(fields[11]) not in users:
+                continue
+            if queues is not None and _swf_int(fields[14]) not in queues:
+                continue
+            if where is not None and not where(dict(zip(SWF_FIELDS, map(_swf_int, fields)))):
+                continue
+
+            if origin is None:
+                origin = submit if rebase else 0
+            priority = _swf_int(fields[pri_i]) if pri_i is not None else 0
+            group = _swf_int(fields[grp_i]) if grp_i is not None else -1
+            yield wio.make_task(
+                pid, f'job{fields[0]}', int((submit - origin) // time_scale),
+                max(1, math.ceil(run / time_scale)), max(0, priority), '', '',
+                group=f'{group_field[0]}{group}' if group >= 0 else '')
+            pid += 1
+            if max_jobs is not None and pid - first_pid >= max_jobs:
+                break
+
+
+def iter_swf_chunks(path: str, chunk: int = 100_000, **filters) -> Iterator[Dict[str,np.ndarray]]:
+    """iter_swf() as binary-workload column blocks of `chunk` jobs"""
+    jobs = iter_swf(path, **filters)
+    while True:
+        block = list(itertools.islice(jobs, chunk))
+        if not block:
+            return
+        yield wio.tasks_columns(block)
+
+
+def swf_to_binary(path: str, out_path: str, chunk: int = 100_000, **filters) -> int:
+    """Convert (a filtered window of) an SWF trace to a binary workload
+
+    The trace is read twice: once to size the output (jobs and string widths),
+    then block by block into the column maps, so memory holds one block of
+    `chunk` jobs whatever the trace size.
+    """
+    n = 0
+    widths = {}
+    for block in iter_swf_chunks(path, chunk, **filters):
+        n += len(block['arrival'])
+        for name, kind in wio.BINARY_COLUMNS:
+            if kind == 'S':
+                widths[name] = max(widths.get(name, 1), block[name].dtype.itemsize)
+
+    out = wio.create_binary(out_path, n, widths)
+    at = 0
+    for block in iter_swf_chunks(path, chunk, **filters):
+        rows = len(block['arrival'])
+        if at + rows > n:
+            raise ValueError(f'{path}: the second read selected different jobs')
+        for name, col in out.items():
+            col[at:at + rows] = block[name]
+        at += rows
+    if at != n:
+        raise ValueError(f'{path}: the second read selected different jobs')
+    for col in out.values():
+        col.flush()
+    return n
+
+
+# --------------------- Linux sched_switch / sched_wakeup Traces ---------------------
+
+# event header of ftrace ('comm-pid [cpu] flags ts: sched_switch: ...') and
+# perf script ('comm pid [cpu] ts: sched:sched_switch: ...') text output
+_SCHED_EVENT = re.compile(r'\[(\d+)\]\s+(?:\S+\s+)?(\d+\.\d+):\s+(?:sched:)?'
+                          r'(sched_switch|sched_wakeup_new|sched_wakeup|sched_waking):\s*(.*)')
+# payloads: key=value form, and perf's compact 'comm:pid [prio] state ==> comm:pid [prio]'
+_SWITCH_KV = re.compile(r'prev_comm=(.*?) prev_pid=(\d+) prev_prio=(-?\d+) prev_state=(\S+) '
+                        r'==> next_comm=(.*?) next_pid=(\d+) next_prio=(-?\d+)')
+_SWITCH_PERF = re.compile(r'(.*?):(\d+) \[(-?\d+)\] (\S+) ==> (.*?):(\d+) \[(-?\d+)\]')
+_WAKEUP_KV = re.compile(r'comm=(.*?) pid=(\d+) prio=(-?\d+)')
+_WAKEUP_PERF = re.compile(r'(.*?):(\d+) \[(-?\d+)\]')
+
+
+def _kernel_nice(prio: int) -> int:
+    """Task priority (a nice value, as CFS reads it) for a kernel prio; real-time maps to -20"""
+    return min(19, max(-20, prio - 120))
+
+
+def iter_sched_events(path: str) -> Iterator[Tuple[int,float,str,tuple]]:
+    """(cpu, timestamp, event, payload fields) for every sched_switch / sched_wakeup line
+
+    Switch payloads are (prev_comm, prev_pid, prev_prio, prev_state, next_comm,
+    next_pid, next_prio); wakeup payloads are (comm, pid, prio). Other lines,
+    including malformed events, are skipped.
+    """
+    with _open_text(path) as f:
+        for line in f:
+            if 'sched_' not in line:
+                continue
+            m = _SCHED_EVENT.search(line)
+            if not m:
+                continue
+            event, payload = m.group(3), m.group(4)
+            if event == 'sched_switch':
+                p = _SWITCH_KV.match(payload) or _SWITCH_PERF.match(payload)
+            else:
+                p = _WAKEUP_KV.match(payload) or _WAKEUP_PERF.match(payload)
+            if p:
+                yield int(m.group(1)), float(m.group(2)), event, p.groups()
+
+
+def iter_sched_replay(path: str, tick: float = 1e-6, start: float = None, end: float = None,
+                      comms: Tuple[str,...] = None, tids: Tuple[int,...] = None,
+                      first_pid: int = 1) -> Iterator[Tuple[str,Any]]:
+    """Stream jobs and observed run segments out of a sched_switch / sched_wakeup trace
+
+    A job is one wakeup-to-sleep episode of a thread: it arrives at its wakeup
+    (or when the thread is first seen runnable), and its burst is the CPU time
+    it gets until it switches out in a non-runnable state. Yields ('segment',
+    (pid, start, end)) as each run ends, ('task', task dict) as each job ends and
+    finally ('stats', dict). Times are ticks of `tick` seconds from the first
+    event in [start, end). Only per-CPU and per-thread state is held, so memory
+    doesn't grow with the trace; jobs still open at the end are cut there.
+    """
+    running = {}        # cpu -> (tid, since)
+    jobs = {}           # tid -> [pid, arrival, cpu time, name, comm, nice]
+    cpus = set()
+    origin = None
+    now = 0
+    pid = first_pid
+    events = switches = 0
+
+    def open_job(tid, comm, prio, t):
+        nonlocal pid
+        if (comms is not None and comm not in comms) or (tids is not None and tid not in tids):
+            return
+        jobs[tid] = [pid, t, 0, f'{comm}-{tid}', comm, _kernel_nice(prio)]
+        pid += 1
+
+    def close_job(tid):
+        job = jobs.pop(tid)
+        if job[2] > 0:
+            return wio.make_task(job[0], job[3], job[1], job[2], job[5], group=job[4])
+        return None
+
+    for cpu, ts, event, fields in iter_sched_events(path):
+        if start is not None and ts < start:
+            continue
+        if end is not None and ts >= end:
+            break
+        if origin is None:
+            origin = ts
+        now = int(round((ts - origin) / tick))
+        events += 1
+
+        if event != 'sched_switch':
+            comm, tid, prio = fields
+            tid = int(tid)
+            if tid and tid not in jobs:
+                open_job(tid, comm, int(prio), now)
+            continue
+
+        prev_comm, prev_tid, prev_prio, prev_state, next_comm, next_tid, next_prio = fields
+        prev_tid, next_tid = int(prev_tid), int(next_tid)
+        cpus.add(cpu)
+        if prev_tid and next_tid and prev_tid != next_tid:
+            switches += 1
+
+        cur = running.pop(cpu, None)
+        if prev_tid:
+            if cur and cur[0] == prev_tid and prev_tid in jobs and now > cur[1]:
+                job = jobs[prev_tid]
+                job[2] += now - cur[1]
+                yield 'segment', (job[0], cur[1], now)
+            if prev_state.startswith('R'):
+                # preempted: still runnable, the job goes on
+                if prev_tid not in jobs:
+                    open_job(prev_tid, prev_comm, int(prev_prio), now)
+            elif prev_tid in jobs:
+                task = close_job(prev_tid)
+                if task:
+                    yield 'task', task
+
+        if next_tid:
+            if next_tid not in jobs:
+                open_job(next_tid, next_comm, int(next_prio), now)
+            running[cpu] = (next_tid, now)
+
+    for cpu, (tid, since) in running.items():
+        if tid in jobs and now > since:
+            job = jobs[tid]
+            job[2] += now - since
+            yield 'segment', (job[0], since, now)
+    for tid in list(jobs):
+        task = close_job(tid)
+        if task:
+            yield 'task', task
+    yield 'stats', {'events': events, 'switches': switches, 'cpus': len(cpus),
+                    'origin': origin, 'tick': tick, 'duration': now}
+
+
+def load_sched_trace(path: str, tick: float = 1e-6, cores: int = None, **filters) -> Dict[str,Any]:
+    """Derived tasks, the observed timeline and its compute_metrics() for a sched trace
+
+    `cores` defaults to the number of CPUs seen switching. Segments come back
+    sorted by start like a multi-core simulation, so the observed run can be
+    compared directly with run_policy() on the same tasks.
+    """
+    tasks, timeline, stats = [], [], {}
+    for kind, item in iter_sched_replay(path, tick, **filters):
+        if kind == 'segment':
+            timeline.append(item)
+        elif kind == 'task':
+            tasks.append(item)
+        else:
+            stats = item
+    # pids are handed out at arrival, jobs finish in any order
+    tasks.sort(key=lambda t: t['pid'])
+    timeline.sort(key=lambda seg: seg[1])
+    cores = cores or max(1, stats['cpus'])
+    return {
+        'tasks': tasks,
+        'timeline': timeline,
+        'cores': cores,
+        'metrics': sl.compute_metrics(tasks, timeline, cores),
+        'stats': stats,
+    }
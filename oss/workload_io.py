@@ -0,0 +1,357 @@
+import csv
+import io
+import itertools
+import json
+import os
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Any, Iterator, Optional
+
+import numpy as np
+
+import scheduling_logic as sl
+
+
+# --------------------- Task Records ---------------------
+
+def make_task(pid: int, name=None, arrival=0, burst=1, priority=0, holding='', waiting='',
+              allocation=None, request=None, resource_ops=None, bursts=None, devices=None,
+              deadline=None, period=None, group=None) -> Dict[str,Any]:
+    """Normalized task dict (bad numbers fall back to the Task Manager defaults)"""
+    try:
+        arrival_i = int(arrival)
+    except Exception:
+        arrival_i = 0
+    try:
+        burst_i = max(1, int(burst))
+    except Exception:
+        burst_i = 1
+    try:
+        priority_i = int(priority)
+    except Exception:
+        priority_i = 0
+
+    t = {
+        'pid': pid,
+        'name': (name or f"P{pid}"),
+        'arrival': arrival_i,
+        'burst': burst_i,
+        'priority': priority_i,
+        'holding': (holding or '').strip(),
+        'waiting': (waiting or '').strip(),
+        'deadline': int(deadline) if deadline else None,
+        'period': int(period) if period else None,
+        'group': (group or '').strip()
+    }
+    # multi-instance resource counts (optional)
+    if allocation:
+        t['allocation'] = dict(allocation)
+    if request:
+        t['request'] = dict(request)
+    if resource_ops:
+        t['resource_ops'] = list(resource_ops)
+    # alternating CPU/IO bursts; 'burst' stays the total CPU demand
+    if bursts and len(bursts) > 1:
+        t['bursts'] = list(bursts)
+        t['devices'] = list(devices or [])
+        t['burst'] = sum(bursts[0::2])
+    return t
+
+
+# --------------------- CSV ---------------------
+
+def row_fields(row: List[str]) -> Dict[str,Any]:
+    """make_task() keyword arguments for one Task Manager CSV row"""
+    # optional CPU/IO burst sequence, e.g. "5;3@disk;4"
+    bursts, devices = sl.parse_burst_sequence(row[9]) if len(row) > 9 and row[9] else ([], [])
+    return {
+        'name': row[0] if len(row) > 0 and row[0] else None,
+        'arrival': int(row[1]) if len(row) > 1 and row[1] != '' else 0,
+        'burst': int(row[2]) if len(row) > 2 and row[2] != '' else 1,
+        'priority': int(row[3]) if len(row) > 3 and row[3] != '' else 0,
+        'holding': row[4] if len(row) > 4 else '',
+        'waiting': row[5] if len(row) > 5 else '',
+        # optional multi-instance columns, e.g. "R1:2;R2:1"
+        'allocation': sl.parse_resource_counts(row[6]) if len(row) > 6 and row[6] else {},
+        'request': sl.parse_resource_counts(row[7]) if len(row) > 7 and row[7] else {},
+        # optional acquire/release points, e.g. "acquire@0:R1;release@3:R1"
+        'resource_ops': sl.parse_resource_ops(row[8]) if len(row) > 8 and row[8] else [],
+        'bursts': bursts,
+        'devices': devices,
+        # optional real-time columns (relative deadline, period)
+        'deadline': int(row[10]) if len(row) > 10 and row[10] != '' else None,
+        'period': int(row[11]) if len(row) > 11 and row[11] != '' else None,
+        'group': row[12] if len(row) > 12 else '',
+    }
+
+
+def load_tasks_csv(path: str, first_pid: int = 1, workers: int = None) -> List[Dict[str,Any]]:
+    """Read a Task Manager CSV into task dicts (blank rows skipped, parsed in parallel chunks)"""
+    tasks = []
+    for columns, extras in iter_csv_chunks(path, workers):
+        tasks.extend(chunk_tasks(columns, extras, first_pid + len(tasks)))
+    return tasks
+
+
+# --------------------- Binary Workloads ---------------------
+
+# file layout: magic, version, header length, JSON header, then one contiguous
+# little-endian block per column (64-byte aligned) so np.memmap maps each directly
+BINARY_MAGIC = b'OSWL'
+BINARY_VERSION = 1
+BINARY_EXT = '.oswl'
+_PREFIX = struct.Struct('<4sHI')
+_ALIGN = 64
+
+# Task Manager CSV columns 1-6 and 13; strings are fixed-width UTF-8 ('S' + width)
+BINARY_COLUMNS = (('name', 'S'), ('arrival', '<i8'), ('burst', '<i8'), ('priority', '<i8'),
+                  ('holding', 'S'), ('waiting', 'S'), ('group', 'S'))
+
+
+def _aligned(x: int) -> int:
+    return -(-x // _ALIGN) * _ALIGN
+
+
+def create_binary(path: str, n: int, widths: Dict[str,int]) -> Dict[str,np.memmap]:
+    """Write the header and return writable column maps"""
+    cols, offset = [], 0
+    for name, kind in BINARY_COLUMNS:
+        dtype = f'S{max(1, widths.get(name, 1))}' if kind == 'S' else kind
+        cols.append({'name': name, 'dtype': dtype, 'offset': offset})
+        offset = _aligned(offset + n * np.dtype(dtype).itemsize)
+    header = json.dumps({'n': n, 'columns': cols}).encode()
+    data_start = _aligned(_PREFIX.size + len(header))
+
+    with open(path, 'wb') as f:
+        f.write(_PREFIX.pack(BINARY_MAGIC, BINARY_VERSION, len(header)))
+        f.write(header)
+        f.truncate(data_start + max(offset, 1))
+    return {c['name']: np.memmap(path, dtype=c['dtype'], mode='r+', offset=data_start + c['offset'],
+                                 shape=(n,)) for c in cols if n}
+
+
+def is_binary(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def read_binary(path: str) -> Dict[str,np.ndarray]:
+    """Zero-copy read-only column arrays of a binary workload"""
+    with open(path, 'rb') as f:
+        magic, version, size = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError(f'{path} is not a version {BINARY_VERSION} binary workload')
+        header = json.loads(f.read(size))
+    data_start = _aligned(_PREFIX.size + size)
+    n = header['n']
+    return {c['name']: (np.memmap(path, dtype=c['dtype'], mode='r', offset=data_start + c['offset'],
+                                  shape=(n,)) if n else np.empty(0, dtype=c['dtype']))
+            for c in header['columns']}
+
+
+def write_binary(path: str, columns: Dict[str,np.ndarray]):
+    """Write column arrays (as returned by read_binary / tasks_columns)"""
+    n = len(columns['arrival'])
+    widths = {name: columns[name].dtype.itemsize for name, kind in BINARY_COLUMNS if kind == 'S'}
+    out = create_binary(path, n, widths)
+    for name, col in out.items():
+        col[:] = columns[name]
+        col.flush()
+
+
+def tasks_columns(tasks: List[Dict[str,Any]]) -> Dict[str,np.ndarray]:
+    """Column arrays of the binary fields of task dicts"""
+    return {name: np.array([str(t.get(name) or '').encode() if kind == 'S' else t.get(name, 0)
+                            for t in tasks], dtype=None if kind == 'S' else kind)
+            for name, kind in BINARY_COLUMNS}
+
+
+def _decode(col: np.ndarray) -> List[str]:
+    # bytes.decode per item beats np.char.decode; all-empty columns skip it
+    if not col.any():
+        return [''] * len(col)
+    return [b.decode('utf-8') for b in col.tolist()]
+
+
+def columns_tasks(columns: Dict[str,np.ndarray], first_pid: int = 1) -> List[Dict[str,Any]]:
+    """Task dicts straight from column arrays (no per-field parsing)"""
+    names, holding, waiting, groups = (_decode(columns[k]) for k in ('name', 'holding', 'waiting', 'group'))
+    bursts = np.maximum(1, columns['burst']).tolist()
+    return [{
+        'pid': pid, 'name': name or f'P{pid}', 'arrival': a, 'burst': b, 'priority': p,
+        'holding': h, 'waiting': w, 'deadline': None, 'period': None, 'group': g
+    } for pid, name, a, b, p, h, w, g in zip(itertools.count(first_pid), names,
+                                             columns['arrival'].tolist(), bursts,
+                                             columns['priority'].tolist(), holding, waiting, groups)]
+
+
+def csv_to_binary(csv_path: str, out_path: str, workers: int = None) -> int:
+    """Convert a Task Manager CSV to a binary workload; returns the row count
+
+    Two parallel passes keep memory at a few chunks: the first sizes the
+    output (rows and string widths per chunk), the second writes each parsed
+    chunk straight into the column maps.
+    """
+    n = 0
+    widths = {}
+    for rows, chunk_widths, extra in _map_chunks(csv_path, _scan_chunk, workers):
+        if extra is not None:
+            raise ValueError(f'row {n + extra + 1}: binary workloads hold CSV columns 1-6 and 13 only')
+        n += rows
+        for name, w in chunk_widths.items():
+            widths[name] = max(widths.get(name, 1), w)
+
+    out = create_binary(out_path, n, widths)
+    at = 0
+    for columns, _ in iter_csv_chunks(csv_path, workers):
+        rows = len(columns['arrival'])
+        if at + rows > n:
+            raise ValueError(f'{csv_path} changed during conversion')
+        for name, col in out.items():
+            col[at:at + rows] = columns[name]
+        at += rows
+    if at != n:
+        raise ValueError(f'{csv_path} changed during conversion')
+    for col in out.values():
+        col.flush()
+    return n
+
+
+def load_tasks(path: str, first_pid: int = 1) -> List[Dict[str,Any]]:
+    """Task dicts from a binary workload, an SWF trace or a Task Manager CSV"""
+    if path.endswith(('.swf', '.swf.gz')):
+        import traces   # traces builds on this module
+        return list(traces.iter_swf(path, first_pid=first_pid))
+    if is_binary(path):
+        return columns_tasks(read_binary(path), first_pid)
+    return load_tasks_csv(path, first_pid)
+
+
+# --------------------- Parallel CSV Parsing ---------------------
+
+# bytes per parse job; files below one chunk are parsed in-process
+CSV_CHUNK_BYTES = 16 << 20
+_CSV_WIDTH = 13
+
+
+def _chunk_bounds(path: str, chunk_bytes: int) -> List[Tuple[int,int]]:
+    """Byte ranges of about chunk_bytes, each ending at a line boundary"""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, 'rb') as f:
+        while bounds[-1] + chunk_bytes < size:
+            f.seek(bounds[-1] + chunk_bytes)
+            f.readline()
+            if f.tell() >= size:
+                break
+            bounds.append(f.tell())
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _int_column(values, default: int) -> np.ndarray:
+    if '' in values:
+        values = [v if v != '' else default for v in values]
+    # numpy parses the strings in C (same rules as int())
+    return np.array(values).astype(np.int64) if len(values) else np.empty(0, dtype=np.int64)
+
+
+def _str_column(values, strip: bool = False) -> np.ndarray:
+    if not any(values):
+        return np.zeros(len(values), dtype='S1')
+    if strip:
+        values = [v.strip() for v in values]
+    try:
+        # ASCII fast path
+        return np.array(values, dtype='S')
+    except UnicodeEncodeError:
+        return np.array([v.encode() for v in values], dtype='S')
+
+
+def _parse_chunk(job) -> Tuple[Dict[str,np.ndarray], Dict[int,List[str]]]:
+    """Typed columns of one byte range; rows using CSV columns 7-12 also come back raw"""
+    path, lo, hi = job
+    with open(path, 'rb') as f:
+        f.seek(lo)
+        text = f.read(hi - lo).decode('utf-8')
+    rows = [r for r in csv.reader(io.StringIO(text, newline='')) if r]
+    # resources, burst sequences and deadlines keep the full row_fields() parsing
+    # short rows are padded with '' (the per-column defaults apply)
+    cols = list(itertools.zip_longest(*rows, fillvalue=''))
+    cols += [('',) * len(rows)] * (_CSV_WIDTH - len(cols))
+    extras = {}
+    for col in cols[6:12]:
+        if any(col):
+            extras.update((i, rows[i]) for i, v in enumerate(col) if v.strip())
+    return {
+        'name': _str_column(cols[0]),
+        'arrival': _int_column(cols[1], 0),
+        'burst': np.maximum(1, _int_column(cols[2], 1)),
+        'priority': _int_column(cols[3], 0),
+        'holding': _str_column(cols[4], strip=True),
+        'waiting': _str_column(cols[5], strip=True),
+        'group': _str_column(cols[12], strip=True),
+    }, extras
+
+
+# string columns of a binary workload: (name, CSV column, stripped)
+_STR_COLUMNS = (('name', 0, False), ('holding', 4, True), ('waiting', 5, True), ('group', 12, True))
+
+
+def _scan_chunk(job) -> Tuple[int, Dict[str,int], Optional[int]]:
+    """Row count, string column widths and first row using CSV columns 7-12 of one byte range
+
+    Sizes exactly what _parse_chunk would build, without converting the numbers.
+    """
+    path, lo, hi = job
+    with open(path, 'rb') as f:
+        f.seek(lo)
+        text = f.read(hi - lo).decode('utf-8')
+    rows = [r for r in csv.reader(io.StringIO(text, newline='')) if r]
+    ascii_only = text.isascii()
+    widths = {}
+    for name, i, strip in _STR_COLUMNS:
+        col = [r[i].strip() if strip else r[i] for r in rows if len(r) > i]
+        widths[name] = max(1, max(map(len, col) if ascii_only else (len(v.encode()) for v in col), default=1))
+    extra = next((i for i, r in enumerate(rows) if any(r[6:12]) and any(v.strip() for v in r[6:12])), None)
+    return len(rows), widths, extra
+
+
+def _map_chunks(path: str, fn, workers: int = None, chunk_bytes: int = CSV_CHUNK_BYTES) -> Iterator:
+    """fn over line-aligned byte ranges of a file in a process pool, results in file order
+
+    At most two jobs per worker are in flight, so results the caller hasn't
+    consumed yet don't pile up in memory.
+    """
+    jobs = [(path, lo, hi) for lo, hi in _chunk_bounds(path, chunk_bytes)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    if workers == 1:
+        yield from map(fn, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(fn, job))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_csv_chunks(path: str, workers: int = None, chunk_bytes: int = CSV_CHUNK_BYTES
+                    ) -> Iterator[Tuple[Dict[str,np.ndarray], Dict[int,List[str]]]]:
+    """Parse a Task Manager CSV in line-aligned byte chunks across a process pool
+
+    Yields (typed columns, {row in chunk: raw row}) in file order. Quoted fields
+    must not contain newlines (chunks are cut at any line break).
+    """
+    return _map_chunks(path, _parse_chunk, workers, chunk_bytes)
+
+
+def chunk_tasks(columns: Dict[str,np.ndarray], extras: Dict[int,List[str]],
+                 first_pid: int) -> List[Dict[str,Any]]:
+    tasks = columns_tasks(columns, first_pid)
+    for i, row in extras.items():
+        tasks[i] = make_task(first_pid + i, **row_fields(row))
+    return tasks
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the app's modules import each other flat from oss/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'oss'))
@@ -0,0 +1,67 @@
+import json
+import os
+
+import pytest
+
+import scheduling_logic as sl
+
+# timelines of the per-policy loops that simulate() replaced, recorded on
+# 40 random workloads listed in (arrival, pid) order
+with open(os.path.join(os.path.dirname(__file__), 'data', 'pre_kernel_timelines.json')) as f:
+    CASES = json.load(f)
+
+WRAPPERS = {
+    'FCFS': sl.sched_fcfs,
+    'SJF (Non-preemptive)': lambda t: sl.sched_sjf(t),
+    'SJF (Preemptive)': lambda t: sl.sched_sjf(t, preemptive=True),
+    'Priority (Non-preemptive)': lambda t: sl.sched_priority(t),
+    'Priority (Preemptive)': lambda t: sl.sched_priority(t, preemptive=True),
+    'LJF': sl.sched_ljf,
+    'Round Robin': lambda t: sl.sched_rr(t, 3),
+    'MLFQ': lambda t: sl.sched_mlfq(t, 2),
+    'CFS': sl.sched_cfs,
+    'Group Fair Share': sl.sched_group_fair,
+}
+
+
+@pytest.mark.parametrize('policy', sorted(WRAPPERS))
+def test_wrappers_match_pre_kernel_timelines(policy):
+    for i, case in enumerate(CASES):
+        timeline = WRAPPERS[policy]([dict(t) for t in case['tasks']])
+        assert [list(s) for s in timeline] == case['timelines'][policy], f'workload {i}'
+
+
+def test_rr_admits_queued_arrivals_oldest_first():
+    # P3 and P2 both arrive during P1's slice; list order no longer decides
+    tasks = [{'pid': 1, 'arrival': 0, 'burst': 4},
+             {'pid': 2, 'arrival': 3, 'burst': 2},
+             {'pid': 3, 'arrival': 1, 'burst': 2}]
+    assert sl.sched_rr(tasks, 4) == [(1, 0, 4), (3, 4, 6), (2, 6, 8)]
+
+
+def test_run_policy_matches_wrappers():
+    for case in CASES[:10]:
+        tasks = case['tasks']
+        assert sl.run_policy(tasks, 'Round Robin', {'quantum': 3}) == sl.sched_rr(tasks, 3)
+        assert sl.run_policy(tasks, 'MLFQ', {'quantum': 2}) == sl.sched_mlfq(tasks, 2)
+
+
+def test_policy_hooks_are_abstract():
+    class Partial(sl.Policy):
+        def on_arrival(self, task, now, running):
+            return False
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_unsupported_policies_raise():
+    tasks = [{'pid': 1, 'arrival': 0, 'burst': 3, 'priority': 0, 'group': 'A', 'bursts': [1, 2, 1]}]
+    with pytest.raises(ValueError):
+        sl.run_policy(tasks, 'No Such Policy')
+    with pytest.raises(ValueError):
+        sl.sched_with_resources(tasks, 'MLFQ')
+    with pytest.raises(ValueError):
+        sl.sched_cpu_io(tasks, 'CFS')
+    with pytest.raises(ValueError):
+        sl.sched_group_fair(tasks, inner='Group Fair Share')